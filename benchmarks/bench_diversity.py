@@ -0,0 +1,57 @@
+"""
+Microbenchmark: cost of the MMR diversity stage per recommendation request.
+
+Builds TF-IDF rows for synthetic candidate articles (a share of them near
+duplicates of each other), then times diversity.select_diverse for each
+candidate count. The stage has a budget of 1 ms per request.
+
+    python benchmarks/bench_diversity.py --candidates 100 300 600 --k 20
+"""
+import argparse
+import random
+import timeit
+
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from medium_clone_suggestion.diversity import select_diverse
+
+BUDGET_US = 1000.0
+
+
+def synthetic_docs(rng: random.Random, n: int, vocab_size: int = 5000, duplicate_share: float = 0.2):
+    vocab = [f"term{i}" for i in range(vocab_size)]
+    docs = []
+    for _ in range(n):
+        if docs and rng.random() < duplicate_share:
+            words = rng.choice(docs).split()
+            words[rng.randrange(len(words))] = rng.choice(vocab)
+        else:
+            words = [rng.choice(vocab) for _ in range(rng.randint(20, 60))]
+        docs.append(" ".join(words))
+    return docs
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the MMR diversity stage")
+    parser.add_argument("--candidates", type=int, nargs="+", default=[100, 300, 600])
+    parser.add_argument("--k", type=int, default=20, help="Articles selected per request")
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    np_rng = np.random.default_rng(0)
+    print(f"{'candidates':>10}{'us/request':>12}{'kept':>6}  budget {BUDGET_US:.0f} us")
+    for n in args.candidates:
+        rows = TfidfVectorizer().fit_transform(synthetic_docs(rng, n))
+        scores = np_rng.random(n).astype(np.float32)
+        picked = select_diverse(scores, rows, args.k)
+        seconds = min(timeit.repeat(lambda: select_diverse(scores, rows, args.k),
+                                    number=args.repeat, repeat=5)) / args.repeat
+        per_request = seconds * 1e6
+        verdict = "ok" if per_request < BUDGET_US else "OVER BUDGET"
+        print(f"{n:>10}{per_request:>12.1f}{len(picked):>6}  {verdict}")
+
+
+if __name__ == "__main__":
+    main()
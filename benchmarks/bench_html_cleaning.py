@@ -0,0 +1,64 @@
+"""
+Microbenchmark: BeautifulSoup(html.parser).get_text() against text_cleaning.html_to_text.
+
+Uses articles from a mockup.txt corpus when given, otherwise synthetic
+Medium-style HTML. Reports microseconds per document for each path.
+
+    python benchmarks/bench_html_cleaning.py --corpus mockup.txt --repeat 20
+"""
+import argparse
+import random
+import timeit
+
+from bs4 import BeautifulSoup
+
+from medium_clone_suggestion import text_cleaning
+from medium_clone_suggestion.article_processor.database import load_mockup_articles
+
+WORDS = ("the reader of this story will find that systems design is mostly about "
+         "tradeoffs between latency throughput and the cost of keeping state").split()
+
+
+def synthetic_article(rng: random.Random, paragraphs: int = 12) -> str:
+    parts = []
+    for i in range(paragraphs):
+        words = " ".join(rng.choice(WORDS) for _ in range(rng.randint(40, 120)))
+        tag = "h2" if i % 5 == 0 else "p"
+        parts.append(f'<{tag} class="pw-post-body-paragraph">{words} <strong>{rng.choice(WORDS)}</strong>'
+                     f' &amp; <a href="https://example.com/{i}">link</a></{tag}>')
+    return "<article>" + "".join(parts) + "</article>"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark HTML-to-text paths")
+    parser.add_argument("--corpus", help="Articles in mockup.txt format (default: synthetic)")
+    parser.add_argument("--docs", type=int, default=200, help="Synthetic documents to generate")
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    if args.corpus:
+        docs = [a.get("content", "") for a in load_mockup_articles(args.corpus)]
+    else:
+        rng = random.Random(0)
+        docs = [synthetic_article(rng) for _ in range(args.docs)]
+
+    paths = {
+        "beautifulsoup": lambda d: BeautifulSoup(d, "html.parser").get_text(),
+        "html_to_text": text_cleaning.html_to_text,
+        "strip_tags (regex)": text_cleaning.strip_tags,
+    }
+    if text_cleaning.lxml_html is None:
+        print("lxml not installed: html_to_text uses the regex fallback")
+
+    avg_kb = sum(len(d) for d in docs) / len(docs) / 1024
+    print(f"{len(docs)} documents, {avg_kb:.1f} KiB average")
+    baseline = None
+    for name, fn in paths.items():
+        seconds = min(timeit.repeat(lambda: [fn(d) for d in docs], number=1, repeat=args.repeat))
+        per_doc = seconds / len(docs) * 1e6
+        baseline = baseline or per_doc
+        print(f"{name:<20}{per_doc:>10.1f} us/doc{baseline / per_doc:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
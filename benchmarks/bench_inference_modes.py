@@ -0,0 +1,114 @@
+"""
+Compare article model inference modes on CPU.
+
+Runs the summarizer (BART-large-CNN) and the sentence encoder (all-mpnet-base-v2)
+in each requested mode over a mockup.txt corpus and reports throughput plus
+output drift against the full-precision models: ROUGE-1/ROUGE-L F1 for
+summaries, cosine similarity for embeddings.
+
+    python benchmarks/bench_inference_modes.py --corpus mockup.txt --modes default int8 onnx
+"""
+import argparse
+import re
+import time
+from typing import Dict, List
+
+import numpy as np
+from bs4 import BeautifulSoup
+from sentence_transformers import SentenceTransformer
+
+from medium_clone_suggestion.article_processor.database import load_mockup_articles
+from medium_clone_suggestion.article_processor.models import ModelManager, SummarizationModel
+
+
+def _tokens(text: str) -> List[str]:
+    return re.findall(r"\w+", text.lower())
+
+def _f1(overlap: int, pred_len: int, ref_len: int) -> float:
+    if not overlap or not pred_len or not ref_len:
+        return 0.0
+    precision, recall = overlap / pred_len, overlap / ref_len
+    return 2 * precision * recall / (precision + recall)
+
+def rouge_1(pred: str, ref: str) -> float:
+    p, r = _tokens(pred), _tokens(ref)
+    ref_counts: Dict[str, int] = {}
+    for t in r:
+        ref_counts[t] = ref_counts.get(t, 0) + 1
+    overlap = 0
+    for t in p:
+        if ref_counts.get(t, 0) > 0:
+            ref_counts[t] -= 1
+            overlap += 1
+    return _f1(overlap, len(p), len(r))
+
+def rouge_l(pred: str, ref: str) -> float:
+    p, r = _tokens(pred), _tokens(ref)
+    # longest common subsequence, one row at a time
+    prev = [0] * (len(r) + 1)
+    for a in p:
+        cur = [0]
+        for j, b in enumerate(r, 1):
+            cur.append(prev[j - 1] + 1 if a == b else max(prev[j], cur[j - 1]))
+        prev = cur
+    return _f1(prev[-1], len(p), len(r))
+
+
+def bench_summarizer(texts: List[str], modes: List[str]) -> None:
+    reference = None
+    print(f"\nSummarizer ({SummarizationModel.MODEL_NAME}), {len(texts)} articles")
+    print(f"{'mode':<10}{'articles/s':>12}{'ROUGE-1':>10}{'ROUGE-L':>10}")
+    for mode in ["default"] + [m for m in modes if m != "default"]:
+        model = SummarizationModel(ModelManager(use_cuda=False), mode=mode)
+        model.summarize(texts[0])  # warm-up
+        started = time.perf_counter()
+        outputs = [model.summarize(t) for t in texts]
+        rate = len(texts) / (time.perf_counter() - started)
+        if reference is None:
+            reference = outputs
+        r1 = np.mean([rouge_1(o, ref) for o, ref in zip(outputs, reference)])
+        rl = np.mean([rouge_l(o, ref) for o, ref in zip(outputs, reference)])
+        print(f"{mode:<10}{rate:>12.2f}{r1:>10.3f}{rl:>10.3f}")
+
+
+def bench_encoder(texts: List[str], modes: List[str], batch_size: int) -> None:
+    reference = None
+    name = "all-mpnet-base-v2"
+    print(f"\nEncoder ({name}), {len(texts)} articles")
+    print(f"{'mode':<10}{'articles/s':>12}{'mean cos':>10}{'min cos':>10}")
+    for mode in ["default"] + [m for m in modes if m != "default"]:
+        encoder = ModelManager(use_cuda=False).acquire_model(name, SentenceTransformer, mode=mode)
+        encoder.encode(texts[:batch_size], batch_size=batch_size)  # warm-up
+        started = time.perf_counter()
+        emb = encoder.encode(texts, batch_size=batch_size, normalize_embeddings=True)
+        rate = len(texts) / (time.perf_counter() - started)
+        if reference is None:
+            reference = emb
+        cos = np.sum(emb * reference, axis=1)
+        print(f"{mode:<10}{rate:>12.2f}{cos.mean():>10.4f}{cos.min():>10.4f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark article model inference modes")
+    parser.add_argument("--corpus", default="mockup.txt", help="Articles in mockup.txt format")
+    parser.add_argument("--modes", nargs="+", default=["default", "int8", "onnx"])
+    parser.add_argument("--limit", type=int, default=16, help="Number of articles to use")
+    parser.add_argument("--batch-size", type=int, default=16, help="Encoder batch size")
+    parser.add_argument("--skip-summarizer", action="store_true")
+    parser.add_argument("--skip-encoder", action="store_true")
+    args = parser.parse_args()
+
+    articles = load_mockup_articles(args.corpus)[:args.limit]
+    texts = [BeautifulSoup(a.get("content", ""), "html.parser").get_text() for a in articles]
+    texts = [t for t in texts if t.strip()]
+    if not texts:
+        raise SystemExit(f"No article content found in {args.corpus}")
+
+    if not args.skip_summarizer:
+        bench_summarizer(texts, args.modes)
+    if not args.skip_encoder:
+        bench_encoder(texts, args.modes, args.batch_size)
+
+
+if __name__ == "__main__":
+    main()
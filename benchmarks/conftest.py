@@ -0,0 +1,62 @@
+"""
+Fixtures for the offline recommendation benchmarks (pytest-benchmark).
+
+    pytest benchmarks/ --benchmark-only
+    BENCH_ARTICLES=1000000 BENCH_USERS=100000 BENCH_LATENCY_MS=5 pytest benchmarks/ --benchmark-only
+
+Data comes from a SyntheticDataset behind an InMemoryDatabaseManager, so no
+network or Supabase project is needed. BENCH_LATENCY_MS adds a simulated
+round trip to every database call.
+"""
+import itertools
+import os
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from medium_clone_suggestion.synthetic import SyntheticDataset
+from medium_clone_suggestion.memory_database import InMemoryDatabaseManager
+from medium_clone_suggestion.recommendation_engine import RecommendationSystem
+from medium_clone_suggestion.seen_filter import SeenFilterCache
+
+BENCH_ARTICLES = int(os.getenv("BENCH_ARTICLES", "10000"))
+BENCH_USERS = int(os.getenv("BENCH_USERS", "1000"))
+BENCH_LATENCY_MS = float(os.getenv("BENCH_LATENCY_MS", "0"))
+BENCH_SEED = int(os.getenv("BENCH_SEED", "0"))
+
+
+class NoCache:
+    """Recommendation cache that never hits, so every request does the full work."""
+
+    def check_and_update_cache(self, *args, **kwargs):
+        return None
+
+    def set_cache(self, *args, **kwargs):
+        pass
+
+
+@pytest.fixture(scope="session")
+def dataset():
+    return SyntheticDataset(n_articles=BENCH_ARTICLES, n_users=BENCH_USERS, seed=BENCH_SEED)
+
+
+@pytest.fixture(scope="session")
+def db(dataset):
+    return InMemoryDatabaseManager(dataset, seen_filters=SeenFilterCache())
+
+
+@pytest.fixture(scope="session")
+def recsys(db):
+    # corpus fit at startup runs without latency, requests pay it
+    system = RecommendationSystem(data_access=db)
+    system.cache_manager = NoCache()
+    system.seen_filters = db.seen_filters
+    db.latency = BENCH_LATENCY_MS / 1000.0
+    return system
+
+
+@pytest.fixture
+def user_ids(dataset):
+    """Endless cycle over every user id, so consecutive rounds hit different users."""
+    return itertools.cycle(dataset.user_id(u) for u in range(dataset.n_users))
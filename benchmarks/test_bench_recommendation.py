@@ -0,0 +1,35 @@
+"""Offline benchmarks of the recommendation path; see conftest.py for scale and latency settings."""
+from medium_clone_suggestion.caching import CacheManager
+
+
+def test_recommend_articles(benchmark, recsys, user_ids):
+    recs = benchmark(lambda: recsys.recommend_articles(next(user_ids), num_recommendations=20))
+    assert len(recs) == 20
+
+
+def test_recommend_articles_cache_hit(benchmark, recsys, dataset, tmp_path, monkeypatch):
+    monkeypatch.setattr(recsys, "cache_manager", CacheManager(str(tmp_path / "cache.json")))
+    user_id = dataset.user_id(0)
+    recsys.recommend_articles(user_id)
+    benchmark(recsys.recommend_articles, user_id)
+
+
+def test_batch_process_recommendations(benchmark, recsys, dataset):
+    users = [dataset.user_id(u) for u in range(min(50, dataset.n_users))]
+    results = benchmark(recsys.batch_process_recommendations, users)
+    assert len(results) == len(users)
+
+
+def test_score_with_global_corpus(benchmark, recsys, dataset):
+    profile = dataset.profile(0)
+    candidates = [dataset.article(int(i)) for i in dataset.newest(profile["preferred_fields"][0], 300)]
+    scores = benchmark(recsys.similarity_calculator.score_with_global_corpus, profile, candidates)
+    assert len(scores) == len(candidates)
+
+
+def test_build_global_corpus(benchmark, recsys):
+    # the startup corpus: 1000 top article documents
+    docs = list(recsys.global_corpus_docs)
+    calculator = type(recsys.similarity_calculator)()
+    benchmark.pedantic(calculator.build_global_corpus, args=(docs,), rounds=5, iterations=1)
+    assert calculator.global_fitted
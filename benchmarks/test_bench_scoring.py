@@ -0,0 +1,76 @@
+"""
+Scoring kernel (scoring.score_matrix over normalized float32 rows) against the
+previous path, sklearn cosine_similarity on the vectorizer's float64 output.
+
+    pytest benchmarks/test_bench_scoring.py --benchmark-only --benchmark-group-by=param:users
+
+The top-K cases score one user against a large candidate set (the corpus
+rows repeated to N_LARGE) in shards on the scoring pool; threads=1 is the
+unsharded path.
+"""
+import numpy as np
+import pytest
+import scipy.sparse as sp
+from sklearn.metrics.pairwise import cosine_similarity
+
+from medium_clone_suggestion.scoring import score_matrix, score_top_k
+
+N_CANDIDATES = 2000
+N_LARGE = 100_000
+TOP_K = 300
+
+
+@pytest.fixture(scope="module")
+def corpus(recsys, dataset):
+    calc = recsys.similarity_calculator
+    articles = [dataset.article(i) for i in range(min(N_CANDIDATES, dataset.n_articles))]
+    profiles = [dataset.profile(u % dataset.n_users) for u in range(256)]
+    return {
+        "profiles": profiles,
+        "rows64": calc.vectorizer.transform([calc._build_article_str(a) for a in articles]),
+        "rows32": calc.transform_articles(articles),
+        "users64": calc.vectorizer.transform([calc._build_user_str(p) for p in profiles]),
+        "users32": calc.transform_users(profiles),
+    }
+
+
+@pytest.mark.parametrize("users", [1, 32, 256])
+def test_sklearn_cosine_float64(benchmark, corpus, users):
+    scores = benchmark(cosine_similarity, corpus["users64"][:users], corpus["rows64"])
+    assert scores.shape == (users, corpus["rows64"].shape[0])
+
+
+@pytest.mark.parametrize("threads", [1, 4])
+@pytest.mark.parametrize("users", [1, 32, 256])
+def test_kernel_float32(benchmark, corpus, users, threads):
+    scores = benchmark(score_matrix, corpus["users32"][:users], corpus["rows32"], threads)
+    assert scores.shape == (users, corpus["rows32"].shape[0])
+
+
+@pytest.mark.parametrize("users", [1, 256])
+def test_score_users_end_to_end(benchmark, recsys, corpus, users):
+    # profile -> TF-IDF -> scores, as the engine pays it per request (users=1)
+    calc = recsys.similarity_calculator
+    scores = benchmark(calc.score_users, corpus["profiles"][:users], corpus["rows32"])
+    assert scores.shape[0] == users
+
+
+@pytest.fixture(scope="module")
+def large_rows(corpus):
+    rows = corpus["rows32"]
+    return sp.vstack([rows] * -(-N_LARGE // rows.shape[0]), format="csr")[:N_LARGE]
+
+
+def test_full_scores_argsort(benchmark, corpus, large_rows):
+    # score everything, then sort: the cost the top-K path avoids
+    def full():
+        scores = score_matrix(corpus["users32"][:1], large_rows, n_threads=1)[0]
+        return np.argsort(-scores, kind="stable")[:TOP_K]
+
+    assert len(benchmark(full)) == TOP_K
+
+
+@pytest.mark.parametrize("threads", [1, 2, 4])
+def test_sharded_top_k(benchmark, corpus, large_rows, threads):
+    idx, _ = benchmark(score_top_k, corpus["users32"][:1], large_rows, TOP_K, threads, 0)
+    assert len(idx) == TOP_K
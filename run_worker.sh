@@ -0,0 +1,8 @@
+#!/bin/bash
+# Activate poetry environment and run the article processing worker
+
+VENV_PATH=$(poetry env info --path)
+source "$VENV_PATH/bin/activate"
+
+echo "▶ Starting article worker..."
+PYTHONPATH=src python -m medium_clone_suggestion.article_processor.worker "$@"
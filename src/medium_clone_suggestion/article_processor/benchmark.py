@@ -0,0 +1,261 @@
+"""
+Throughput and profiling harness for the article NLP pipeline.
+
+Runs ArticleProcessor over a local corpus in the mockup.txt format (see
+database.load_mockup_articles) for every executor mode and worker count. For
+each configuration it reports articles per minute, peak RSS and CPU
+utilization, plus per-stage p50/p95 latency from the pipeline's
+instrumentation spans.
+
+    python -m medium_clone_suggestion.article_processor.benchmark mockup.txt --modes thread process --workers 1 2 4
+
+Modes:
+    thread   one ArticleProcessor, `workers` threads (workers=1 is serial)
+    process  `workers` processes, each with its own models, fed batches
+
+Model loading happens before the throughput clock starts; peak RSS and CPU
+utilization cover the whole configuration, loading included. Fingerprint
+reuse is off, so every run does the full work.
+
+Profiles: --cprofile DIR writes one pstats file per configuration (the calling
+thread only, so use --modes thread --workers 1 for a complete picture). For
+worker threads and processes, run the harness under py-spy instead:
+
+    py-spy record --subprocesses -o pipeline.svg -- python -m medium_clone_suggestion.article_processor.benchmark mockup.txt
+"""
+import argparse
+import concurrent.futures
+import cProfile
+import json
+import os
+import threading
+import time
+from typing import Dict, List, Tuple
+
+import numpy as np
+import psutil
+
+from medium_clone_suggestion.article_processor.config import Config
+from medium_clone_suggestion.article_processor.database import load_mockup_articles
+from medium_clone_suggestion.instrumentation import trace
+from medium_clone_suggestion.logger import get_logger
+
+logger = get_logger(__name__)
+
+MODES = ("thread", "process")
+# stages that run once per batch rather than once per article
+BATCH_STAGES = ("article.entities", "article.topics")
+
+
+class ResourceSampler:
+    """Samples the RSS of this process and its children; measures CPU use over the block."""
+
+    def __init__(self, interval: float = 0.05):
+        self.interval = interval
+        self.peak_rss = 0
+        self.cpu_utilization = 0.0
+        self._process = psutil.Process()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _rss(self) -> int:
+        total = self._process.memory_info().rss
+        for child in self._process.children(recursive=True):
+            try:
+                total += child.memory_info().rss
+            except psutil.Error:
+                pass
+        return total
+
+    def _cpu_seconds(self) -> float:
+        times = self._process.cpu_times()
+        seconds = times.user + times.system + times.children_user + times.children_system
+        for child in self._process.children(recursive=True):
+            try:
+                child_times = child.cpu_times()
+                seconds += child_times.user + child_times.system
+            except psutil.Error:
+                pass
+        return seconds
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.peak_rss = max(self.peak_rss, self._rss())
+
+    def __enter__(self):
+        self.peak_rss = self._rss()
+        self._cpu_start = self._cpu_seconds()
+        self._wall_start = time.perf_counter()
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        wall = time.perf_counter() - self._wall_start
+        cpu = self._cpu_seconds() - self._cpu_start
+        self._stop.set()
+        self._thread.join()
+        self.peak_rss = max(self.peak_rss, self._rss())
+        self.cpu_utilization = cpu / (wall * (psutil.cpu_count() or 1)) if wall > 0 else 0.0
+
+
+def stage_report(stages: List[Tuple[str, float]], n_articles: int) -> Dict[str, Dict[str, float]]:
+    """Per stage: calls, total seconds, p50/p95 per call and articles per second of stage time."""
+    by_stage: Dict[str, List[float]] = {}
+    for stage, seconds in stages:
+        by_stage.setdefault(stage, []).append(seconds)
+    report = {}
+    for stage, values in by_stage.items():
+        values = np.asarray(values)
+        total = float(values.sum())
+        articles = n_articles if stage in BATCH_STAGES else len(values)
+        report[stage] = {
+            "calls": len(values),
+            "total_s": total,
+            "p50_ms": float(np.percentile(values, 50)) * 1000,
+            "p95_ms": float(np.percentile(values, 95)) * 1000,
+            "articles_per_s": articles / total if total > 0 else float("inf"),
+        }
+    return report
+
+
+def _copies(articles: List[Dict]) -> List[Dict]:
+    # the processor mutates its input; every run starts from the raw corpus
+    return [dict(a) for a in articles]
+
+
+def _set_inference_mode(mode: str):
+    Config.INFERENCE_MODES = {name: mode for name in Config.INFERENCE_MODES}
+
+
+def _new_processor(max_workers: int):
+    # imported here so --help works without loading torch
+    from medium_clone_suggestion.article_processor.models import ModelManager
+    from medium_clone_suggestion.article_processor.processing import ArticleProcessor
+    return ArticleProcessor(ModelManager(), max_workers=max_workers)
+
+
+def run_thread(articles: List[Dict], workers: int, batch_size: int, profiler=None):
+    processor = _new_processor(workers)
+    processor.process_batch(_copies(articles[:1]))  # warm-up: first inference, NER and LDA loads
+    try:
+        with trace() as stages:
+            if profiler:
+                profiler.enable()
+            start = time.perf_counter()
+            for i in range(0, len(articles), batch_size):
+                processor.process_batch(_copies(articles[i:i + batch_size]))
+            wall = time.perf_counter() - start
+            if profiler:
+                profiler.disable()
+    finally:
+        processor.close()
+    return wall, stages.stages
+
+
+_process_processor = None
+
+def _init_process(inference_mode: str):
+    global _process_processor
+    _set_inference_mode(inference_mode)
+    _process_processor = _new_processor(1)
+    _process_processor.process_batch([{"postid": "warmup", "content": "Warm up the models. " * 20}])
+
+def _ready():
+    time.sleep(0.2)  # long enough that every process takes one of these
+
+def _process_chunk(articles: List[Dict]) -> List[Tuple[str, float]]:
+    with trace() as stages:
+        _process_processor.process_batch(articles)
+    return stages.stages
+
+
+def run_process(articles: List[Dict], workers: int, batch_size: int, inference_mode: str, profiler=None):
+    with concurrent.futures.ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_process, initargs=(inference_mode,)
+    ) as executor:
+        # start every process and load its models before the clock starts
+        for future in [executor.submit(_ready) for _ in range(workers)]:
+            future.result()
+        if profiler:
+            profiler.enable()
+        start = time.perf_counter()
+        chunks = [_copies(articles[i:i + batch_size]) for i in range(0, len(articles), batch_size)]
+        stages = [s for chunk_stages in executor.map(_process_chunk, chunks) for s in chunk_stages]
+        wall = time.perf_counter() - start
+        if profiler:
+            profiler.disable()
+    return wall, stages
+
+
+def run_config(articles: List[Dict], mode: str, workers: int, batch_size: int,
+               inference_mode: str, profile_dir: str = None) -> Dict:
+    profiler = cProfile.Profile() if profile_dir else None
+    with ResourceSampler() as resources:
+        if mode == "thread":
+            wall, stages = run_thread(articles, workers, batch_size, profiler)
+        else:
+            wall, stages = run_process(articles, workers, batch_size, inference_mode, profiler)
+    if profiler:
+        os.makedirs(profile_dir, exist_ok=True)
+        path = os.path.join(profile_dir, f"{mode}-{workers}-{inference_mode}.prof")
+        profiler.dump_stats(path)
+        logger.info(f"Wrote profile {path}")
+    return {
+        "mode": mode,
+        "workers": workers,
+        "inference_mode": inference_mode,
+        "articles": len(articles),
+        "wall_s": wall,
+        "articles_per_min": len(articles) / wall * 60 if wall > 0 else float("inf"),
+        "peak_rss_mb": resources.peak_rss / 2**20,
+        "cpu_utilization": resources.cpu_utilization,
+        "stages": stage_report(stages, len(articles)),
+    }
+
+
+def print_result(result: Dict):
+    print(f"\n{result['mode']} x{result['workers']} ({result['inference_mode']}): "
+          f"{result['articles']} articles in {result['wall_s']:.1f}s = {result['articles_per_min']:.1f}/min, "
+          f"peak RSS {result['peak_rss_mb']:.0f} MB, CPU {result['cpu_utilization']:.0%}")
+    print(f"  {'stage':<20}{'calls':>7}{'total s':>10}{'p50 ms':>10}{'p95 ms':>10}{'art/s':>12}")
+    for stage, s in sorted(result["stages"].items(), key=lambda item: -item[1]["total_s"]):
+        print(f"  {stage:<20}{s['calls']:>7}{s['total_s']:>10.2f}{s['p50_ms']:>10.1f}"
+              f"{s['p95_ms']:>10.1f}{s['articles_per_s']:>12.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the article NLP pipeline on a local corpus")
+    parser.add_argument("corpus", nargs="?", default="mockup.txt", help="Corpus in the mockup.txt format")
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=["thread"])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4])
+    parser.add_argument("--inference-mode", default="default", choices=("default", "int8", "onnx"),
+                        help="Inference mode for both models")
+    parser.add_argument("--batch-size", type=int, default=Config.WORKER_BATCH_SIZE)
+    parser.add_argument("--limit", type=int, help="Use only the first N articles")
+    parser.add_argument("--repeat", type=int, default=1, help="Repeat the corpus N times")
+    parser.add_argument("--cprofile", metavar="DIR", help="Write a cProfile pstats file per configuration")
+    parser.add_argument("--json", metavar="PATH", help="Also write the results as JSON")
+    args = parser.parse_args()
+
+    corpus = load_mockup_articles(args.corpus)[:args.limit]
+    articles = [
+        {**a, "postid": f"{a.get('id')}-{r}"} for r in range(args.repeat) for a in corpus
+    ]
+    if not articles:
+        parser.error(f"No articles in {args.corpus}")
+
+    _set_inference_mode(args.inference_mode)
+    results = []
+    for mode in args.modes:
+        for workers in args.workers:
+            result = run_config(articles, mode, workers, args.batch_size, args.inference_mode, args.cprofile)
+            print_result(result)
+            results.append(result)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+MODELS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "models")
+
+class Config:
+    """Configuration settings for the article processing worker."""
+    # Job queue (SQLite file shared by the API and the worker process)
+    JOB_QUEUE_PATH = os.getenv("ARTICLE_JOB_QUEUE_PATH", "article_jobs.sqlite3")
+    JOB_QUEUE_MAX_PENDING = int(os.getenv("ARTICLE_JOB_QUEUE_MAX_PENDING", "1000"))
+    JOB_MAX_ATTEMPTS = 3
+    JOB_LEASE_SECONDS = 15 * 60  # processing jobs older than this are re-queued
+
+    # Worker
+    WORKER_BATCH_SIZE = 16
+    WORKER_POLL_INTERVAL_SECONDS = 2.0
+    COALESCE_WINDOW_SECONDS = 2.0  # wait this long for a partial batch to fill up
+    SWEEP_INTERVAL_HOURS = 3  # background re-scan of uncategorized posts
+    SWEEP_LIMIT = 100  # uncategorized posts per sweep, processed in batch-sized chunks
+
+    # Models
+    MODEL_IDLE_TIMEOUT_SECONDS = int(os.getenv("MODEL_IDLE_TIMEOUT_SECONDS", str(60 * 60)))
+    # Inference mode per model: "default" (full precision), "int8" (dynamic
+    # quantization of linear layers, CPU only) or "onnx" (ONNX Runtime backend)
+    INFERENCE_MODES = {
+        "summarizer": os.getenv("SUMMARIZER_INFERENCE_MODE", "default"),
+        "encoder": os.getenv("ENCODER_INFERENCE_MODE", "default"),
+    }
+
+    # Named entity recognition
+    NER_BACKEND = os.getenv("NER_BACKEND", "nltk_batched")  # nltk | nltk_batched | spacy
+    NER_SOURCE = os.getenv("NER_SOURCE", "content")  # content | summary
+    NER_MAX_CHARS = int(os.getenv("NER_MAX_CHARS", "5000"))
+    NER_SPACY_MODEL = os.getenv("NER_SPACY_MODEL", "en_core_web_sm")
+
+    # Topic modeling (pre-trained LDA shipped in article_processor/models)
+    LDA_MODEL_PATH = os.getenv("LDA_MODEL_PATH", os.path.join(MODELS_DIR, "trained_lda.model"))
+    LDA_DICTIONARY_PATH = os.getenv("LDA_DICTIONARY_PATH", os.path.join(MODELS_DIR, "lda_dictionary.dict"))
+    TOPIC_MIN_PROBABILITY = float(os.getenv("TOPIC_MIN_PROBABILITY", "0.1"))
+    TOPIC_TOP_N = int(os.getenv("TOPIC_TOP_N", "3"))
+
+    # Summarization planner (lengths in estimated BART tokens)
+    SUMMARY_SKIP_TOKENS = 60  # shorter posts get no summary
+    SUMMARY_EXTRACTIVE_TOKENS = 150  # below this, pick central sentences instead of generating
+    SUMMARY_ABSTRACTIVE_MAX_TOKENS = 1024  # BART's input window; longer posts are map-reduced
+    SUMMARY_CHUNK_TOKENS = 900
+    SUMMARY_EXTRACTIVE_SENTENCES = 3
+    SUMMARY_TIME_BUDGET_SECONDS = {
+        "extractive": 2.0,
+        "abstractive": 20.0,
+        "map_reduce": 60.0,
+    }
+
+    # Content fingerprints (reuse results for unchanged text, cluster near duplicates)
+    FINGERPRINT_DB_PATH = os.getenv("ARTICLE_FINGERPRINT_DB_PATH", "article_fingerprints.sqlite3")
+    NEAR_DUPLICATE_MAX_DISTANCE = 3  # SimHash bits; must stay below the 4 lookup bands
@@ -8,6 +8,26 @@ from medium_clone_suggestion.logger import get_logger
 logger = get_logger(__name__)
 load_dotenv()
 
+def load_mockup_articles(path: str = 'mockup.txt') -> List[Dict]:
+    """Parse the mockup.txt format: `ID: `, `Title: ` and `Content: ` lines per article."""
+    articles = []
+    with open(path, 'r', encoding='utf-8') as f:
+        current_article = {}
+        for line in f:
+            line = line.strip()
+            if line.startswith('ID: '):
+                if current_article:
+                    articles.append(current_article)
+                current_article = {'id': line[4:]}
+            elif line.startswith('Title: '):
+                current_article['title'] = line[7:]
+            elif line.startswith('Content: '):
+                current_article['content'] = line[9:]
+        if current_article:
+            articles.append(current_article)
+    logger.info(f"Loaded {len(articles)} articles from {path}")
+    return articles
+
 class DatabaseManager:
     def __init__(self, supabase_url: str, supabase_key: str):
         self.client = create_client(supabase_url, supabase_key)
@@ -39,33 +59,17 @@ class DatabaseManager:
         logger.info(f"Fetched {len(articles)} articles from Supabase table '{table_name}'")
         """
         # Testing: load from mockup.txt
-        articles = []
-        with open('mockup.txt', 'r', encoding='utf-8') as f:
-            current_article = {}
-            for line in f:
-                line = line.strip()
-                if line.startswith('ID: '):
-                    if current_article:
-                        articles.append(current_article)
-                    current_article = {'id': line[4:]}
-                elif line.startswith('Title: '):
-                    current_article['title'] = line[7:]
-                elif line.startswith('Content: '):
-                    current_article['content'] = line[9:]
-            if current_article:
-                articles.append(current_article)
-        logger.info(f"Loaded {len(articles)} articles from mockup.txt")
-        return articles
+        return load_mockup_articles('mockup.txt')
     
     
     def update_processed(self, processed_articles: List[Dict]):
         # Update processed status in Supabase
-        print("Received batch!",processed_articles)
+        logger.info(f"Received batch of {len(processed_articles)} articles")
         return self.save_keywords(processed_articles)
         
     def save_keywords(self, processed_articles: List[Dict]) -> None:
         file_path = os.path.abspath("result.txt")
-        print("Saving results to:", file_path)
+        logger.info(f"Saving results to: {file_path}")
         with open('result.txt', 'w', encoding='utf-8') as f:
             for article in processed_articles:
                 # Write basic info
@@ -0,0 +1,151 @@
+import threading
+from abc import ABC, abstractmethod
+from typing import Dict, List
+
+from nltk import pos_tag, word_tokenize, ne_chunk
+
+from medium_clone_suggestion.article_processor.config import Config
+from medium_clone_suggestion.logger import get_logger
+
+logger = get_logger(__name__)
+
+ENTITY_CATEGORIES = ('PERSON', 'ORGANIZATION', 'LOCATION', 'GPE', 'FACILITY', 'PRODUCT', 'EVENT', 'OTHER')
+
+
+def _categorize_tree(tree) -> Dict[str, List[str]]:
+    categories = {k: [] for k in ENTITY_CATEGORIES}
+    for chunk in tree:
+        if hasattr(chunk, 'label'):
+            entity_text = ' '.join(c[0] for c in chunk)
+            entity_type = chunk.label()
+            if entity_type in categories:
+                categories[entity_type].append(entity_text)
+            else:
+                categories['OTHER'].append(entity_text)
+    return {k: list(set(v)) for k, v in categories.items() if v}
+
+
+def cap_text(text: str, max_chars: int) -> str:
+    """Cut text to at most max_chars, on a word boundary when possible."""
+    if not max_chars or len(text) <= max_chars:
+        return text
+    cut = text.rfind(' ', 0, max_chars)
+    return text[:cut if cut > 0 else max_chars]
+
+
+class EntityBackend(ABC):
+    """Extracts categorized named entities for many documents per call."""
+    name = "base"
+
+    @abstractmethod
+    def extract_batch(self, texts: List[str]) -> List[Dict[str, List[str]]]:
+        """One {category: [entities]} dict per text, in order."""
+
+    def extract(self, text: str) -> Dict[str, List[str]]:
+        return self.extract_batch([text])[0]
+
+
+class NLTKEntityBackend(EntityBackend):
+    """The original per-article path: word_tokenize, pos_tag and ne_chunk for each text."""
+    name = "nltk"
+
+    def extract_batch(self, texts: List[str]) -> List[Dict[str, List[str]]]:
+        return [_categorize_tree(ne_chunk(pos_tag(word_tokenize(t)))) for t in texts]
+
+
+class BatchedNLTKEntityBackend(EntityBackend):
+    """
+    Same NLTK models, loaded once. nltk's pos_tag/ne_chunk helpers rebuild the
+    NE chunker on every call; here a single tagger and chunker tag the whole batch.
+    """
+    name = "nltk_batched"
+
+    def __init__(self):
+        self._tagger = None
+        self._chunker = None
+        self._lock = threading.Lock()
+
+    def _models(self):
+        with self._lock:
+            if self._chunker is None:
+                from nltk.tag.perceptron import PerceptronTagger
+                from nltk.chunk import ne_chunker
+                self._tagger = PerceptronTagger()
+                self._chunker = ne_chunker()
+        return self._tagger, self._chunker
+
+    def extract_batch(self, texts: List[str]) -> List[Dict[str, List[str]]]:
+        tagger, chunker = self._models()
+        tagged = tagger.tag_sents([word_tokenize(t) for t in texts])
+        return [_categorize_tree(tree) for tree in chunker.parse_sents(tagged)]
+
+
+class SpacyEntityBackend(EntityBackend):
+    """spaCy pipeline run over the batch with nlp.pipe; requires the `spacy` package."""
+    name = "spacy"
+
+    LABELS = {
+        'PERSON': 'PERSON', 'ORG': 'ORGANIZATION', 'LOC': 'LOCATION', 'GPE': 'GPE',
+        'FAC': 'FACILITY', 'PRODUCT': 'PRODUCT', 'EVENT': 'EVENT',
+        'NORP': 'OTHER', 'WORK_OF_ART': 'OTHER', 'LAW': 'OTHER', 'LANGUAGE': 'OTHER',
+    }
+
+    def __init__(self, model: str = Config.NER_SPACY_MODEL, batch_size: int = 32):
+        try:
+            import spacy
+        except ImportError as e:
+            raise ImportError("The spacy NER backend requires the `spacy` package") from e
+        # only the NER component is needed
+        self.nlp = spacy.load(model, exclude=["parser", "lemmatizer", "textcat"])
+        self.batch_size = batch_size
+
+    def extract_batch(self, texts: List[str]) -> List[Dict[str, List[str]]]:
+        results = []
+        for doc in self.nlp.pipe(texts, batch_size=self.batch_size):
+            categories = {}
+            for ent in doc.ents:
+                label = self.LABELS.get(ent.label_)
+                if label:  # dates, numbers, money etc. are not profile entities
+                    categories.setdefault(label, set()).add(ent.text)
+            results.append({k: list(v) for k, v in categories.items()})
+        return results
+
+
+BACKENDS = {
+    NLTKEntityBackend.name: NLTKEntityBackend,
+    BatchedNLTKEntityBackend.name: BatchedNLTKEntityBackend,
+    SpacyEntityBackend.name: SpacyEntityBackend,
+}
+
+_backends: Dict[str, EntityBackend] = {}
+_backends_lock = threading.Lock()
+
+def get_entity_backend(name: str = None) -> EntityBackend:
+    """Return the process-wide instance of the named backend (default: Config.NER_BACKEND)."""
+    name = name or Config.NER_BACKEND
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown NER backend '{name}', expected one of {sorted(BACKENDS)}")
+    with _backends_lock:
+        if name not in _backends:
+            _backends[name] = BACKENDS[name]()
+        return _backends[name]
+
+
+def add_entities_batch(articles: List[Dict], backend: EntityBackend = None,
+                       source: str = Config.NER_SOURCE,
+                       max_chars: int = Config.NER_MAX_CHARS) -> List[Dict]:
+    """
+    Tag all articles in one backend call and store the result under 'entities'.
+    `source` is "content" or "summary"; summary falls back to content when empty.
+    """
+    if not articles:
+        return articles
+    backend = backend or get_entity_backend()
+    texts = []
+    for article in articles:
+        text = article.get('summary') if source == "summary" else None
+        texts.append(cap_text(text or article.get('content', ''), max_chars))
+
+    for article, entities in zip(articles, backend.extract_batch(texts)):
+        article['entities'] = entities
+    return articles
@@ -0,0 +1,200 @@
+import hashlib
+import json
+import re
+import sqlite3
+import time
+from contextlib import contextmanager
+from typing import Dict, List, NamedTuple
+
+from medium_clone_suggestion.article_processor.config import Config
+from medium_clone_suggestion.text_cleaning import html_to_text
+from medium_clone_suggestion.logger import get_logger
+
+logger = get_logger(__name__)
+
+# fields computed by ArticleProcessor that only depend on the content
+REUSED_FIELDS = ('summary', 'keywords', 'entities', 'topics', 'field', 'embedding')
+
+SIMHASH_BITS = 64
+BANDS = 4  # 4 x 16-bit bands: any two hashes within 3 bits share at least one band
+BAND_BITS = SIMHASH_BITS // BANDS
+SHINGLE_SIZE = 3
+
+_WORD = re.compile(r"[a-z0-9']+")
+
+
+class Fingerprint(NamedTuple):
+    sha: str  # exact match on the normalized text
+    simhash: int  # unsigned 64-bit, near-duplicate match by Hamming distance
+
+
+def _to_json(value):
+    # numpy values (the document embedding) are stored as plain lists
+    return value.tolist()
+
+
+def normalize(text: str) -> str:
+    return ' '.join(_WORD.findall(html_to_text(text).lower()))
+
+
+def simhash(normalized: str) -> int:
+    """64-bit SimHash over word 3-shingles."""
+    words = normalized.split()
+    if len(words) < SHINGLE_SIZE:
+        shingles = [' '.join(words)] if words else []
+    else:
+        shingles = [' '.join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1)]
+    weights = [0] * SIMHASH_BITS
+    for shingle in shingles:
+        h = int.from_bytes(hashlib.blake2b(shingle.encode('utf-8'), digest_size=8).digest(), 'big')
+        for bit in range(SIMHASH_BITS):
+            weights[bit] += 1 if h >> bit & 1 else -1
+    return sum(1 << bit for bit, w in enumerate(weights) if w > 0)
+
+
+def fingerprint(text: str) -> Fingerprint:
+    normalized = normalize(text or '')
+    return Fingerprint(hashlib.sha256(normalized.encode('utf-8')).hexdigest(), simhash(normalized))
+
+
+def hamming(a: int, b: int) -> int:
+    return bin(a ^ b).count('1')
+
+
+def _bands(h: int) -> List[int]:
+    mask = (1 << BAND_BITS) - 1
+    return [(h >> (i * BAND_BITS)) & mask for i in range(BANDS)]
+
+
+def _to_signed(h: int) -> int:
+    # SQLite integers are signed 64-bit
+    return h - (1 << 64) if h >= 1 << 63 else h
+
+
+def _to_unsigned(h: int) -> int:
+    return h + (1 << 64) if h < 0 else h
+
+
+class FingerprintStore:
+    """
+    Local SQLite store of content fingerprints and the processing results
+    computed for them.
+
+    Results are keyed by the SHA-256 of the normalized text, so a post whose
+    content did not change (an `isCategorized` reset, a repost, the mock
+    flows) reuses its summary, keywords, entities, topics and field. Posts
+    whose SimHash is within `max_distance` bits of another post's share that
+    post's `cluster_id`, which the recommender uses to collapse them.
+    """
+
+    def __init__(self, path: str = Config.FINGERPRINT_DB_PATH,
+                 max_distance: int = Config.NEAR_DUPLICATE_MAX_DISTANCE):
+        if max_distance >= BANDS:
+            raise ValueError(f"max_distance must be below {BANDS} for banded lookup")
+        self.path = path
+        self.max_distance = max_distance
+        self._init_db()
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def _init_db(self):
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS results (
+                    sha        TEXT PRIMARY KEY,
+                    payload    TEXT NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+            """)
+            conn.execute(f"""
+                CREATE TABLE IF NOT EXISTS fingerprints (
+                    postid     TEXT PRIMARY KEY,
+                    sha        TEXT NOT NULL,
+                    simhash    INTEGER NOT NULL,
+                    {', '.join(f'band{i} INTEGER NOT NULL' for i in range(BANDS))},
+                    cluster_id TEXT NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+            """)
+            for i in range(BANDS):
+                conn.execute(f"CREATE INDEX IF NOT EXISTS fingerprints_band{i}_idx ON fingerprints (band{i})")
+
+    def lookup(self, shas: List[str]) -> Dict[str, Dict]:
+        """Return the stored results for the given hashes, for those that have one."""
+        shas = list(set(shas))
+        if not shas:
+            return {}
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"SELECT sha, payload FROM results WHERE sha IN ({','.join('?' * len(shas))})", shas
+            ).fetchall()
+        return {sha: json.loads(payload) for sha, payload in rows}
+
+    def save_results(self, results: Dict[str, Dict]):
+        """Store processing results by content hash; only REUSED_FIELDS are kept."""
+        now = time.time()
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT INTO results (sha, payload, updated_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(sha) DO UPDATE SET payload = excluded.payload, updated_at = excluded.updated_at",
+                [(sha, json.dumps({k: r.get(k) for k in REUSED_FIELDS}, default=_to_json), now)
+                 for sha, r in results.items()]
+            )
+
+    def assign_cluster(self, postid: str, fp: Fingerprint) -> str:
+        """
+        Record the post's fingerprint and return its near-duplicate cluster id:
+        the cluster of the closest stored post within max_distance bits, else
+        the post's own id.
+        """
+        postid = str(postid)
+        bands = _bands(fp.simhash)
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                where = ' OR '.join(f'band{i} = ?' for i in range(BANDS))
+                candidates = conn.execute(
+                    f"SELECT postid, simhash, cluster_id FROM fingerprints WHERE postid != ? AND ({where})",
+                    (postid, *bands)
+                ).fetchall()
+                best = None
+                for other, other_hash, cluster_id in candidates:
+                    distance = hamming(fp.simhash, _to_unsigned(other_hash))
+                    if distance <= self.max_distance and (best is None or distance < best[0]):
+                        best = (distance, cluster_id)
+                cluster_id = best[1] if best else postid
+
+                conn.execute(f"""
+                    INSERT INTO fingerprints (postid, sha, simhash, {', '.join(f'band{i}' for i in range(BANDS))},
+                                              cluster_id, updated_at)
+                    VALUES (?, ?, ?, {', '.join('?' * BANDS)}, ?, ?)
+                    ON CONFLICT(postid) DO UPDATE SET
+                        sha = excluded.sha, simhash = excluded.simhash,
+                        {', '.join(f'band{i} = excluded.band{i}' for i in range(BANDS))},
+                        cluster_id = excluded.cluster_id, updated_at = excluded.updated_at
+                """, (postid, fp.sha, _to_signed(fp.simhash), *bands, cluster_id, time.time()))
+                conn.execute("COMMIT")
+                return cluster_id
+            except sqlite3.Error:
+                conn.execute("ROLLBACK")
+                raise
+
+    def clusters(self) -> Dict[str, List[str]]:
+        """Near-duplicate clusters with more than one post, by cluster id."""
+        with self._connect() as conn:
+            rows = conn.execute("""
+                SELECT cluster_id, postid FROM fingerprints
+                WHERE cluster_id IN (SELECT cluster_id FROM fingerprints GROUP BY cluster_id HAVING COUNT(*) > 1)
+                ORDER BY cluster_id, postid
+            """).fetchall()
+        clusters: Dict[str, List[str]] = {}
+        for cluster_id, postid in rows:
+            clusters.setdefault(cluster_id, []).append(postid)
+        return clusters
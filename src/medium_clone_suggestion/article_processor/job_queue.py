@@ -0,0 +1,201 @@
+import sqlite3
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Any, Tuple
+
+from medium_clone_suggestion.article_processor.config import Config
+from medium_clone_suggestion.logger import get_logger
+
+logger = get_logger(__name__)
+
+PENDING = "pending"
+PROCESSING = "processing"
+DONE = "done"
+FAILED = "failed"
+
+
+class QueueFullError(Exception):
+    """Raised when the queue already holds the maximum number of pending jobs."""
+
+
+class JobQueue:
+    """
+    Durable article job queue backed by a local SQLite file.
+
+    The API process enqueues postids, the article worker claims them in batches.
+    One row per postid, so re-enqueueing a post that is still pending or being
+    processed is a no-op.
+    """
+
+    def __init__(self, path: str = Config.JOB_QUEUE_PATH,
+                 max_pending: int = Config.JOB_QUEUE_MAX_PENDING,
+                 max_attempts: int = Config.JOB_MAX_ATTEMPTS,
+                 lease_seconds: float = Config.JOB_LEASE_SECONDS):
+        self.path = path
+        self.max_pending = max_pending
+        self.max_attempts = max_attempts
+        self.lease_seconds = lease_seconds
+        self._init_db()
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def _init_db(self):
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    postid      TEXT PRIMARY KEY,
+                    status      TEXT NOT NULL,
+                    attempts    INTEGER NOT NULL DEFAULT 0,
+                    enqueued_at REAL NOT NULL,
+                    updated_at  REAL NOT NULL,
+                    error       TEXT
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS jobs_status_idx ON jobs (status, enqueued_at)")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS worker_status (
+                    key   TEXT PRIMARY KEY,
+                    value TEXT
+                )
+            """)
+
+    # Producer side
+    def enqueue(self, postid: str) -> bool:
+        """
+        Queue a postid for processing.
+
+        Returns False if the post is already pending or being processed.
+        Raises QueueFullError when the pending backlog is at capacity.
+        """
+        postid = str(postid)
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute("SELECT status FROM jobs WHERE postid = ?", (postid,)).fetchone()
+                if row and row[0] in (PENDING, PROCESSING):
+                    conn.execute("COMMIT")
+                    return False
+
+                pending = conn.execute(
+                    "SELECT COUNT(*) FROM jobs WHERE status = ?", (PENDING,)
+                ).fetchone()[0]
+                if pending >= self.max_pending:
+                    conn.execute("ROLLBACK")
+                    raise QueueFullError(f"Job queue is full ({pending} pending)")
+
+                # done/failed posts are re-queued, e.g. after an edit
+                conn.execute("""
+                    INSERT INTO jobs (postid, status, attempts, enqueued_at, updated_at, error)
+                    VALUES (?, ?, 0, ?, ?, NULL)
+                    ON CONFLICT(postid) DO UPDATE SET
+                        status = excluded.status, attempts = 0,
+                        enqueued_at = excluded.enqueued_at,
+                        updated_at = excluded.updated_at, error = NULL
+                """, (postid, PENDING, now, now))
+                conn.execute("COMMIT")
+                return True
+            except sqlite3.Error:
+                conn.execute("ROLLBACK")
+                raise
+
+    # Consumer side
+    def claim_batch(self, limit: int) -> List[str]:
+        """Move up to `limit` of the oldest pending jobs to processing and return their postids."""
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._requeue_stale(conn, now)
+                rows = conn.execute(
+                    "SELECT postid FROM jobs WHERE status = ? ORDER BY enqueued_at LIMIT ?",
+                    (PENDING, limit)
+                ).fetchall()
+                postids = [r[0] for r in rows]
+                conn.executemany(
+                    "UPDATE jobs SET status = ?, attempts = attempts + 1, updated_at = ? WHERE postid = ?",
+                    [(PROCESSING, now, pid) for pid in postids]
+                )
+                conn.execute("COMMIT")
+                return postids
+            except sqlite3.Error:
+                conn.execute("ROLLBACK")
+                raise
+
+    def pending_info(self) -> Tuple[int, Optional[float]]:
+        """Return (pending count, enqueue time of the oldest pending job)."""
+        with self._connect() as conn:
+            count, oldest = conn.execute(
+                "SELECT COUNT(*), MIN(enqueued_at) FROM jobs WHERE status = ?", (PENDING,)
+            ).fetchone()
+        return count, oldest
+
+    def complete(self, postids: List[str]):
+        with self._connect() as conn:
+            conn.executemany(
+                "UPDATE jobs SET status = ?, updated_at = ?, error = NULL WHERE postid = ?",
+                [(DONE, time.time(), str(pid)) for pid in postids]
+            )
+
+    def fail(self, postids: List[str], error: str):
+        """Return failed jobs to pending, or mark them failed once out of attempts."""
+        now = time.time()
+        with self._connect() as conn:
+            conn.executemany("""
+                UPDATE jobs
+                SET status = CASE WHEN attempts >= ? THEN ? ELSE ? END,
+                    updated_at = ?, error = ?
+                WHERE postid = ?
+            """, [(self.max_attempts, FAILED, PENDING, now, error, str(pid)) for pid in postids])
+
+    def _requeue_stale(self, conn, now: float):
+        # jobs left in processing by a crashed worker: out of attempts they fail
+        # like in fail(), otherwise they go to the back of the queue so a post
+        # that kills the worker is not the first one claimed after a restart
+        conn.execute("""
+            UPDATE jobs
+            SET status = CASE WHEN attempts >= ? THEN ? ELSE ? END,
+                enqueued_at = CASE WHEN attempts >= ? THEN enqueued_at ELSE ? END,
+                updated_at = ?, error = ?
+            WHERE status = ? AND updated_at < ?
+        """, (self.max_attempts, FAILED, PENDING, self.max_attempts, now, now,
+              "lease expired", PROCESSING, now - self.lease_seconds))
+
+    # Status reporting
+    def set_worker_status(self, **fields: Any):
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT INTO worker_status (key, value) VALUES (?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+                [(k, str(v)) for k, v in fields.items()]
+            )
+
+    def stats(self) -> Dict[str, Any]:
+        now = time.time()
+        with self._connect() as conn:
+            counts = dict(conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall())
+            oldest = conn.execute(
+                "SELECT MIN(enqueued_at) FROM jobs WHERE status = ?", (PENDING,)
+            ).fetchone()[0]
+            worker = dict(conn.execute("SELECT key, value FROM worker_status").fetchall())
+
+        heartbeat: Optional[float] = float(worker["heartbeat"]) if "heartbeat" in worker else None
+        return {
+            "pending": counts.get(PENDING, 0),
+            "processing": counts.get(PROCESSING, 0),
+            "done": counts.get(DONE, 0),
+            "failed": counts.get(FAILED, 0),
+            "max_pending": self.max_pending,
+            "oldest_pending_age_seconds": round(now - oldest, 1) if oldest else None,
+            "worker": {
+                **{k: v for k, v in worker.items() if k != "heartbeat"},
+                "heartbeat_age_seconds": round(now - heartbeat, 1) if heartbeat else None,
+            },
+        }
@@ -1,3 +1,8 @@
+import gc
+import threading
+import time
+
+import numpy as np
 import torch
 
 from transformers import BartForConditionalGeneration, BartTokenizer
@@ -5,26 +10,116 @@ from sentence_transformers import SentenceTransformer, util
 from keybert import KeyBERT
 import psutil
 
-from typing import Tuple
+from typing import Tuple, Callable, Dict, Any, List
+from medium_clone_suggestion.article_processor.config import Config
 from medium_clone_suggestion.logger import get_logger
 
 logger = get_logger(__name__)
 
 class ModelManager:
-    def __init__(self, use_cuda: bool = True):
+    """
+    Keeps models resident across pipeline runs.
+
+    Models are reference-counted through acquire/release. A model nobody holds
+    stays loaded until it has been idle for `idle_timeout` seconds, so
+    back-to-back runs in the same process pay no load cost.
+    """
+    def __init__(self, use_cuda: bool = True, idle_timeout: float = Config.MODEL_IDLE_TIMEOUT_SECONDS):
         self.use_cuda = use_cuda and torch.cuda.is_available()
         self.device = "cuda" if self.use_cuda else "cpu"
+        self.idle_timeout = idle_timeout
         self._models = {}
+        self._refcounts: Dict[str, int] = {}
+        self._last_used: Dict[str, float] = {}
+        self._lock = threading.RLock()
 
     def get_model(self, model_name: str, model_class, **kwargs):
-        if model_name not in self._models:
-            self._check_memory()
-            if model_class == SentenceTransformer:
-                model = model_class(model_name, **kwargs)
-            else:
-                model = model_class.from_pretrained(model_name, **kwargs)
-            self._models[model_name] = model.to(self.device)
-        return self._models[model_name]
+        """Return a resident model without holding a reference to it."""
+        with self._lock:
+            model = self._load(model_name, lambda: self._build(model_name, model_class, **kwargs))
+            self._last_used[model_name] = time.time()
+            return model
+
+    def acquire(self, key: str, loader: Callable[[], Any]):
+        """Return the resident object for `key`, loading it with `loader` on first use."""
+        with self._lock:
+            self.evict_idle()
+            obj = self._load(key, loader)
+            self._refcounts[key] = self._refcounts.get(key, 0) + 1
+            self._last_used[key] = time.time()
+            return obj
+
+    def acquire_model(self, model_name: str, model_class, mode: str = "default", **kwargs):
+        """Acquire a model in the given inference mode (see Config.INFERENCE_MODES)."""
+        return self.acquire(
+            model_key(model_name, mode),
+            lambda: self._build(model_name, model_class, mode, **kwargs)
+        )
+
+    def release(self, key: str):
+        with self._lock:
+            if self._refcounts.get(key, 0) > 0:
+                self._refcounts[key] -= 1
+            self._last_used[key] = time.time()
+
+    def evict_idle(self, now: float = None) -> List[str]:
+        """Unload unreferenced models idle for longer than the timeout."""
+        now = now or time.time()
+        with self._lock:
+            idle = [
+                key for key in self._models
+                if self._refcounts.get(key, 0) == 0
+                and now - self._last_used.get(key, now) > self.idle_timeout
+            ]
+            for key in idle:
+                del self._models[key]
+                self._refcounts.pop(key, None)
+                self._last_used.pop(key, None)
+                logger.info(f"Unloaded idle model {key}")
+        if idle:
+            gc.collect()
+            if self.use_cuda:
+                torch.cuda.empty_cache()
+        return idle
+
+    def memory_usage(self) -> Dict[str, Dict[str, Any]]:
+        """Approximate resident size, refcount and idle time of every loaded model."""
+        now = time.time()
+        with self._lock:
+            return {
+                key: {
+                    "bytes": _estimate_bytes(obj),
+                    "refcount": self._refcounts.get(key, 0),
+                    "idle_seconds": round(now - self._last_used.get(key, now), 1),
+                }
+                for key, obj in self._models.items()
+            }
+
+    def _load(self, key: str, loader: Callable[[], Any]):
+        if key not in self._models:
+            started = time.time()
+            self._models[key] = loader()
+            logger.info(f"Loaded {key} in {time.time() - started:.1f}s")
+        return self._models[key]
+
+    def _build(self, model_name: str, model_class, mode: str = "default", **kwargs):
+        self._check_memory()
+        if mode not in INFERENCE_MODES:
+            raise ValueError(f"Unknown inference mode '{mode}', expected one of {INFERENCE_MODES}")
+
+        if mode == "onnx":
+            return _build_onnx(model_name, model_class, **kwargs)
+
+        if model_class == SentenceTransformer:
+            model = model_class(model_name, **kwargs)
+        else:
+            model = model_class.from_pretrained(model_name, **kwargs)
+
+        if mode == "int8":
+            if self.use_cuda:
+                raise ValueError("int8 dynamic quantization is only supported on CPU")
+            return quantize_dynamic_int8(model)
+        return model.to(self.device)
 
     def _check_memory(self):
         if self.use_cuda:
@@ -36,27 +131,98 @@ class ModelManager:
             if ram.available < 0.5 * 1024**3:  # 0.5GB threshold
                 raise RuntimeError(f"Insufficient RAM: {ram.available/(1024**3):.1f}GB free")
 
+
+INFERENCE_MODES = ("default", "int8", "onnx")
+
+def model_key(model_name: str, mode: str = "default") -> str:
+    return model_name if mode == "default" else f"{model_name}@{mode}"
+
+def quantize_dynamic_int8(model):
+    """Quantize the weights of every nn.Linear to int8; activations stay float."""
+    model = model.to("cpu").eval()
+    return torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+def _build_onnx(model_name: str, model_class, **kwargs):
+    """Export (or load) the model for ONNX Runtime on CPU."""
+    if model_class == SentenceTransformer:
+        return SentenceTransformer(model_name, backend="onnx", device="cpu", **kwargs)
+    try:
+        from optimum.onnxruntime import ORTModelForSeq2SeqLM
+    except ImportError as e:
+        raise ImportError(
+            "ONNX inference mode for the summarizer requires `optimum[onnxruntime]`"
+        ) from e
+    return ORTModelForSeq2SeqLM.from_pretrained(model_name, export=True, **kwargs)
+
+def _estimate_bytes(obj) -> int:
+    if isinstance(obj, torch.nn.Module):
+        # state_dict also covers the packed weights of quantized layers
+        total = 0
+        for value in obj.state_dict().values():
+            if isinstance(value, torch.Tensor):
+                total += value.numel() * value.element_size()
+            elif isinstance(value, tuple):
+                total += sum(_estimate_bytes(v) for v in value)
+        return total
+    if isinstance(obj, torch.Tensor):
+        return obj.numel() * obj.element_size()
+    if isinstance(obj, dict):
+        return sum(_estimate_bytes(v) for v in obj.values())
+    return 0
+
+
+_shared_manager = None
+_shared_lock = threading.Lock()
+
+def get_shared_model_manager() -> ModelManager:
+    """Process-wide ModelManager, so every pipeline in this process shares resident models."""
+    global _shared_manager
+    with _shared_lock:
+        if _shared_manager is None:
+            _shared_manager = ModelManager()
+        return _shared_manager
+
 class SummarizationModel:
-    def __init__(self, model_manager: ModelManager):
+    MODEL_NAME = "facebook/bart-large-cnn" #you can swap it w/another model here
+
+    def __init__(self, model_manager: ModelManager, mode: str = None):
         # initialize model using the manager.
-        self.model = model_manager.get_model(
-            "facebook/bart-large-cnn", #you can swap it w/another model here
-            BartForConditionalGeneration
+        self.model_manager = model_manager
+        self.mode = mode or Config.INFERENCE_MODES["summarizer"]
+        self.model = model_manager.acquire_model(
+            self.MODEL_NAME, BartForConditionalGeneration, mode=self.mode
         )
-        self.tokenizer = BartTokenizer.from_pretrained("facebook/bart-large-cnn")
+        self.tokenizer = model_manager.acquire(
+            f"{self.MODEL_NAME}:tokenizer",
+            lambda: BartTokenizer.from_pretrained(self.MODEL_NAME)
+        )
+
+    def close(self):
+        self.model_manager.release(model_key(self.MODEL_NAME, self.mode))
+        self.model_manager.release(f"{self.MODEL_NAME}:tokenizer")
         
-    def summarize(self, article_text: str) -> str:
-        inputs = self.tokenizer.encode(article_text, return_tensors="pt", max_length=1024, truncation=True)
-        summary_ids = self.model.generate(inputs, num_beams=4, min_length=50, max_length=200, early_stopping=True)
-        summary = self.tokenizer.decode(summary_ids[0], skip_special_tokens=True)
-        return summary
+    def summarize(self, article_text: str, max_time: float = None) -> str:
+        return self.summarize_batch([article_text], max_time=max_time)[0]
 
-class KeywordModel:
-    def __init__(self, model_manager: ModelManager):
-        self.encoder = model_manager.get_model(
-            "all-mpnet-base-v2",
-            SentenceTransformer
+    def summarize_batch(self, texts: List[str], max_time: float = None,
+                        min_length: int = 50, max_length: int = 200) -> List[str]:
+        """Summarize several texts in one generate call; `max_time` caps generation in seconds."""
+        inputs = self.tokenizer(texts, return_tensors="pt", max_length=1024,
+                                truncation=True, padding=True)
+        summary_ids = self.model.generate(
+            inputs["input_ids"], attention_mask=inputs["attention_mask"],
+            num_beams=4, min_length=min_length, max_length=max_length,
+            early_stopping=True, max_time=max_time
         )
+        return self.tokenizer.batch_decode(summary_ids, skip_special_tokens=True)
+
+class KeywordModel:
+    MODEL_NAME = "all-mpnet-base-v2"
+
+    def __init__(self, model_manager: ModelManager, mode: str = None):
+        self.model_manager = model_manager
+        self.mode = mode or Config.INFERENCE_MODES["encoder"]
+        self.encoder = model_manager.acquire_model(self.MODEL_NAME, SentenceTransformer, mode=self.mode)
         self.keybert = KeyBERT(model=self.encoder)
         #Needed for broader categorization
         self.fields = {
@@ -82,16 +248,31 @@ class KeywordModel:
         "Law & Justice": "Legal systems, Criminal law, Civil law, Constitutional law, Human rights, Courts, Judges, Lawyers, Legislation, Justice system, Legal theory, International law."
     }
         
-        self.field_embeddings = {
-            field: self.encoder.encode(desc, convert_to_tensor=True)
-            for field, desc in self.fields.items()
-        }
+        # field descriptions never change, so their embeddings stay resident with the encoder
+        self.field_embeddings = model_manager.acquire(
+            f"{model_key(self.MODEL_NAME, self.mode)}:field_embeddings",
+            lambda: {
+                field: self.encoder.encode(desc, convert_to_tensor=True)
+                for field, desc in self.fields.items()
+            }
+        )
+
+    def close(self):
+        key = model_key(self.MODEL_NAME, self.mode)
+        self.model_manager.release(key)
+        self.model_manager.release(f"{key}:field_embeddings")
         
-    def extract_keywords(self, text: str, top_n: int = 5, **kwargs) -> list[Tuple[str, float]]:
+    def embed_document(self, text: str):
+        """Unit-norm float32 document embedding, the same one KeyBERT ranks keywords against."""
+        return np.asarray(self.encoder.encode([text], normalize_embeddings=True), dtype=np.float32)[0]
+
+    def extract_keywords(self, text: str, top_n: int = 5, doc_embedding=None, **kwargs) -> list[Tuple[str, float]]:
+        # a precomputed document embedding saves KeyBERT its own encode pass
+        if doc_embedding is not None:
+            kwargs["doc_embeddings"] = np.asarray(doc_embedding).reshape(1, -1)
         return self.keybert.extract_keywords(text, top_n=top_n, **kwargs)
     
     def assign_field(self, keywords: list[str]) -> str:
-        print(f"received : {keywords}")
         if keywords and isinstance(keywords[0], tuple):
             keyword_strings = [str(kw[0]) for kw in keywords if isinstance(kw, tuple)]
         else:
@@ -101,7 +282,6 @@ class KeywordModel:
             return None
 
         keyword_embeddings = self.encoder.encode(keyword_strings, convert_to_tensor=True)
-        print(f"Gotten keyword embeddings: {keyword_embeddings}")
         # Compute cosine similarity between keywords and field representations
         similarities = {
             field: util.pytorch_cos_sim(keyword_embeddings, field_emb).mean().item()
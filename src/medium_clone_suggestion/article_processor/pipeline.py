@@ -1,8 +1,13 @@
 
-from typing import Dict
+from typing import Dict, List
+import numpy as np
 from medium_clone_suggestion.database import DatabaseManager
 from medium_clone_suggestion.article_processor.processing import ArticleProcessor
-from medium_clone_suggestion.article_processor.models import ModelManager
+from medium_clone_suggestion.article_processor.models import ModelManager, get_shared_model_manager
+from medium_clone_suggestion.article_processor.fingerprints import FingerprintStore
+from medium_clone_suggestion.candidate_pool import mark_published
+from medium_clone_suggestion.embedding_store import EmbeddingStore, get_embedding_store
+from medium_clone_suggestion.instrumentation import span, trace
 import nltk 
 from medium_clone_suggestion.logger import get_logger
 
@@ -13,16 +18,63 @@ nltk.download('stopwords')
 #I msised some of these, gotta include them
 
 class ProcessingPipeline:
-    def __init__(self):
+    def __init__(self, model_manager: ModelManager = None, fingerprint_store: FingerprintStore = None,
+                 embedding_store: EmbeddingStore = None):
         self.db = DatabaseManager()
-        self.model_manager = ModelManager()
-        self.processor = ArticleProcessor(self.model_manager)
+        # shared by default so models loaded by an earlier run are reused
+        self.model_manager = model_manager or get_shared_model_manager()
+        self.fingerprint_store = fingerprint_store or FingerprintStore()
+        self.embedding_store = embedding_store if embedding_store is not None else get_embedding_store("articles")
 
-    def run(self) -> Dict:
-        articles = self.db.fetch_uncategorized_articles()
-        processed = self.processor.process_batch(articles)
-        print(processed)
-        errors = self.db.update_processed(processed)
+    def run(self, limit: int = 100) -> Dict:
+        """Background sweep: process up to `limit` uncategorized posts."""
+        with trace() as stages, span("pipeline.total"):
+            with span("pipeline.fetch"):
+                articles = self.db.fetch_uncategorized_articles(limit)
+            results = self._process_and_store(articles)
+        logger.info(f"Pipeline run: {results} ({stages})")
+        return results
+
+    def run_for(self, postids: List[str]) -> Dict:
+        """Process exactly the given posts, fetched in a single query."""
+        with trace() as stages, span("pipeline.total"):
+            with span("pipeline.fetch"):
+                articles = self.db.fetch_articles_by_ids(postids)
+            found = {str(a['postid']) for a in articles}
+            results = self._process_and_store(articles)
+        results["missing"] = [str(p) for p in postids if str(p) not in found]
+        logger.info(f"Pipeline run: {results} ({stages})")
+        return results
+
+    def _process_and_store(self, articles: List[Dict]) -> Dict:
+        if not articles:
+            return {"processed": 0}
+        processor = ArticleProcessor(self.model_manager, fingerprint_store=self.fingerprint_store)
+        try:
+            with span("pipeline.process"):
+                processed = processor.process_batch(articles)
+        finally:
+            processor.close()
+        logger.debug("Processed %d articles", len(processed))
+        with span("pipeline.store"):
+            errors = self.db.update_processed(processed)
+        with span("pipeline.embeddings"):
+            self._store_embeddings(processed)
+        # the API's candidate pools reload on the next request
+        mark_published()
         if errors:
-            print(f"There were {len(errors)} errors.")
-        return {"processed": len(processed)}
\ No newline at end of file
+            logger.error(f"There were {len(errors)} errors saving processed articles.")
+        return {"processed": len(processed)}
+
+    def _store_embeddings(self, articles: List[Dict]):
+        """Persist the document embeddings computed during keyword extraction."""
+        embedded = [a for a in articles if a.get('embedding') is not None and 'postid' in a]
+        if not embedded:
+            return
+        try:
+            self.embedding_store.put(
+                [a['postid'] for a in embedded],
+                np.stack([np.asarray(a['embedding'], dtype=np.float32) for a in embedded])
+            )
+        except Exception as e:
+            logger.exception(f"Error storing article embeddings: {e}")
@@ -1,33 +1,96 @@
 from typing import List, Dict, Tuple
 import concurrent.futures
+import contextvars
 import logging
 import medium_clone_suggestion.article_processor.utils as utility 
 from medium_clone_suggestion.article_processor.models import SummarizationModel, KeywordModel
+from medium_clone_suggestion.article_processor.entities import EntityBackend, add_entities_batch, get_entity_backend
+from medium_clone_suggestion.article_processor.topics import TopicModel, add_topics_batch, get_topic_model
+from medium_clone_suggestion.article_processor.summarization import SummarizationPlanner
+from medium_clone_suggestion.article_processor.fingerprints import Fingerprint, FingerprintStore, fingerprint
 import traceback
 
+from medium_clone_suggestion.instrumentation import span
 from medium_clone_suggestion.logger import get_logger
 
 logger = get_logger(__name__)
 
 class ArticleProcessor:
-    def __init__(self, model_manager, max_workers: int = 4):
+    def __init__(self, model_manager, max_workers: int = 4, entity_backend: EntityBackend = None,
+                 topic_model: TopicModel = None, fingerprint_store: FingerprintStore = None):
         self.model_manager = model_manager
         self.max_workers = max_workers
         self.summarizer = SummarizationModel(model_manager)
         self.keyword_extractor = KeywordModel(model_manager)
+        self.entity_backend = entity_backend
+        self.topic_model = topic_model
+        self.fingerprint_store = fingerprint_store
+
+    def close(self):
+        """Release the models back to the model manager; they stay resident until idle."""
+        self.summarizer.close()
+        self.keyword_extractor.close()
 
     def process_batch(self, articles: List[Dict]) -> List[Dict]:
+        fingerprints = [(a, fingerprint(a.get('content', ''))) for a in articles] if self.fingerprint_store else []
+        fresh, reused = self._reuse_results(fingerprints) if fingerprints else (articles, [])
+
         with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            # each task runs under a copy of the caller's context, so its
+            # spans land in the caller's trace
             futures = {
-                executor.submit(self._process_single, article): article
-                for article in articles
+                executor.submit(contextvars.copy_context().run, self._process_single, article): article
+                for article in fresh
             }
-            return self._collect_results(futures)
+            results = self._collect_results(futures)
+        # NER and topic inference run once over the whole batch instead of per article
+        with span("article.entities"):
+            results = self._add_entities(results)
+        with span("article.topics"):
+            results = self._add_topics(results)
 
+        if fingerprints:
+            self._store_fingerprints(fingerprints, results)
+        return results + reused
 
-    def _process_single(self, article: Dict) -> Dict:
+    def _reuse_results(self, fingerprints: List[Tuple[Dict, Fingerprint]]) -> Tuple[List[Dict], List[Dict]]:
+        """Split off articles whose normalized content was processed before and copy those results."""
         try:
+            known = self.fingerprint_store.lookup([fp.sha for _, fp in fingerprints])
+        except Exception as e:
+            logger.exception(f"Error in fingerprint lookup: {e}")
+            known = {}
+        fresh, reused = [], []
+        for article, fp in fingerprints:
+            if fp.sha not in known:
+                fresh.append(article)
+                continue
             article = utility.clean_article(article)
+            article.update(known[fp.sha])
+            reused.append(article)
+        if reused:
+            logger.info(f"Reused processing results for {len(reused)} of {len(fingerprints)} articles")
+        return fresh, reused
+
+    def _store_fingerprints(self, fingerprints: List[Tuple[Dict, Fingerprint]], processed: List[Dict]):
+        """Remember clean results by content hash and tag every article with its near-duplicate cluster."""
+        processed_ids = {id(a) for a in processed}
+        try:
+            self.fingerprint_store.save_results({
+                fp.sha: article for article, fp in fingerprints
+                if id(article) in processed_ids and not article.get('is_gibberish') and not article.get('errors')
+            })
+            for article, fp in fingerprints:
+                if 'postid' in article:
+                    article['cluster_id'] = self.fingerprint_store.assign_cluster(article['postid'], fp)
+        except Exception as e:
+            logger.exception(f"Error storing fingerprints: {e}")
+
+
+    def _process_single(self, article: Dict) -> Dict:
+        try:
+            with span("article.clean"):
+                article = utility.clean_article(article)
         except Exception as e:
             logger.exception(f"Error in clean_article: {e}\nTraceback: {traceback.format_exc()}")
             article.setdefault('errors', []).append("clean_article failed")
@@ -38,54 +101,64 @@ class ArticleProcessor:
         article.setdefault('is_gibberish', False)
         if not article['is_gibberish'] == True:
             try:
-                article = self._add_summary(article)
+                with span("article.summary"):
+                    article = self._add_summary(article)
             except Exception as e:
                 logger.exception(f"Error in _add_summary: {e}\nTraceback: {traceback.format_exc()}")
                 article.setdefault('errors', []).append("_add_summary failed")
             
             try:
-                article = self._extract_keywords(article)
+                with span("article.keywords"):
+                    article = self._extract_keywords(article)
             except Exception as e:
                 logger.exception(f"Error in _extract_keywords: {e}\nTraceback: {traceback.format_exc()}")
                 article.setdefault('errors', []).append("_extract_keywords failed")
             
             try:
-                article = self._add_field(article)
+                with span("article.field"):
+                    article = self._add_field(article)
             except Exception as e:
                 logger.exception(f"Error in _add_field: {e}\nTraceback: {traceback.format_exc()}")
                 article.setdefault('errors', []).append("_add_field failed")
             
-            try:
-                article = utility.add_entities(article)
-            except Exception as e:
-                logger.exception(f"Error in add_entities: {e}\nTraceback: {traceback.format_exc()}")
-                article.setdefault('errors', []).append("add_entities failed")
-            
-            try:
-                article = utility.add_topics(article)
-            except Exception as e:
-                logger.exception(f"Error in add_topics: {e}\nTraceback: {traceback.format_exc()}")
-                article.setdefault('errors', []).append("add_topics failed")
-            
         return article
 
 
-    def _add_summary(self, article: Dict) -> Dict:
-        content = article.get('content', '')
-        if len(content) > 384:
-            article['summary'] = self.summarizer.summarize(content)
-            print(f"Summarized: {article['summary']}")
-        else:
-            article['summary'] = ''  
-    
+    def _add_entities(self, articles: List[Dict]) -> List[Dict]:
+        tagged = [a for a in articles if not a.get('is_gibberish')]
+        try:
+            add_entities_batch(tagged, self.entity_backend or get_entity_backend())
+        except Exception as e:
+            logger.exception(f"Error in add_entities: {e}\nTraceback: {traceback.format_exc()}")
+            for article in tagged:
+                article.setdefault('errors', []).append("add_entities failed")
+        return articles
 
+    def _add_topics(self, articles: List[Dict]) -> List[Dict]:
+        tagged = [a for a in articles if not a.get('is_gibberish')]
+        try:
+            add_topics_batch(tagged, self.topic_model or get_topic_model())
+        except Exception as e:
+            logger.exception(f"Error in add_topics: {e}\nTraceback: {traceback.format_exc()}")
+            for article in tagged:
+                article['topics'] = []
+                article.setdefault('errors', []).append("add_topics failed")
+        return articles
+
+    def _add_summary(self, article: Dict) -> Dict:
+        # the planner picks skip / extractive / abstractive / map-reduce from the length
+        planner = SummarizationPlanner(self.summarizer, encoder=getattr(self.keyword_extractor, 'encoder', None))
+        article['summary'] = planner.summarize(article.get('content', ''))
         return article
 
     #Took down the summary vs Total text just to reduce 
     #overall processing.
     
     def _extract_keywords(self, article: Dict) -> Dict:
-        keywords = self.keyword_extractor.extract_keywords(article['content'])
+        # KeyBERT needs the document embedding anyway; the pipeline keeps it in the embedding store
+        embedding = self.keyword_extractor.embed_document(article['content'])
+        keywords = self.keyword_extractor.extract_keywords(article['content'], doc_embedding=embedding)
+        article['embedding'] = embedding
         article['keywords'] = keywords
         return article
     
@@ -0,0 +1,113 @@
+import re
+import time
+from typing import List, Tuple
+
+import numpy as np
+
+from medium_clone_suggestion.article_processor.config import Config
+from medium_clone_suggestion.logger import get_logger
+
+logger = get_logger(__name__)
+
+SKIP = "skip"
+EXTRACTIVE = "extractive"
+ABSTRACTIVE = "abstractive"
+MAP_REDUCE = "map_reduce"
+
+TOKENS_PER_WORD = 1.3  # BART BPE tokens per whitespace word in English prose
+MAX_EXTRACTIVE_SENTENCES = 200  # bounds the encoder work of the extractive path
+
+_SENTENCE_END = re.compile(r'(?<=[.!?])\s+')
+
+
+def estimate_tokens(text: str) -> int:
+    return int(len(text.split()) * TOKENS_PER_WORD)
+
+
+def split_sentences(text: str) -> List[str]:
+    return [s.strip() for s in _SENTENCE_END.split(text) if s.strip()]
+
+
+def chunk_sentences(sentences: List[str], max_tokens: int) -> List[str]:
+    """Greedily pack whole sentences into chunks of at most max_tokens (estimated)."""
+    chunks, current, size = [], [], 0
+    for sentence in sentences:
+        n = estimate_tokens(sentence)
+        if current and size + n > max_tokens:
+            chunks.append(' '.join(current))
+            current, size = [], 0
+        current.append(sentence)
+        size += n
+    if current:
+        chunks.append(' '.join(current))
+    return chunks
+
+
+class SummarizationPlanner:
+    """
+    Picks a summarization strategy from the article's length:
+
+    - skip: very short posts get no summary
+    - extractive: the sentences closest to the embedding centroid
+    - abstractive: a single BART pass
+    - map_reduce: BART over sentence-aligned chunks in one batched generate,
+      then one pass over the joined chunk summaries
+
+    Generation is capped by the strategy's time budget; map-reduce falls back
+    to the extractive path over the chunk summaries when the budget runs out.
+    """
+
+    def __init__(self, summarizer, encoder=None, config: Config = Config):
+        self.summarizer = summarizer
+        self.encoder = encoder
+        self.config = config
+
+    def plan(self, text: str) -> Tuple[str, int]:
+        tokens = estimate_tokens(text)
+        if tokens < self.config.SUMMARY_SKIP_TOKENS:
+            return SKIP, tokens
+        if tokens < self.config.SUMMARY_EXTRACTIVE_TOKENS and self.encoder is not None:
+            return EXTRACTIVE, tokens
+        if tokens <= self.config.SUMMARY_ABSTRACTIVE_MAX_TOKENS:
+            return ABSTRACTIVE, tokens
+        return MAP_REDUCE, tokens
+
+    def summarize(self, text: str) -> str:
+        strategy, tokens = self.plan(text)
+        budget = self.config.SUMMARY_TIME_BUDGET_SECONDS.get(strategy)
+        started = time.perf_counter()
+        if strategy == SKIP:
+            summary = ''
+        elif strategy == EXTRACTIVE:
+            summary = self.extractive(text)
+        elif strategy == ABSTRACTIVE:
+            summary = self.summarizer.summarize(text, max_time=budget)
+        else:
+            summary = self.map_reduce(text, budget)
+        elapsed = time.perf_counter() - started
+        logger.debug(f"{strategy} summary of ~{tokens} tokens in {elapsed:.2f}s (budget {budget}s)")
+        return summary
+
+    def extractive(self, text: str, n_sentences: int = None) -> str:
+        n_sentences = n_sentences or self.config.SUMMARY_EXTRACTIVE_SENTENCES
+        sentences = split_sentences(text)[:MAX_EXTRACTIVE_SENTENCES]
+        if len(sentences) <= n_sentences:
+            return ' '.join(sentences)
+        emb = np.asarray(self.encoder.encode(sentences, normalize_embeddings=True))
+        centroid = emb.mean(axis=0)
+        top = np.argsort(-(emb @ centroid))[:n_sentences]
+        return ' '.join(sentences[i] for i in sorted(top))
+
+    def map_reduce(self, text: str, budget: float) -> str:
+        deadline = time.perf_counter() + budget
+        chunks = chunk_sentences(split_sentences(text), self.config.SUMMARY_CHUNK_TOKENS)
+        # most of the budget goes to the map step, the rest to the reduce pass
+        partials = self.summarizer.summarize_batch(chunks, max_time=budget * 0.7)
+        joined = ' '.join(partials)
+
+        remaining = deadline - time.perf_counter()
+        if remaining <= 1.0 or estimate_tokens(joined) > self.config.SUMMARY_ABSTRACTIVE_MAX_TOKENS:
+            if self.encoder is not None:
+                return self.extractive(joined)
+            return joined
+        return self.summarizer.summarize(joined, max_time=remaining)
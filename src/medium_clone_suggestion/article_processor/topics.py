@@ -0,0 +1,103 @@
+import threading
+from typing import Dict, List, Optional, Set
+
+import numpy as np
+from gensim import corpora
+from gensim.models import LdaModel
+from gensim.utils import simple_preprocess
+
+from medium_clone_suggestion.article_processor.config import Config
+from medium_clone_suggestion.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class TopicModel:
+    """
+    Per-document topic inference with the pre-trained LDA model.
+
+    Every article gets the labels of its own most probable topics, inferred
+    for the whole batch in one `LdaModel.inference` call (the variational
+    step behind `lda_model[corpus]`). A topic's label is its top word.
+    """
+
+    def __init__(self, model_path: str = Config.LDA_MODEL_PATH,
+                 dictionary_path: str = Config.LDA_DICTIONARY_PATH,
+                 min_probability: float = Config.TOPIC_MIN_PROBABILITY,
+                 top_n: int = Config.TOPIC_TOP_N,
+                 stopwords: Optional[Set[str]] = None):
+        self.model_path = model_path
+        self.dictionary_path = dictionary_path
+        self.min_probability = min_probability
+        self.top_n = top_n
+        self._stopwords = stopwords
+        self._lda = None
+        self._dictionary = None
+        self._labels: List[str] = []
+        self._lock = threading.Lock()
+
+    def _load(self):
+        with self._lock:
+            if self._lda is None:
+                lda = LdaModel.load(self.model_path)
+                self._dictionary = corpora.Dictionary.load(self.dictionary_path)
+                self._labels = [
+                    lda.show_topic(topic_id, topn=1)[0][0] for topic_id in range(lda.num_topics)
+                ]
+                if self._stopwords is None:
+                    from nltk.corpus import stopwords
+                    self._stopwords = set(stopwords.words('english'))
+                self._lda = lda
+                logger.info(f"Loaded LDA model with {lda.num_topics} topics from {self.model_path}")
+        return self._lda, self._dictionary
+
+    def tokenize(self, text: str) -> List[str]:
+        return [w for w in simple_preprocess(text.lower()) if w not in self._stopwords]
+
+    def infer_batch(self, texts: List[str]) -> List[List[str]]:
+        """Return the top topic labels of each text, most probable first."""
+        if not texts:
+            return []
+        lda, dictionary = self._load()
+        corpus = [dictionary.doc2bow(self.tokenize(t)) for t in texts]
+
+        gamma, _ = lda.inference(corpus)
+        theta = gamma / gamma.sum(axis=1, keepdims=True)
+        order = np.argsort(-theta, axis=1)[:, :self.top_n]
+
+        results = []
+        for bow, probs, top in zip(corpus, theta, order):
+            if not bow:  # nothing in the vocabulary, the posterior is just the prior
+                results.append([])
+                continue
+            labels = []
+            for topic_id in top:
+                if probs[topic_id] < self.min_probability:
+                    break
+                label = self._labels[topic_id]
+                if label not in labels:
+                    labels.append(label)
+            results.append(labels)
+        return results
+
+
+_topic_model: Optional[TopicModel] = None
+_topic_model_lock = threading.Lock()
+
+def get_topic_model() -> TopicModel:
+    """Process-wide TopicModel, loaded on first use."""
+    global _topic_model
+    with _topic_model_lock:
+        if _topic_model is None:
+            _topic_model = TopicModel()
+        return _topic_model
+
+
+def add_topics_batch(articles: List[Dict], model: TopicModel = None) -> List[Dict]:
+    """Infer topics for all articles at once and store them under 'topics'."""
+    if not articles:
+        return articles
+    model = model or get_topic_model()
+    for article, topics in zip(articles, model.infer_batch([a.get('content', '') for a in articles])):
+        article['topics'] = topics
+    return articles
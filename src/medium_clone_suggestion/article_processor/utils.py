@@ -1,19 +1,15 @@
-from bs4 import BeautifulSoup
 import nltk, re
-from nltk import pos_tag, word_tokenize, ne_chunk
 from nltk.corpus import stopwords, wordnet
-from gensim import corpora
-from gensim.models import LdaModel
 from typing import Dict, List
-from gensim.utils import simple_preprocess
 
+from medium_clone_suggestion.article_processor.entities import NLTKEntityBackend
+from medium_clone_suggestion.text_cleaning import html_to_text
+from medium_clone_suggestion.article_processor.topics import get_topic_model
 from medium_clone_suggestion.logger import get_logger
 
 logger = get_logger(__name__)
 nltk.download('stopwords', quiet=True)
 STOPWORDS = set(stopwords.words('english'))
-lda_model = LdaModel.load("src/medium_clone_suggestion/article_processor/models/trained_lda.model")
-dictionary = corpora.Dictionary.load("src/medium_clone_suggestion/article_processor/models/lda_dictionary.dict")
 
 
 """
@@ -21,76 +17,62 @@ dictionary = corpora.Dictionary.load("src/medium_clone_suggestion/article_proces
 ""Cleaning the HTML 
 """
 def clean_article(article: Dict) -> Dict:
-    text = BeautifulSoup(article['content'], 'html.parser').get_text()
+    # Parsed once at ingest: the plain text and gibberish score are stored
+    # with the metadata so the serving path never touches HTML.
+    text = html_to_text(article['content'])
+    score = gibberish_score(text)
     
     # If 'is_gibberish' is missing, initialize it to False
     if 'is_gibberish' not in article:
         article['is_gibberish'] = False
     
-    if is_gibberish(text):
+    article['gibberish_score'] = score
+    if score >= 1.0:
         article["is_gibberish"] = True
     else:
         article['content'] = text
+        article['plain_text'] = text
     
     return article
 
-def is_gibberish(text: str,
-                 stopword_threshold: float = 0.2,
-                 long_word_threshold: int = 15) -> bool:
+def gibberish_score(text: str,
+                    stopword_threshold: float = 0.2,
+                    long_word_threshold: int = 15,
+                    long_word_ratio_limit: float = 0.3) -> float:
+    """
+    0.0 for ordinary prose, 1.0 for text that is_gibberish rejects. Grows as the
+    stopword ratio drops below `stopword_threshold` or the share of
+    ridiculously long words approaches `long_word_ratio_limit`.
+    """
     tokens = re.findall(r"[A-Za-z']+", text.lower())
     if not tokens:
-        return True
+        return 1.0
 
-    stopword_count = sum(t in STOPWORDS for t in tokens)
-    stopword_ratio = stopword_count / len(tokens)
-
-    long_words = sum(len(t) > long_word_threshold for t in tokens)
-    long_word_ratio = long_words / len(tokens)
+    stopword_ratio = sum(t in STOPWORDS for t in tokens) / len(tokens)
+    long_word_ratio = sum(len(t) > long_word_threshold for t in tokens) / len(tokens)
 
     # too few stopwords OR too many ridiculously long words => gibberish
-    return (stopword_ratio < stopword_threshold) or (long_word_ratio > 0.3)
+    if stopword_ratio < stopword_threshold or long_word_ratio > long_word_ratio_limit:
+        return 1.0
+    stopword_part = max(0.0, 1 - (stopword_ratio - stopword_threshold) / stopword_threshold)
+    long_word_part = long_word_ratio / long_word_ratio_limit
+    return round(min(0.99, max(stopword_part, long_word_part)), 3)
+
+def is_gibberish(text: str,
+                 stopword_threshold: float = 0.2,
+                 long_word_threshold: int = 15) -> bool:
+    return gibberish_score(text, stopword_threshold, long_word_threshold) >= 1.0
 
 def add_entities(article: Dict) -> Dict:
-    tokens = word_tokenize(article['content'])
-    tagged = pos_tag(tokens)
-    entities = ne_chunk(tagged)
-    
-    # Entity processing logic from extract_categorized_entities
-    categories = {
-        'PERSON': [],
-        'ORGANIZATION': [],
-        'LOCATION': [],
-        'GPE': [],
-        'FACILITY': [],
-        'PRODUCT': [],
-        'EVENT': [],
-        'OTHER': []
-    }
-    for chunk in entities:
-        if hasattr(chunk, 'label'):
-            entity_text = ' '.join(c[0] for c in chunk)
-            entity_type = chunk.label()
-            if entity_type in categories:
-                categories[entity_type].append(entity_text)
-            else:
-                categories['OTHER'].append(entity_text)
-    
-    article['entities'] = {k: list(set(v)) for k, v in categories.items() if v}
+    # Single-article NLTK path, kept for comparison with the batched backends
+    # in article_processor.entities (see ArticleProcessor.process_batch).
+    article['entities'] = NLTKEntityBackend().extract(article['content'])
     return article
 
 def add_topics(article: Dict) -> Dict:
-    # LDA topic modeling implementation from add_topic_modeling
+    # Per-document LDA inference; ArticleProcessor uses the batched add_topics_batch
     try:
-        stop_words = set(stopwords.words('english'))
-        tokens = [word for word in simple_preprocess(article['content'].lower()) if word not in stop_words]
-        dictionary = dictionary
-        corpus = [dictionary.doc2bow(tokens)]
-        lda_model = lda_model
-        topics = []
-        for topic_id, words in lda_model.print_topics():
-            words_list = [word.split('*')[1].strip().replace('"', '') for word in words.split('+')]
-            topics.append(words_list[0])
-        article['topics'] = topics
+        article['topics'] = get_topic_model().infer_batch([article['content']])[0]
     except Exception as e:
         logger.warning(f"Topic modeling failed: {e}")
         article['topics'] = []
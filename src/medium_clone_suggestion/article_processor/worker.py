@@ -0,0 +1,151 @@
+import argparse
+import time
+from typing import Optional
+
+from dotenv import load_dotenv
+
+from medium_clone_suggestion.article_processor.config import Config
+from medium_clone_suggestion.article_processor.job_queue import JobQueue
+from medium_clone_suggestion.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class ArticleWorker:
+    """
+    Long-lived article processing process.
+
+    Hosts the ProcessingPipeline and its resident models, then
+    drains the job queue in batches of exactly the queued postids. Queued
+    jobs always take priority over the periodic sweep of uncategorized posts.
+    """
+
+    def __init__(self, queue: JobQueue = None, pipeline=None, config: Config = Config,
+                 batch_size: int = None):
+        self.config = config
+        self.batch_size = batch_size or config.WORKER_BATCH_SIZE
+        self.queue = queue or JobQueue()
+        if pipeline is None:
+            # imported here so the queue can be used without loading torch
+            from medium_clone_suggestion.article_processor.pipeline import ProcessingPipeline
+            pipeline = ProcessingPipeline()
+        self.pipeline = pipeline
+        self.last_sweep = 0.0
+
+    def _wait_for_batch(self):
+        """Give a partial batch up to COALESCE_WINDOW_SECONDS to fill before claiming it."""
+        while True:
+            count, oldest = self.queue.pending_info()
+            if not count or count >= self.batch_size:
+                return
+            remaining = self.config.COALESCE_WINDOW_SECONDS - (time.time() - oldest)
+            if remaining <= 0:
+                return
+            time.sleep(min(remaining, self.config.COALESCE_WINDOW_SECONDS))
+
+    def run_once(self) -> int:
+        """Process one batch of queued jobs. Returns the number of jobs claimed."""
+        self._wait_for_batch()
+        postids = self.queue.claim_batch(self.batch_size)
+        if not postids:
+            return 0
+
+        logger.info(f"Processing batch of {len(postids)} queued posts")
+        started = time.time()
+        try:
+            results = self.pipeline.run_for(postids)
+        except Exception as e:
+            logger.exception(f"Article batch failed: {e}")
+            self.queue.fail(postids, str(e))
+            self.queue.set_worker_status(last_error=str(e), heartbeat=time.time())
+            return len(postids)
+
+        missing = set(results.get("missing", []))
+        if missing:
+            logger.warning(f"{len(missing)} queued posts were not found: {sorted(missing)}")
+            self.queue.fail(list(missing), "post not found")
+        self.queue.complete([pid for pid in postids if pid not in missing])
+        self.queue.set_worker_status(
+            last_batch_size=len(postids),
+            last_batch_seconds=round(time.time() - started, 2),
+            last_result=results,
+            heartbeat=time.time(),
+        )
+        return len(postids)
+
+    def drain(self) -> int:
+        """Process queued jobs until the queue is empty."""
+        total = 0
+        while True:
+            claimed = self.run_once()
+            if not claimed:
+                return total
+            total += claimed
+
+    def _sweep_due(self) -> bool:
+        return time.time() - self.last_sweep >= self.config.SWEEP_INTERVAL_HOURS * 3600
+
+    def sweep(self):
+        """
+        Process uncategorized posts in batch-sized chunks, draining the job
+        queue before each chunk so targeted requests never wait on the sweep.
+        """
+        logger.info("Running background sweep of uncategorized posts")
+        self.last_sweep = time.time()
+        swept = 0
+        while swept < self.config.SWEEP_LIMIT:
+            self.drain()
+            chunk = min(self.batch_size, self.config.SWEEP_LIMIT - swept)
+            processed = self.pipeline.run(limit=chunk).get("processed", 0)
+            if not processed:
+                break
+            swept += processed
+        self.queue.set_worker_status(last_sweep=self.last_sweep, heartbeat=time.time())
+        logger.info(f"Sweep complete: {swept} posts processed")
+
+    def run_forever(self, max_iterations: Optional[int] = None):
+        iterations = 0
+        while max_iterations is None or iterations < max_iterations:
+            iterations += 1
+            if self.drain():
+                continue
+            if self._sweep_due():
+                try:
+                    self.sweep()
+                except Exception as e:
+                    logger.exception(f"Background sweep failed: {e}")
+                continue
+            self.report_idle()
+            time.sleep(self.config.WORKER_POLL_INTERVAL_SECONDS)
+
+    def report_idle(self):
+        """Unload models past their idle timeout and publish resident memory."""
+        manager = getattr(self.pipeline, "model_manager", None)
+        if manager is None:
+            self.queue.set_worker_status(heartbeat=time.time())
+            return
+        manager.evict_idle()
+        usage = manager.memory_usage()
+        self.queue.set_worker_status(
+            heartbeat=time.time(),
+            resident_models=",".join(sorted(usage)),
+            model_memory_mb=round(sum(m["bytes"] for m in usage.values()) / (1024 * 1024), 1),
+        )
+
+
+def main():
+    """Command-line entry point for the article worker."""
+    load_dotenv()
+    parser = argparse.ArgumentParser(description="Article processing worker")
+    parser.add_argument("--queue", default=Config.JOB_QUEUE_PATH, help="Path to the SQLite job queue")
+    parser.add_argument("--batch-size", type=int, default=Config.WORKER_BATCH_SIZE,
+                        help="Maximum number of jobs processed per batch")
+    args = parser.parse_args()
+
+    worker = ArticleWorker(queue=JobQueue(args.queue), batch_size=args.batch_size)
+    logger.info(f"Article worker started on queue {args.queue}")
+    worker.run_forever()
+
+
+if __name__ == "__main__":
+    main()
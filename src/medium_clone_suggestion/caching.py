@@ -4,11 +4,15 @@ import os
 from typing import Dict, List
 from datetime import datetime, timedelta
 import copy
+import threading
 
 class CacheManager:
     def __init__(self, cache_file="cache.json"):
         self.cache_file = cache_file
         self.cache = {}
+        # requests write from executor threads; snapshot and file writes must not race them
+        self._lock = threading.Lock()
+        self._file_lock = threading.Lock()
         self.load_cache_from_file()
 
     def load_cache_from_file(self):
@@ -29,19 +33,21 @@ class CacheManager:
                 self.cache = {}
 
     def save_cache_to_file(self):
-        cache_to_save = copy.deepcopy(self.cache)
+        with self._lock:
+            cache_to_save = copy.deepcopy(self.cache)
         for key, value in cache_to_save.items():
             if isinstance(value, dict) and 'ts' in value and isinstance(value['ts'], datetime):
                 value['ts'] = value['ts'].isoformat()
         try:
-            with open(self.cache_file, 'w') as f:
+            with self._file_lock, open(self.cache_file, 'w') as f:
                 json.dump(cache_to_save, f)
         except Exception:
             pass
 
     def set_cache(self, user_id: str, history_hash: str, value: Dict):
         cache_key = f"{user_id}-{history_hash}"
-        self.cache[cache_key] = value
+        with self._lock:
+            self.cache[cache_key] = value
         self.save_cache_to_file()
 
     def check_and_update_cache(self, user_id: str, history: List[str], history_hash: str, timestamp: datetime, recs: list):
@@ -71,7 +77,6 @@ class CacheManager:
         return []
 
     def _hash_history(self, history_list):
-        # Ensure this matches the hash_history function in the main code
         sorted_ids = sorted(history_list)
         serialized = json.dumps(sorted_ids, sort_keys=True)
         return hashlib.sha256(serialized.encode()).hexdigest()
\ No newline at end of file
@@ -0,0 +1,127 @@
+import os
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+from medium_clone_suggestion.config import (
+    CANDIDATE_POOL_SIZE, CANDIDATE_POOL_TTL_SECONDS, PUBLISH_MARKER_PATH,
+)
+from medium_clone_suggestion.feature_extraction import ArticleFeatures
+from medium_clone_suggestion.singleflight import SingleFlight
+from medium_clone_suggestion.instrumentation import span
+from medium_clone_suggestion.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def mark_published(path: str = PUBLISH_MARKER_PATH):
+    """Called by the article pipeline after it stores new posts; invalidates candidate pools."""
+    with open(path, "w") as f:
+        f.write(str(time.time()))
+
+
+def _marker_mtime(path: str) -> float:
+    try:
+        return os.stat(path).st_mtime
+    except OSError:
+        return 0.0
+
+
+class CandidatePool:
+    """
+    One field's candidate articles with their extracted features, TF-IDF rows
+    and, when an embedding store is configured, their embeddings (zero rows
+    where `has_embedding` is False).
+    """
+    __slots__ = ("field", "articles", "postids", "features", "rows", "version", "loaded_at", "marker",
+                 "embeddings", "has_embedding")
+
+    def __init__(self, field: str, articles: List[Dict[str, Any]], features: List[ArticleFeatures],
+                 rows, version: int, marker: float, embeddings: Optional[np.ndarray] = None,
+                 has_embedding: Optional[np.ndarray] = None):
+        self.field = field
+        self.articles = articles
+        self.postids = [a["postid"] for a in articles]
+        self.features = features
+        self.rows = rows
+        self.version = version
+        self.loaded_at = time.monotonic()
+        self.marker = marker
+        self.embeddings = embeddings
+        self.has_embedding = has_embedding
+
+    def unseen_indices(self, seen, limit: int) -> np.ndarray:
+        """Indices of the first `limit` articles (in pool order) that `seen` does not contain."""
+        if not self.postids:
+            return np.zeros(0, dtype=np.intp)
+        return np.flatnonzero(~seen.seen_mask(self.postids))[:limit]
+
+
+class CandidatePoolCache:
+    """
+    Per-field candidate pools shared by every user.
+
+    A pool holds the field's top CANDIDATE_POOL_SIZE articles as returned by
+    `loader(field, limit)`, their extracted features and TF-IDF rows. It is
+    reloaded after `ttl` seconds or when the publish marker file changes. Its
+    rows are re-transformed, without a DB call, when the similarity calculator
+    has refit its vectorizer. Concurrent reloads of one field share one load.
+    With an `embedding_store`, a load also gathers the articles' embeddings.
+    """
+
+    def __init__(self, similarity_calculator, feature_extractor,
+                 ttl: float = CANDIDATE_POOL_TTL_SECONDS,
+                 pool_size: int = CANDIDATE_POOL_SIZE,
+                 marker_path: str = PUBLISH_MARKER_PATH,
+                 embedding_store=None):
+        self.similarity_calculator = similarity_calculator
+        self.feature_extractor = feature_extractor
+        self.embedding_store = embedding_store
+        self.ttl = ttl
+        self.pool_size = pool_size
+        self.marker_path = marker_path
+        self._pools: Dict[str, CandidatePool] = {}
+        self._loads = SingleFlight()
+
+    def get(self, field: str, loader: Callable[[str, int], List[Dict[str, Any]]]) -> CandidatePool:
+        marker = _marker_mtime(self.marker_path)
+        pool = self._pools.get(field)
+        if pool is None or pool.marker != marker or time.monotonic() - pool.loaded_at > self.ttl:
+            pool = self._loads.do(("load", field), self._load, field, loader, marker)
+        elif pool.version != self.similarity_calculator.version:
+            pool = self._loads.do(("rows", field), self._refresh_rows, pool)
+        return pool
+
+    def _load(self, field: str, loader, marker: float) -> CandidatePool:
+        with span("candidates.fetch"):
+            articles = loader(field, self.pool_size)
+        with span("candidates.features"):
+            features = self.feature_extractor.features_many(articles)
+        version = self.similarity_calculator.version
+        with span("candidates.vectorize"):
+            rows = self.similarity_calculator.transform_articles(features) if features else None
+        embeddings = has_embedding = None
+        if self.embedding_store is not None:
+            with span("candidates.embeddings"):
+                embeddings, has_embedding = self.embedding_store.get(a["postid"] for a in articles)
+        pool = self._pools[field] = CandidatePool(field, articles, features, rows, version, marker,
+                                                  embeddings, has_embedding)
+        logger.debug("Loaded candidate pool for %s: %d articles", field, len(articles))
+        return pool
+
+    def _refresh_rows(self, pool: CandidatePool) -> CandidatePool:
+        version = self.similarity_calculator.version
+        with span("candidates.vectorize"):
+            rows = self.similarity_calculator.transform_articles(pool.features) if pool.features else None
+        fresh = CandidatePool(pool.field, pool.articles, pool.features, rows, version, pool.marker,
+                              pool.embeddings, pool.has_embedding)
+        fresh.loaded_at = pool.loaded_at
+        self._pools[pool.field] = fresh
+        return fresh
+
+    def invalidate(self, field: Optional[str] = None):
+        if field is None:
+            self._pools.clear()
+        else:
+            self._pools.pop(field, None)
@@ -8,10 +8,11 @@ from typing import List, Dict, Any, Optional, Tuple, Set
 # Third-party libraries (ensure these are in your pyproject.toml/requirements.txt)
 from supabase import create_client, Client
 from dotenv import load_dotenv
-from bs4 import BeautifulSoup # For cleaning HTML in mock data if needed
+from medium_clone_suggestion.text_cleaning import strip_tags
+from medium_clone_suggestion.seen_filter import SeenFilter, get_seen_filter_cache
+from medium_clone_suggestion.sampling import get_field_id_cache, sample_unseen
 import hashlib
 import json
-import random
 from medium_clone_suggestion.logger import get_logger
 
 logger = get_logger(__name__)
@@ -60,6 +61,17 @@ class DatabaseManager:
             .limit(limit)\
             .execute()
         return response.data
+
+    @rate_limited
+    def fetch_articles_by_ids(self, postids: List[str]) -> List[Dict]:
+        """Fetch exactly the given posts in one query, regardless of isCategorized."""
+        if not postids:
+            return []
+        response = self.client.table('posts')\
+            .select('postid, title, content')\
+            .in_('postid', [str(p) for p in postids])\
+            .execute()
+        return response.data or []
     
     
     @rate_limited
@@ -86,9 +98,12 @@ class DatabaseManager:
                 'keywords': art.get('keywords', []),
                 'topics':  art.get('topics', []),
                 'entities': art.get('entities', []),
-                'summary': art.get('summary', ' ')
+                'summary': art.get('summary', ' '),
+                'plain_text': art.get('plain_text', ''),
+                'gibberish_score': art.get('gibberish_score'),
+                'cluster_id': art.get('cluster_id')
             }
-            print(f"saving field!!! {art.get('field', 'Unknown')}")
+            logger.debug("Saving %s with field %s", postid, art.get('field', 'Unknown'))
             # 1) mark as categorized
             upd = self.client.table('posts')\
                 .update({'isCategorized': True, 'field': art.get('field', 'Unknown')})\
@@ -216,7 +231,7 @@ class DatabaseManager:
     # User interest management
     @rate_limited
     def update_user_interests(self, user_id: str, interests: Dict) -> bool:
-        print(f" {interests}")
+        logger.debug("Updating interests for %s", user_id)
         response = self.client.table('user_profile_interests')\
             .upsert({
                     'userid': user_id,
@@ -233,10 +248,60 @@ class DatabaseManager:
         response = self.client.table('history')\
             .select('postid')\
             .eq('userid', user_id)\
-            .order('postid')\
             .execute()
         return [item['postid'] for item in response.data]
+
+    @rate_limited
+    def get_user_history_rows(self, user_id: str, since: Optional[str] = None) -> List[Dict]:
+        """History rows (postid, created_at), optionally only those at or after `since`."""
+        query = self.client.table('history')\
+            .select('postid, created_at')\
+            .eq('userid', user_id)
+        if since:
+            query = query.gte('created_at', since)
+        return query.execute().data or []
+
+    def get_user_seen_filter(self, user_id: str) -> SeenFilter:
+        """The user's seen posts, from the process-wide incremental cache."""
+        return get_seen_filter_cache().get(user_id, self)
+
+    @rate_limited
+    def get_user_history_token(self, user_id: str) -> str:
+        """
+        Cheap validity token for the user's history: row count plus the latest
+        created_at, fetched as a single row with an exact count. History is
+        append-only, so any new read changes the token.
+        """
+        response = self.client.table('history')\
+            .select('created_at', count='exact')\
+            .eq('userid', user_id)\
+            .order('created_at', desc=True)\
+            .limit(1)\
+            .execute()
+        latest = response.data[0]['created_at'] if response.data else ''
+        return f"{response.count or 0}:{latest}"
     
+    @rate_limited
+    def fetch_field_postids(self, field: str, page_size: int = 1000) -> List[str]:
+        """All non-deleted postids of a field, paged past the API row limit."""
+        postids, start = [], 0
+        while True:
+            if start:
+                self._rate_limit()  # every further page is a request of its own
+            res = self.client\
+                .from_("posts")\
+                .select("postid")\
+                .eq("field", field)\
+                .eq("deleted", False)\
+                .order("postid")\
+                .range(start, start + page_size - 1)\
+                .execute()
+            page = [post["postid"] for post in (res.data or [])]
+            postids.extend(page)
+            if len(page) < page_size:
+                return postids
+            start += page_size
+
     def fetch_random_unseen(self, user_id: str, field: str, num_articles: int = 10):
         """
         Fetch random unseen post IDs for a user from a specific field.
@@ -249,35 +314,16 @@ class DatabaseManager:
         Returns:
             A list of dicts like [{ "postid": str }]
         """
-        # 1. Fetch seen postids from history
-        seen_res = self.client\
-            .from_("history")\
-            .select("postid")\
-            .eq("userid", user_id)\
-            .execute()
-
-        seen_ids = {record["postid"] for record in (seen_res.data or [])}
-
-        # 2. Fetch postids from posts table
-        posts_res = self.client\
-            .from_("posts")\
-            .select("postid")\
-            .eq("field", field)\
-            .eq("deleted", False)\
-            .execute()
-        
-        postids = [post["postid"] for post in (posts_res.data or [])]
+        # 1. Seen posts from the shared per-user filter (incrementally updated)
+        seen = self.get_user_seen_filter(user_id)
 
-        # 3. Filter unseen postids
-        unseen_postids = [pid for pid in postids if pid not in seen_ids]
-
-        if not unseen_postids:
-            return []
+        # 2. The field's postids, cached in-process for FIELD_IDS_TTL_SECONDS
+        postids = get_field_id_cache().get(field, self.fetch_field_postids)
 
-        # 4. Randomly sample unseen postids
-        sampled_postids = random.sample(unseen_postids, min(num_articles, len(unseen_postids)))
+        # 3. Rejection-sample unseen postids
+        sampled_postids = sample_unseen(postids, seen, num_articles)
 
-        # 5. Wrap into dicts for compatibility
+        # 4. Wrap into dicts for compatibility
         return [{"postid": pid} for pid in sampled_postids]
     
 ##i know could be much more efficient to get them both but for now just writing them
@@ -359,17 +405,43 @@ class DatabaseManager:
         ).execute()
         for article in res.data:
             raw = article.get('summary') or ''
-            article['summary'] = BeautifulSoup(raw, 'html.parser').get_text()
+            # summaries are plain text since ingest-time cleaning; only rows
+            # written before that still carry markup
+            article['summary'] = strip_tags(raw) if '<' in raw else raw
 
-        print(res.data)   
+        logger.debug("Fetched %d unseen %s articles for %s", len(res.data or []), field, user_id)
         return res.data or []
     
+    @rate_limited
+    def fetch_field_candidates(self, field: str, limit: int = 500) -> List[Dict]:
+        """
+        The field's newest categorized posts with their metadata, for the
+        shared candidate pools; per-user seen filtering happens in process.
+        """
+        res = self.client.from_("posts")\
+            .select("postid, field, article_metadata(keywords, topics, entities, summary, cluster_id)")\
+            .eq("field", field)\
+            .eq("deleted", False)\
+            .eq("isCategorized", True)\
+            .order("created_at", desc=True)\
+            .limit(limit)\
+            .execute()
+        articles = []
+        for row in res.data or []:
+            meta = row.pop("article_metadata", None) or {}
+            if isinstance(meta, list):
+                meta = meta[0] if meta else {}
+            article = {**meta, **row}
+            raw = article.get('summary') or ''
+            article['summary'] = strip_tags(raw) if '<' in raw else raw
+            articles.append(article)
+        return articles
+
     def fetch_top_articles(self, limit: int = 1000) -> List[str]:
         """
         Fetch top `limit` article IDs sorted by engagement or createdAt.
         """
         res = self.client.rpc("rank_articles").execute()
-        print(f"res ${res}")
         return [item["postid"] for item in (res.data or [])][:limit]
 
 
@@ -0,0 +1,58 @@
+from typing import List
+
+import numpy as np
+import scipy.sparse as sp
+
+from medium_clone_suggestion.config import DIVERSITY_LAMBDA, DUPLICATE_SIMILARITY, DIVERSITY_TOP_M
+
+
+def select_diverse(scores: np.ndarray, rows, k: int,
+                   lambda_: float = DIVERSITY_LAMBDA,
+                   duplicate_similarity: float = DUPLICATE_SIMILARITY,
+                   top_m: int = DIVERSITY_TOP_M) -> List[int]:
+    """
+    Greedy maximal marginal relevance over the `top_m` best-scored candidates.
+
+    `rows` are the candidates' L2-normalized TF-IDF rows (as produced by the
+    vectorizer), so their dot products are cosine similarities. Each step picks
+    the candidate maximizing lambda * score - (1 - lambda) * max similarity to
+    the picks so far; candidates at least `duplicate_similarity` to a pick are
+    dropped. Stops after `k` picks and returns their indices, in pick order.
+    """
+    scores = np.asarray(scores, dtype=np.float32)
+    n = len(scores)
+    if n == 0 or k <= 0:
+        return []
+
+    m = min(top_m, n)
+    top = np.argpartition(-scores, m - 1)[:m] if m < n else np.arange(n)
+    top = top[np.argsort(-scores[top], kind="stable")]
+    relevance = lambda_ * scores[top]
+    penalty = 1.0 - lambda_
+
+    # Similarities are computed only for the rows actually picked: one sparse
+    # mat-vec per pick is far cheaper than the full m x m Gram matrix.
+    rows = sp.csr_matrix(rows)
+    if m < n:
+        rows, index = rows[top], np.arange(m)
+    else:
+        index = top
+    pick_row = np.zeros(rows.shape[1], dtype=rows.dtype)
+
+    max_sim = np.zeros(m, dtype=np.float32)
+    available = np.ones(m, dtype=bool)
+    picked = []
+    for _ in range(min(k, m)):
+        mmr = np.where(available, relevance - penalty * max_sim, -np.inf)
+        i = int(np.argmax(mmr))
+        if not available[i]:
+            break
+        picked.append(i)
+        start, end = rows.indptr[index[i]], rows.indptr[index[i] + 1]
+        cols = rows.indices[start:end]
+        pick_row[cols] = rows.data[start:end]
+        np.maximum(max_sim, (rows @ pick_row)[index], out=max_sim, casting="unsafe")
+        pick_row[cols] = 0
+        available &= max_sim < duplicate_similarity
+        available[i] = False
+    return top[picked].tolist()
@@ -0,0 +1,175 @@
+import json
+import os
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from medium_clone_suggestion.config import EMBEDDING_STORE_DIR
+from medium_clone_suggestion.logger import get_logger
+
+logger = get_logger(__name__)
+
+STORE_DTYPE = np.float16
+TIMESTAMP_DTYPE = np.float64
+
+
+class EmbeddingStore:
+    """
+    Embeddings keyed by id (postid or user id) in a float16 file that readers
+    memory-map.
+
+    Files, under `directory`:
+        <name>.f16   row i: `dim` float16 values
+        <name>.ids   line i: the id of row i
+        <name>.ts    float64 i: when row i was last put (epoch seconds)
+        <name>.json  {"dim": ...}
+
+    One process writes a store (the article worker for "articles", the
+    profile builder for "users"); any number read. New rows are written
+    before their ids are appended, so readers never see an id whose row is
+    incomplete. Putting a known id again overwrites its row in place. Readers
+    pick up appended ids on their next call, after a stat of the ids file.
+    Each row also records when it was last put (get_timestamps).
+    """
+
+    def __init__(self, directory: str = EMBEDDING_STORE_DIR, name: str = "articles"):
+        self.directory = directory
+        self.name = name
+        self.rows_path = os.path.join(directory, f"{name}.f16")
+        self.ids_path = os.path.join(directory, f"{name}.ids")
+        self.ts_path = os.path.join(directory, f"{name}.ts")
+        self.meta_path = os.path.join(directory, f"{name}.json")
+        self.dim: Optional[int] = None
+        self._index: Dict[str, int] = {}
+        self._ids_offset = 0  # bytes of the ids file already read
+        self._matrix: Optional[np.memmap] = None
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._refresh()
+            return len(self._index)
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            self._refresh()
+            return str(key) in self._index
+
+    def _refresh(self):
+        """Read ids appended since the last call and remap the rows if they grew."""
+        try:
+            size = os.stat(self.ids_path).st_size
+        except OSError:
+            return
+        if size == self._ids_offset:
+            return
+        if self.dim is None:
+            with open(self.meta_path) as f:
+                self.dim = int(json.load(f)["dim"])
+        with open(self.ids_path, "rb") as f:
+            f.seek(self._ids_offset)
+            chunk = f.read(size - self._ids_offset)
+        # a line still being written has no newline yet; leave it for the next call
+        complete = chunk[:chunk.rfind(b"\n") + 1]
+        for line in complete.decode("utf-8").splitlines():
+            self._index.setdefault(line, len(self._index))
+        self._ids_offset += len(complete)
+        if self._index:
+            self._matrix = np.memmap(self.rows_path, dtype=STORE_DTYPE, mode="r",
+                                     shape=(len(self._index), self.dim))
+
+    def get(self, keys: Iterable[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        float32 rows of the given ids, shape (n, dim), and a mask of the ids
+        found; missing ids get zero rows. An empty store returns (n, 0) rows.
+        """
+        keys = [str(k) for k in keys]
+        with self._lock:
+            self._refresh()
+            index, matrix, dim = self._index, self._matrix, self.dim or 0
+            rows = np.fromiter((index.get(k, -1) for k in keys), dtype=np.int64, count=len(keys))
+        found = rows >= 0
+        out = np.zeros((len(keys), dim), dtype=np.float32)
+        if matrix is not None and found.any():
+            out[found] = matrix[rows[found]]
+        return out, found
+
+    def get_timestamps(self, keys: Iterable[str]) -> np.ndarray:
+        """When each id's row was last put (epoch seconds); NaN for unknown ids."""
+        keys = [str(k) for k in keys]
+        out = np.full(len(keys), np.nan, dtype=TIMESTAMP_DTYPE)
+        with self._lock:
+            self._refresh()
+            rows = np.fromiter((self._index.get(k, -1) for k in keys), dtype=np.int64, count=len(keys))
+            try:
+                n = min(len(self._index), os.path.getsize(self.ts_path) // np.dtype(TIMESTAMP_DTYPE).itemsize)
+            except OSError:
+                return out
+            if n:
+                stamps = np.memmap(self.ts_path, dtype=TIMESTAMP_DTYPE, mode="r", shape=(n,))
+                known = (rows >= 0) & (rows < n)
+                out[known] = stamps[rows[known]]
+        return out
+
+    def put(self, keys: List[str], vectors: np.ndarray, timestamp: Optional[float] = None):
+        """
+        Store one row per id, stamped with `timestamp` (default now); ids
+        already present are overwritten in place.
+        """
+        keys = [str(k) for k in keys]
+        vectors = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+        if not keys:
+            return
+        if len(keys) != len(vectors):
+            raise ValueError(f"{len(keys)} ids for {len(vectors)} vectors")
+        with self._lock:
+            self._refresh()
+            if self.dim is None:
+                os.makedirs(self.directory, exist_ok=True)
+                self.dim = vectors.shape[1]
+                with open(self.meta_path, "w") as f:
+                    json.dump({"dim": self.dim}, f)
+            elif vectors.shape[1] != self.dim:
+                raise ValueError(f"Expected {self.dim}-dimensional vectors, got {vectors.shape[1]}")
+
+            # the last of duplicate ids in one call wins
+            latest = {k: i for i, k in enumerate(keys)}
+            known = [(self._index[k], i) for k, i in latest.items() if k in self._index]
+            new = [(k, i) for k, i in latest.items() if k not in self._index]
+            stamp = time.time() if timestamp is None else timestamp
+            self._write_rows(self.rows_path, vectors.astype(STORE_DTYPE), known, new)
+            self._write_rows(self.ts_path, np.full(len(keys), stamp, dtype=TIMESTAMP_DTYPE), known, new)
+            if new:
+                with open(self.ids_path, "ab") as f:
+                    f.write("".join(f"{k}\n" for k, _ in new).encode("utf-8"))
+                self._refresh()
+        logger.debug("Stored %d %s embeddings (%d new)", len(latest), self.name, len(new))
+
+    def _write_rows(self, path: str, values: np.ndarray, known, new):
+        """Overwrite the `known` (row, i) pairs of a per-row file in place and append the `new` ones."""
+        row_bytes = values[:1].nbytes
+        mode = "r+b" if os.path.exists(path) else "w+b"
+        with open(path, mode) as f:
+            for row, i in known:
+                f.seek(row * row_bytes)
+                f.write(values[i].tobytes())
+            if new:
+                # drop rows a crashed writer left without ids
+                f.truncate(len(self._index) * row_bytes)
+                f.seek(len(self._index) * row_bytes)
+                f.write(values[[i for _, i in new]].tobytes())
+
+
+_stores: Dict[Tuple[str, str], EmbeddingStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_embedding_store(name: str = "articles", directory: str = EMBEDDING_STORE_DIR) -> EmbeddingStore:
+    """Process-wide store per (directory, name)."""
+    with _stores_lock:
+        store = _stores.get((directory, name))
+        if store is None:
+            store = _stores[(directory, name)] = EmbeddingStore(directory, name)
+        return store
@@ -1,43 +1,133 @@
-from typing import Dict, List, Union
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple, Union
+
+from medium_clone_suggestion.config import FEATURE_CACHE_SIZE
+
+
+class ArticleFeatures(NamedTuple):
+    """Immutable features of one article version, plus the document string TF-IDF sees."""
+    postid: Optional[str]
+    keywords: Tuple[Any, ...]
+    entities: Tuple[str, ...]
+    topics: Tuple[Any, ...]
+    summary: str
+    field: str
+    doc: str
+
+    def as_dict(self) -> Dict:
+        return {
+            "keywords": list(self.keywords),
+            "entities": list(self.entities),
+            "topics": list(self.topics),
+            "summary": self.summary,
+            "field": self.field,
+        }
+
+
+def build_doc(keywords, topics, entities, summary: str) -> str:
+    """Keyword terms, topic and entity names and the summary, space-joined."""
+    ak = [str(item[0]) for item in keywords if isinstance(item, (list, tuple)) and item]
+    at = [t.get("name", "") if isinstance(t, dict) else str(t) for t in topics]
+    ae = [e.get("name", "") if isinstance(e, dict) else str(e) for e in entities]
+    return " ".join(ak + at + ae + [summary])
+
+
+def article_version(article: Dict) -> Union[str, int]:
+    """Changes whenever the article's stored metadata does."""
+    return article.get("updated_at") or hash(repr((
+        article.get("keywords"), article.get("entities"), article.get("topics"),
+        article.get("summary"), article.get("field"),
+    )))
+
+
+class FeatureCache:
+    """Bounded LRU of ArticleFeatures keyed by (postid, article version)."""
+
+    def __init__(self, maxsize: int = FEATURE_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._items: "OrderedDict[Tuple[str, Any], ArticleFeatures]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key) -> Optional[ArticleFeatures]:
+        with self._lock:
+            features = self._items.get(key)
+            if features is None:
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return features
+
+    def put(self, key, features: ArticleFeatures):
+        with self._lock:
+            self._items[key] = features
+            self._items.move_to_end(key)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+
+    def __len__(self):
+        return len(self._items)
+
 
 class FeatureExtractor:
+    def __init__(self, cache: FeatureCache = None):
+        self.cache = cache if cache is not None else FeatureCache()
+
+    def features(self, article: Dict) -> ArticleFeatures:
+        """ArticleFeatures for the article, extracted once per article version."""
+        postid = article.get("postid")
+        if postid is None:
+            return self._extract(article)
+        key = (postid, article_version(article))
+        features = self.cache.get(key)
+        if features is None:
+            features = self._extract(article)
+            self.cache.put(key, features)
+        return features
+
+    def features_many(self, articles: List[Dict]) -> List[ArticleFeatures]:
+        return [self.features(a) for a in articles]
+
     def extract_features(self, article: Dict) -> Dict:
         """
         Extract feature vectors from article data.
-        
+
         Args:
             article: Article dictionary with metadata
 
         Returns:
             Dictionary of feature vectors
         """
-        features = {}
-        print(f"Features Initiation Extraction  : {article}")
+        return self.features(article).as_dict()
+
+    def _extract(self, article: Dict) -> ArticleFeatures:
         # Extract keywords
-        keywords = article.get("keywords", [])
+        keywords = article.get("keywords") or []
         if isinstance(keywords, str):
             keywords = [k.strip() for k in keywords.split(",")]
-        features["keywords"] = keywords
-        
+
         # Extract entities
         entities = []
         article_entities = article.get("entities", {})
         if isinstance(article_entities, dict):
             for entity_type, values in article_entities.items():
                 entities.extend([v.strip() for v in values])
-        features["entities"] = entities
 
         # Extract topics
-        topics = article.get("topics", [])
+        topics = article.get("topics") or []
         if isinstance(topics, str):
             topics = [t.strip() for t in topics.split(",")]
-        features["topics"] = topics
-        
-        summary = article.get("summary", "")
-        features["summary"] = summary
-        
-        # Field as a feature
-        features["field"] = article.get("field", "Unknown")
-        
-        print(f"Features Extracted : {features}")
-        return features
\ No newline at end of file
+
+        summary = article.get("summary") or ""
+        return ArticleFeatures(
+            postid=article.get("postid"),
+            keywords=tuple(tuple(k) if isinstance(k, list) else k for k in keywords),
+            entities=tuple(entities),
+            topics=tuple(topics),
+            summary=summary,
+            field=article.get("field", "Unknown"),  # Field as a feature
+            doc=build_doc(keywords, topics, entities, summary),
+        )
@@ -0,0 +1,152 @@
+import bisect
+import contextvars
+import functools
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Sequence, Tuple
+
+METRIC_NAME = "medium_clone_suggestion_stage_seconds"
+# Prometheus' default buckets with sub-5ms resolution for the cached stages
+DEFAULT_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+
+class Histogram:
+    """Cumulative-bucket latency histogram in seconds, safe to observe from any thread."""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float):
+        i = bisect.bisect_left(self.buckets, seconds)
+        with self._lock:
+            self.counts[i] += 1
+            self.count += 1
+            self.sum += seconds
+
+    def snapshot(self) -> Tuple[List[int], int, float]:
+        """Cumulative bucket counts (including +Inf), count and sum."""
+        with self._lock:
+            counts, count, total = list(self.counts), self.count, self.sum
+        cumulative, running = [], 0
+        for c in counts:
+            running += c
+            cumulative.append(running)
+        return cumulative, count, total
+
+
+class Registry:
+    """Stage name -> Histogram, created on first observation."""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._histograms: Dict[str, Histogram] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, stage: str, seconds: float):
+        histogram = self._histograms.get(stage)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(stage, Histogram(self.buckets))
+        histogram.observe(seconds)
+
+    def histogram(self, stage: str) -> Optional[Histogram]:
+        return self._histograms.get(stage)
+
+    def render(self, name: str = METRIC_NAME) -> str:
+        """All histograms in the Prometheus text exposition format."""
+        lines = [
+            f"# HELP {name} Time spent per processing stage.",
+            f"# TYPE {name} histogram",
+        ]
+        with self._lock:
+            stages = sorted(self._histograms.items())
+        for stage, histogram in stages:
+            cumulative, count, total = histogram.snapshot()
+            for bound, value in zip(histogram.buckets + (float("inf"),), cumulative):
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f'{name}_bucket{{stage="{stage}",le="{le}"}} {value}')
+            lines.append(f'{name}_sum{{stage="{stage}"}} {total}')
+            lines.append(f'{name}_count{{stage="{stage}"}} {count}')
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+
+class Trace:
+    """Stage timings of one request or run, in the order the stages finished, plus annotations."""
+    __slots__ = ("stages", "attrs")
+
+    def __init__(self):
+        self.stages: List[Tuple[str, float]] = []
+        self.attrs: Dict[str, str] = {}
+
+    def add(self, stage: str, seconds: float):
+        self.stages.append((stage, seconds))
+
+    def server_timing(self) -> str:
+        """Server-Timing header value; repeated stages (e.g. per field) are summed."""
+        totals: Dict[str, float] = {}
+        for stage, seconds in self.stages:
+            totals[stage] = totals.get(stage, 0.0) + seconds
+        return ", ".join(f"{stage.replace('.', '_')};dur={seconds * 1000:.2f}" for stage, seconds in totals.items())
+
+    def __str__(self):
+        return " ".join(f"{stage}={seconds * 1000:.1f}ms" for stage, seconds in self.stages)
+
+
+_trace: contextvars.ContextVar[Optional[Trace]] = contextvars.ContextVar("trace", default=None)
+
+
+@contextmanager
+def trace():
+    """
+    Collect the spans finished inside the block into a Trace. Work handed to
+    other threads records into it too when run under a copy of the current
+    context (contextvars.copy_context), as SingleFlight.do_async does.
+    """
+    current = Trace()
+    token = _trace.set(current)
+    try:
+        yield current
+    finally:
+        _trace.reset(token)
+
+
+@contextmanager
+def span(stage: str):
+    """Time the block into the stage's histogram and the active trace, if any."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        registry.observe(stage, elapsed)
+        current = _trace.get()
+        if current is not None:
+            current.add(stage, elapsed)
+
+
+def annotate(key: str, value: str):
+    """Attach a value (e.g. cache=hit) to the active trace, if any."""
+    current = _trace.get()
+    if current is not None:
+        current.attrs[key] = value
+
+
+def timed(stage: str):
+    """Decorator form of span()."""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(stage):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,311 @@
+"""
+Record and replay /suggest and /process traffic.
+
+Recording: with TRAFFIC_LOG_PATH set, the API appends one JSON line per
+/suggest or /process request:
+
+    {"ts": 1718000000.12, "method": "GET", "path": "/<profile_id>/suggest",
+     "query": "num_recommendations=25", "body": null, "status": 200,
+     "latency_ms": 12.4, "cache": "miss"}
+
+A POST body that is not valid JSON is kept as text under "raw_body".
+
+Replay against a local app backed by the in-memory dataset:
+
+    DATA_BACKEND=memory uvicorn medium_clone_suggestion.main:app --port 8800
+    python -m medium_clone_suggestion.loadtest replay traffic.jsonl --concurrency 32
+    python -m medium_clone_suggestion.loadtest replay traffic.jsonl --rate 200 --duration 60
+
+Without a recording, `synthesize` writes a log of requests from the synthetic
+users (Zipf-skewed popularity, Poisson arrivals).
+
+Closed loop (--concurrency): that many clients send back to back. Open loop
+(--rate, or --speed to keep the recorded spacing): requests are sent on
+schedule whether or not earlier ones finished. Their latency is measured from
+the scheduled send time, so server backlog shows up in the percentiles.
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import random
+import threading
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from medium_clone_suggestion.config import MEMORY_DATASET_USERS, MEMORY_DATASET_SEED
+from medium_clone_suggestion.logger import get_logger
+
+logger = get_logger(__name__)
+
+RECORDED_SUFFIXES = ("/suggest", "/process")
+
+
+class TrafficRecorder:
+    """
+    HTTP middleware appending /suggest and /process requests to a JSONL file:
+    app.middleware("http")(TrafficRecorder(path)). The cache field comes from
+    the response's X-Cache header.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "a", encoding="utf-8", buffering=1)
+        self._lock = threading.Lock()
+
+    async def __call__(self, request, call_next):
+        path = request.url.path
+        if not path.endswith(RECORDED_SUFFIXES):
+            return await call_next(request)
+        body = await request.body() if request.method == "POST" else b""
+        ts = time.time()
+        start = time.perf_counter()
+        response = await call_next(request)
+        entry = {
+            "ts": ts,
+            "method": request.method,
+            "path": path,
+            "query": request.url.query,
+            "body": None,
+            "status": response.status_code,
+            "latency_ms": round((time.perf_counter() - start) * 1000, 3),
+            "cache": response.headers.get("X-Cache"),
+        }
+        if body:
+            # recording must never change the response: keep bodies that are
+            # not JSON as raw text, replayed as is
+            try:
+                entry["body"] = json.loads(body)
+            except ValueError:
+                entry["raw_body"] = body.decode("utf-8", errors="replace")
+        with self._lock:
+            self._file.write(json.dumps(entry) + "\n")
+        return response
+
+    def close(self):
+        self._file.close()
+
+
+def load_log(path: str, limit: int = None) -> List[Dict]:
+    entries = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                entries.append(json.loads(line))
+                if limit and len(entries) >= limit:
+                    break
+    entries.sort(key=lambda e: e.get("ts", 0))
+    return entries
+
+
+def remap_users(entries: List[Dict], n_users: int, seed: int = MEMORY_DATASET_SEED) -> List[Dict]:
+    """
+    Map recorded profile ids onto synthetic user ids, stably, so a production
+    recording replays against the in-memory dataset with real profiles.
+    """
+    from medium_clone_suggestion.synthetic import SyntheticDataset
+    ids = SyntheticDataset(n_articles=1, n_users=n_users, seed=seed)
+    mapped = []
+    for entry in entries:
+        parts = entry["path"].strip("/").split("/")
+        if len(parts) == 2 and parts[1] == "suggest":
+            u = int(hashlib.blake2b(parts[0].encode(), digest_size=8).hexdigest(), 16) % n_users
+            entry = {**entry, "path": f"/{ids.user_id(u)}/suggest"}
+        mapped.append(entry)
+    return mapped
+
+
+def synthesize(n_requests: int, n_users: int = MEMORY_DATASET_USERS, seed: int = MEMORY_DATASET_SEED,
+               rate: float = 50.0, process_share: float = 0.02, zipf: float = 1.1) -> List[Dict]:
+    """A traffic log over the synthetic users: Zipf-popular users, Poisson arrivals at `rate`/s."""
+    from medium_clone_suggestion.synthetic import SyntheticDataset
+    ids = SyntheticDataset(n_articles=1, n_users=n_users, seed=seed)
+    rng = random.Random(seed)
+    weights = 1.0 / np.arange(1, n_users + 1) ** zipf
+    users = np.random.default_rng(seed).choice(n_users, size=n_requests, p=weights / weights.sum())
+    ts, entries = time.time(), []
+    for u in users:
+        ts += rng.expovariate(rate)
+        if rng.random() < process_share:
+            entries.append({"ts": ts, "method": "POST", "path": "/process", "query": "",
+                            "body": {"postid": ids.postid(rng.randrange(1 << 32))}})
+        else:
+            entries.append({"ts": ts, "method": "GET", "path": f"/{ids.user_id(int(u))}/suggest",
+                            "query": "num_recommendations=25", "body": None})
+    return entries
+
+
+class Result:
+    __slots__ = ("endpoint", "status", "latency", "cache", "error")
+
+    def __init__(self, endpoint, status, latency, cache=None, error=None):
+        self.endpoint = endpoint
+        self.status = status
+        self.latency = latency
+        self.cache = cache
+        self.error = error
+
+
+def _endpoint(entry: Dict) -> str:
+    return "suggest" if entry["path"].endswith("/suggest") else "process"
+
+
+async def _send(client, entry: Dict, scheduled: float = None) -> Result:
+    start = scheduled if scheduled is not None else time.perf_counter()
+    url = entry["path"] + (f"?{entry['query']}" if entry.get("query") else "")
+    try:
+        if "raw_body" in entry:
+            response = await client.request(entry["method"], url, content=entry["raw_body"].encode("utf-8"),
+                                            headers={"Content-Type": "application/json"})
+        else:
+            response = await client.request(entry["method"], url, json=entry.get("body"))
+        return Result(_endpoint(entry), response.status_code, time.perf_counter() - start,
+                      response.headers.get("X-Cache"))
+    except Exception as e:
+        return Result(_endpoint(entry), None, time.perf_counter() - start, error=type(e).__name__)
+
+
+async def replay(entries: List[Dict], base_url: str, concurrency: int = 16, rate: float = None,
+                 speed: float = None, duration: float = None, timeout: float = 30.0, transport=None) -> Dict:
+    """
+    Send `entries` to `base_url`; see the module docstring for the modes.
+    In open loop `concurrency` caps requests in flight. `transport` (e.g.
+    httpx.ASGITransport(app)) replaces the network. Returns report().
+    """
+    import httpx
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    results: List[Result] = []
+    async with httpx.AsyncClient(base_url=base_url, timeout=timeout, limits=limits,
+                                 transport=transport) as client:
+        start = time.perf_counter()
+        deadline = start + duration if duration else None
+        if rate is None and speed is None:
+            queue = iter(entries)
+
+            async def client_loop():
+                for entry in queue:
+                    if deadline and time.perf_counter() > deadline:
+                        return
+                    results.append(await _send(client, entry))
+
+            await asyncio.gather(*(client_loop() for _ in range(concurrency)))
+        else:
+            gate = asyncio.Semaphore(concurrency)
+            first_ts = entries[0].get("ts", 0) if entries else 0
+
+            async def fire(entry, at):
+                async with gate:
+                    results.append(await _send(client, entry, scheduled=at))
+
+            tasks = []
+            for i, entry in enumerate(entries):
+                offset = i / rate if rate else (entry.get("ts", first_ts) - first_ts) / speed
+                at = start + offset
+                if deadline and at > deadline:
+                    break
+                delay = at - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                tasks.append(asyncio.create_task(fire(entry, at)))
+            await asyncio.gather(*tasks)
+        elapsed = time.perf_counter() - start
+    return report(results, elapsed)
+
+
+def report(results: List[Result], elapsed: float) -> Dict:
+    """Throughput, latency percentiles, error rate and cache hit ratio, overall and per endpoint."""
+    def summarize(rs: List[Result]) -> Dict:
+        latencies = np.array([r.latency for r in rs]) * 1000 if rs else np.zeros(1)
+        errors = sum(1 for r in rs if r.error or r.status is None or r.status >= 400)
+        statuses: Dict[str, int] = {}
+        for r in rs:
+            key = str(r.status) if r.status is not None else r.error
+            statuses[key] = statuses.get(key, 0) + 1
+        hits = sum(1 for r in rs if r.cache == "hit")
+        looked_up = sum(1 for r in rs if r.cache in ("hit", "miss"))
+        return {
+            "requests": len(rs),
+            "throughput_rps": len(rs) / elapsed if elapsed > 0 else 0.0,
+            "error_rate": errors / len(rs) if rs else 0.0,
+            "statuses": statuses,
+            "latency_ms": {
+                "p50": float(np.percentile(latencies, 50)),
+                "p90": float(np.percentile(latencies, 90)),
+                "p95": float(np.percentile(latencies, 95)),
+                "p99": float(np.percentile(latencies, 99)),
+                "max": float(latencies.max()),
+            },
+            "cache_hit_ratio": hits / looked_up if looked_up else None,
+            # coalesced requests shared another request's computation
+            "coalesced": sum(1 for r in rs if r.cache == "coalesced"),
+        }
+
+    out = {"elapsed_s": elapsed, "overall": summarize(results)}
+    for endpoint in sorted({r.endpoint for r in results}):
+        out[endpoint] = summarize([r for r in results if r.endpoint == endpoint])
+    return out
+
+
+def print_report(result: Dict):
+    print(f"elapsed {result['elapsed_s']:.1f}s")
+    for name, s in result.items():
+        if name == "elapsed_s":
+            continue
+        lat = s["latency_ms"]
+        hit = f"{s['cache_hit_ratio']:.1%}" if s["cache_hit_ratio"] is not None else "n/a"
+        print(f"{name:>8}: {s['requests']} req, {s['throughput_rps']:.1f} req/s, errors {s['error_rate']:.2%}, "
+              f"p50 {lat['p50']:.1f} p90 {lat['p90']:.1f} p95 {lat['p95']:.1f} p99 {lat['p99']:.1f} "
+              f"max {lat['max']:.1f} ms, cache hits {hit}, coalesced {s['coalesced']}, statuses {s['statuses']}")
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Record/replay load tests for the suggestion API")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    rp = sub.add_parser("replay", help="Replay a traffic log against a running app")
+    rp.add_argument("log", help="JSONL traffic log (TRAFFIC_LOG_PATH or `synthesize` output)")
+    rp.add_argument("--base-url", default="http://127.0.0.1:8800")
+    rp.add_argument("--concurrency", type=int, default=16,
+                    help="Clients in closed loop; cap on requests in flight in open loop")
+    mode = rp.add_mutually_exclusive_group()
+    mode.add_argument("--rate", type=float, help="Open loop at this many requests per second")
+    mode.add_argument("--speed", type=float, help="Open loop at the recorded spacing, sped up by this factor")
+    rp.add_argument("--duration", type=float, help="Stop sending after this many seconds")
+    rp.add_argument("--limit", type=int, help="Replay only the first N entries")
+    rp.add_argument("--remap-users", type=int, metavar="N_USERS",
+                    help="Map recorded profile ids onto N synthetic users (in-memory backend)")
+    rp.add_argument("--json", metavar="PATH", help="Also write the report as JSON")
+
+    sp = sub.add_parser("synthesize", help="Write a traffic log over the synthetic users")
+    sp.add_argument("out")
+    sp.add_argument("--requests", type=int, default=10000)
+    sp.add_argument("--users", type=int, default=MEMORY_DATASET_USERS)
+    sp.add_argument("--seed", type=int, default=MEMORY_DATASET_SEED)
+    sp.add_argument("--rate", type=float, default=50.0, help="Mean arrival rate of the recorded timestamps")
+    sp.add_argument("--process-share", type=float, default=0.02, help="Share of POST /process requests")
+
+    args = parser.parse_args(argv)
+    if args.command == "synthesize":
+        entries = synthesize(args.requests, args.users, args.seed, args.rate, args.process_share)
+        with open(args.out, "w", encoding="utf-8") as f:
+            for entry in entries:
+                f.write(json.dumps(entry) + "\n")
+        print(f"Wrote {len(entries)} requests to {args.out}")
+        return
+
+    entries = load_log(args.log, args.limit)
+    if args.remap_users:
+        entries = remap_users(entries, args.remap_users)
+    result = asyncio.run(replay(entries, args.base_url, args.concurrency, args.rate, args.speed, args.duration))
+    print_report(result)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(result, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,32 +1,144 @@
 # logger.py
+import atexit
+import contextvars
 import logging
 import os
-from logging.handlers import RotatingFileHandler
+import queue
+import random
+import threading
+from contextlib import contextmanager
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Dict, Optional
+
+from medium_clone_suggestion.config import (
+    LOG_LEVEL, LOG_LEVELS, LOG_DEBUG_SAMPLE_RATE, LOG_ASYNC, LOG_DIR,
+)
+
+ROOT_LOGGER = "medium_clone_suggestion"
+
+# Per-request sampling decision for DEBUG records: None outside a request
+_debug_sampled: contextvars.ContextVar[Optional[bool]] = contextvars.ContextVar("debug_sampled", default=None)
+
+_lock = threading.Lock()
+_handler: Optional[logging.Handler] = None
+_listener: Optional[QueueListener] = None
+
+
+def parse_levels(spec: str) -> Dict[str, int]:
+    """'pkg.module=DEBUG,pkg.other=WARNING' -> {logger name: level}."""
+    levels = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        name, _, level = item.partition("=")
+        levels[name.strip()] = logging.getLevelName(level.strip().upper())
+    return levels
+
+
+class DebugSamplingFilter(logging.Filter):
+    """Drops DEBUG records of requests that were not sampled (see sample_request)."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return record.levelno > logging.DEBUG or _debug_sampled.get() is not False
+
+
+@contextmanager
+def sample_request(rate: float = LOG_DEBUG_SAMPLE_RATE):
+    """
+    Keep this request's DEBUG records with probability `rate`. Dropped records
+    are never formatted, so unsampled requests pay only for the level check.
+    """
+    token = _debug_sampled.set(random.random() < rate)
+    try:
+        yield
+    finally:
+        _debug_sampled.reset(token)
+
+
+def _build_handler() -> logging.Handler:
+    formatter = logging.Formatter(
+        '[%(asctime)s] [%(levelname)s] %(name)s.%(funcName)s: %(message)s',
+        datefmt='%Y-%m-%d %H:%M:%S'
+    )
+
+    # Stream handler for console
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(formatter)
+
+    # File handler only for errors
+    os.makedirs(LOG_DIR, exist_ok=True)
+    file_handler = RotatingFileHandler(
+        os.path.join(LOG_DIR, f"{ROOT_LOGGER}.errors.log"),
+        maxBytes=1024*1024, backupCount=3
+    )
+    file_handler.setLevel(logging.ERROR)
+    file_handler.setFormatter(formatter)
+
+    if not LOG_ASYNC:
+        handler = _FanOutHandler([stream_handler, file_handler])
+    else:
+        # Callers only enqueue the record; formatting and I/O happen on the
+        # listener thread (see _DeferredQueueHandler)
+        global _listener
+        log_queue: queue.SimpleQueue = queue.SimpleQueue()
+        handler = _DeferredQueueHandler(log_queue)
+        _listener = QueueListener(log_queue, stream_handler, file_handler, respect_handler_level=True)
+        _listener.start()
+        atexit.register(_listener.stop)
+    handler.addFilter(DebugSamplingFilter())
+    return handler
+
+
+class _DeferredQueueHandler(QueueHandler):
+    """
+    QueueHandler that enqueues the record as is. The stock prepare() formats
+    the message and traceback on the calling thread; here the listener's
+    handlers do it. The queue stays in-process, so nothing needs pickling.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+class _FanOutHandler(logging.Handler):
+    """Synchronous stand-in for the queue listener (LOG_ASYNC=0)."""
+
+    def __init__(self, handlers):
+        super().__init__()
+        self.handlers = handlers
+
+    def emit(self, record):
+        for handler in self.handlers:
+            if record.levelno >= handler.level:
+                handler.handle(record)
+
+
+def _configure() -> logging.Handler:
+    global _handler
+    with _lock:
+        if _handler is None:
+            _handler = _build_handler()
+            root = logging.getLogger(ROOT_LOGGER)
+            root.setLevel(LOG_LEVEL)
+            root.addHandler(_handler)
+            root.propagate = False
+            for name, level in parse_levels(LOG_LEVELS).items():
+                logging.getLogger(name).setLevel(level)
+        return _handler
+
 
 def get_logger(name: str) -> logging.Logger:
+    """
+    Logger for a module. Package modules share one handler on the package
+    logger; levels come from LOG_LEVEL and the per-module LOG_LEVELS overrides.
+    Pass arguments rather than pre-formatted strings on hot paths, e.g.
+    logger.debug("scored %d articles", n), so disabled records cost nothing.
+    """
+    handler = _configure()
     logger = logging.getLogger(name)
-    if not logger.hasHandlers():
-        logger.setLevel(logging.DEBUG)
-
-        formatter = logging.Formatter(
-            '[%(asctime)s] [%(levelname)s] %(name)s.%(funcName)s: %(message)s',
-            datefmt='%Y-%m-%d %H:%M:%S'
-        )
-
-        # Stream handler for console
-        stream_handler = logging.StreamHandler()
-        stream_handler.setFormatter(formatter)
-        logger.addHandler(stream_handler)
-
-        # File handler only for errors
-        log_dir = "logs"
-        os.makedirs(log_dir, exist_ok=True)
-        file_handler = RotatingFileHandler(
-            os.path.join(log_dir, f"{name}.errors.log"),
-            maxBytes=1024*1024, backupCount=3
-        )
-        file_handler.setLevel(logging.ERROR)
-        file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
-
+    if name != ROOT_LOGGER and not name.startswith(ROOT_LOGGER + "."):
+        # scripts run as __main__ and other outside names get the handler directly
+        if handler not in logger.handlers:
+            logger.addHandler(handler)
+            logger.propagate = False
+        if logger.level == logging.NOTSET:
+            logger.setLevel(parse_levels(LOG_LEVELS).get(name, LOG_LEVEL))
     return logger
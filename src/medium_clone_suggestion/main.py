@@ -3,27 +3,44 @@
 import asyncio
 import uuid
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Response
+from fastapi.responses import PlainTextResponse
 from pydantic import BaseModel
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 
-from medium_clone_suggestion.recommendation_engine import RecommendationSystem
-from medium_clone_suggestion.article_processor.main import main as ArticleProcessingMain
+from medium_clone_suggestion.recommendation_engine import RecommendationSystem, resolve_ranking_mode
+from medium_clone_suggestion.article_processor.job_queue import JobQueue, QueueFullError
 from medium_clone_suggestion.user_processor.user_profile_builder import UserProfileBuilder
 from medium_clone_suggestion.user_processor.config import Config as UserProcessorConfig
+from medium_clone_suggestion.config import SERVER_TIMING_HEADER, DATA_BACKEND, TRAFFIC_LOG_PATH
+from medium_clone_suggestion.instrumentation import registry, trace
 
 from medium_clone_suggestion.logger import get_logger
 
 logging = get_logger(__name__)
 
 app = FastAPI()
-rec_sys = RecommendationSystem()
+
+if DATA_BACKEND == "memory":
+    # synthetic in-memory data for load tests (see loadtest.py)
+    from medium_clone_suggestion.memory_database import from_config
+    data_access = from_config()
+else:
+    data_access = None  # Supabase
+
+rec_sys = RecommendationSystem(data_access=data_access)
 scheduler = AsyncIOScheduler()
 
+if TRAFFIC_LOG_PATH:
+    from medium_clone_suggestion.loadtest import TrafficRecorder
+    app.middleware("http")(TrafficRecorder(TRAFFIC_LOG_PATH))
+
 ### ── ARTICLE PROCESSING QUEUE ───────────────────────────────────────────────
+# Jobs go to a durable SQLite queue drained by the article worker process
+# (python -m medium_clone_suggestion.article_processor.worker), so the NLP
+# models never load inside the API process.
 
-POSTID_LIMIT = 1
-postid_queue = []
+job_queue = JobQueue()
 
 class PostIDRequest(BaseModel):
     postid: uuid.UUID
@@ -31,34 +48,28 @@ class PostIDRequest(BaseModel):
 class PostProcessResponse(BaseModel):
     message: str
 
-async def _run_article_pipeline():
-    """Offload blocking pipeline to thread when queue threshold is reached."""
-    if len(postid_queue) >= POSTID_LIMIT:
-        logging.info(f"Running article pipeline on {len(postid_queue)} items…")
-        loop = asyncio.get_running_loop()
-        await loop.run_in_executor(None, ArticleProcessingMain)
-        postid_queue.clear()
-        logging.info("Article pipeline complete.")
-
 @app.post("/process", response_model=PostProcessResponse)
 async def enqueue_post(post: PostIDRequest):
-    postid_queue.append(post.postid)
-    logging.info(f"Queued postid {post.postid}, queue size={len(postid_queue)}")
-    if len(postid_queue) >= POSTID_LIMIT:
-        asyncio.create_task(_run_article_pipeline())
+    try:
+        queued = job_queue.enqueue(str(post.postid))
+    except QueueFullError as e:
+        logging.warning(f"Rejected postid {post.postid}: {e}")
+        raise HTTPException(status_code=429, detail=str(e))
+    if not queued:
+        return {"message": "Post ID already queued for processing"}
+    logging.info(f"Queued postid {post.postid}")
     return {"message": "Post ID queued for processing"}
 
-# schedule periodic full runs
-def schedule_article_job():
-    loop = asyncio.get_event_loop()
-    asyncio.run_coroutine_threadsafe(_run_article_pipeline(), loop)
-    
+@app.get("/process/status")
+async def process_status():
+    return job_queue.stats()
+
 ### ── USER PROFILE REBUILD ───────────────────────────────────────────────────
 
 async def _run_user_profile_builder():
     loop = asyncio.get_running_loop()
     cfg = UserProcessorConfig()
-    builder = UserProfileBuilder(cfg)
+    builder = UserProfileBuilder(cfg, db=data_access)
     # offload to thread
     await loop.run_in_executor(None, builder.process_users, cfg.USER_PROCESS_LIMIT)
     logging.info("User profiles rebuilt.")
@@ -69,27 +80,46 @@ def schedule_user_profile_job():
 
 ### ── RECOMMENDATION ENDPOINT ─────────────────────────────────────────────────
 
+@app.get("/suggest/stats")
+async def suggest_stats():
+    # executed vs. coalesced /suggest computations since startup
+    return rec_sys.inflight.stats()
 
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    # per-stage latency histograms, Prometheus text format
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
 
 @app.get("/{profile_id}/suggest")
 async def suggest(
+    response: Response,
     profile_id: str,
     num_recommendations: int = 25,
     exploration_ratio: float = 0.25,
-    articles_per_field: int = 20
+    articles_per_field: int = 20,
+    ranking: str = None
 ):
+    # tfidf | embedding | hybrid; RANKING_MODE when omitted
+    try:
+        ranking = resolve_ranking_mode(ranking)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     try:
-        recs = rec_sys.recommend_articles(
-            user_id=profile_id,
-            num_recommendations=num_recommendations,
-            exploration_ratio=exploration_ratio,
-            articles_per_field=articles_per_field,
-        )
+        with trace() as stages:
+            recs = await rec_sys.recommend_articles_async(
+                user_id=profile_id,
+                num_recommendations=num_recommendations,
+                exploration_ratio=exploration_ratio,
+                articles_per_field=articles_per_field,
+                ranking=ranking,
+            )
+        # coalesced requests carry no stages: the leader request did the work
+        if SERVER_TIMING_HEADER and stages.stages:
+            response.headers["Server-Timing"] = stages.server_timing()
+        response.headers["X-Cache"] = stages.attrs.get("cache", "coalesced")
         return {"recommendations": recs}
     except Exception as e:
-        import traceback
-        traceback.print_exc()
-        print(f"There was an error recommending: {e}")
+        logging.exception("There was an error recommending for %s", profile_id)
         raise HTTPException(status_code=500, detail=str(e))
 
 ### ── STARTUP SCHEDULER ───────────────────────────────────────────────────────
@@ -97,11 +127,9 @@ async def suggest(
 @app.on_event("startup")
 async def startup_event():
     # one-off runs
-    asyncio.create_task(_run_article_pipeline())
     asyncio.create_task(_run_user_profile_builder())
 
-    # recurring jobs
-    scheduler.add_job(_run_article_pipeline,        "interval", hours=3, id="article_job")
+    # recurring jobs (article processing lives in the worker process)
     scheduler.add_job(_run_user_profile_builder,    "interval", hours=1, id="user_profile_job")
     
     # Add more to the victorizer. 
@@ -113,10 +141,8 @@ async def startup_event():
    )
     
     scheduler.start()
-    # immidiately start on job
-    # await _run_article_pipeline()
 
-    logging.info("Schedulers started: articles every 3h, profiles every 1h")
+    logging.info("Schedulers started: profiles every 1h")
 
 
 if __name__ == "__main__":
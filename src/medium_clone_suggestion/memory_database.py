@@ -0,0 +1,230 @@
+import random
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Union
+
+from medium_clone_suggestion.config import (
+    MEMORY_DATASET_ARTICLES, MEMORY_DATASET_USERS, MEMORY_DATASET_SEED, MEMORY_DB_LATENCY_MS,
+)
+from medium_clone_suggestion.synthetic import SyntheticDataset
+from medium_clone_suggestion.seen_filter import SeenFilter, SeenFilterCache, get_seen_filter_cache
+from medium_clone_suggestion.sampling import get_field_id_cache, sample_unseen
+from medium_clone_suggestion.logger import get_logger
+
+logger = get_logger(__name__)
+
+Latency = Union[float, Dict[str, float], Callable[[str], float]]
+
+
+class InMemoryDatabaseManager:
+    """
+    DatabaseManager stand-in over a SyntheticDataset, for benchmarks and
+    load tests without Supabase.
+
+    Only the methods the recommendation and profile paths call are provided,
+    with the same return shapes. `latency` simulates network round trips. It
+    is either seconds per call, a {method name: seconds} dict (key "default"
+    for the rest) or a callable(method name) -> seconds. `jitter` adds up to
+    that fraction of random extra delay. `calls` counts calls per method.
+
+    Histories start out as the dataset's and can grow with `record_read`.
+    Profiles and metadata written through the update methods are kept in
+    memory.
+    """
+
+    def __init__(self, dataset: SyntheticDataset = None, latency: Latency = 0.0, jitter: float = 0.0,
+                 seen_filters: SeenFilterCache = None):
+        self.dataset = dataset or SyntheticDataset()
+        self.latency = latency
+        self.jitter = jitter
+        self.seen_filters = seen_filters or get_seen_filter_cache()
+        self.calls: Counter = Counter()
+        self._histories: Dict[str, List[Dict]] = {}
+        self._profiles: Dict[str, Dict] = {}
+        self._profile_updated: Dict[str, str] = {}
+        self._metadata: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+
+    def _delay(self, method: str):
+        self.calls[method] += 1
+        latency = self.latency
+        if callable(latency):
+            seconds = latency(method)
+        elif isinstance(latency, dict):
+            seconds = latency.get(method, latency.get("default", 0.0))
+        else:
+            seconds = latency
+        if seconds > 0:
+            time.sleep(seconds * (1.0 + random.random() * self.jitter))
+
+    def _article(self, postid: str) -> Optional[Dict]:
+        try:
+            i = self.dataset.article_index(postid)
+        except ValueError:
+            return None
+        if i >= self.dataset.n_articles:
+            return None
+        article = self.dataset.article(i)
+        article.update(self._metadata.get(postid, {}))
+        return article
+
+    def _history(self, user_id: str) -> List[Dict]:
+        rows = self._histories.get(user_id)
+        if rows is None:
+            try:
+                u = self.dataset.user_index(user_id)
+            except ValueError:
+                u = None
+            seeded = self.dataset.history(u) if u is not None and u < self.dataset.n_users else []
+            with self._lock:
+                rows = self._histories.setdefault(user_id, seeded)
+        return rows
+
+    # ── writes ───────────────────────────────────────────────────────────
+    def record_read(self, user_id: str, postid: str, created_at: Optional[str] = None):
+        """Append a history row, as a reader opening a post would."""
+        rows = self._history(user_id)
+        with self._lock:
+            rows.append({"postid": postid, "created_at": created_at or datetime.now(timezone.utc).isoformat()})
+
+    def update_processed(self, articles: List[Dict]) -> List[Dict]:
+        self._delay("update_processed")
+        for art in articles:
+            self._metadata[art["postid"]] = {
+                k: art[k] for k in ("field", "keywords", "topics", "entities", "summary", "cluster_id") if k in art
+            }
+        return []
+
+    def update_user_interests(self, user_id: str, interests: Dict) -> bool:
+        self._delay("update_user_interests")
+        profile = dict(self.get_user_profile(user_id))
+        profile.update({k: interests.get(k, profile.get(k)) for k in ("keywords", "topics", "entities")})
+        self._profiles[user_id] = profile
+        return True
+
+    def update_user_profile_last_updated(self, user_id, ts):
+        self._delay("update_user_profile_last_updated")
+        self._profile_updated[user_id] = ts.isoformat()
+
+    # ── users ────────────────────────────────────────────────────────────
+    def fetch_active_users(self, limit: int, max_days: int = 7) -> List[str]:
+        self._delay("fetch_active_users")
+        return [self.dataset.user_id(u) for u in range(min(limit, self.dataset.n_users))]
+
+    def get_user_profile_last_updated(self, user_id: str) -> Optional[str]:
+        self._delay("get_user_profile_last_updated")
+        return self._profile_updated.get(user_id)
+
+    def get_user_activities_since(self, user_id: str, since_iso: str) -> List[Dict]:
+        self._delay("get_user_activities_since")
+        return [
+            {"userid": user_id, "postid": r["postid"], "created_at": r["created_at"], "segment": None, "rating": None}
+            for r in self._history(user_id) if r["created_at"] > since_iso
+        ]
+
+    def get_user_profile(self, user_id: str) -> Dict:
+        self._delay("get_user_profile")
+        profile = self._profiles.get(user_id)
+        if profile is not None:
+            return profile
+        try:
+            u = self.dataset.user_index(user_id)
+        except ValueError:
+            u = None
+        if u is None or u >= self.dataset.n_users:
+            return {"keywords": [], "topics": [], "entities": {}}
+        return self.dataset.profile(u)
+
+    def get_user_history(self, user_id: str) -> List[str]:
+        self._delay("get_user_history")
+        return [r["postid"] for r in self._history(user_id)]
+
+    def get_user_history_rows(self, user_id: str, since: Optional[str] = None) -> List[Dict]:
+        self._delay("get_user_history_rows")
+        rows = self._history(user_id)
+        return [dict(r) for r in rows if not since or r["created_at"] >= since]
+
+    def get_user_history_token(self, user_id: str) -> str:
+        self._delay("get_user_history_token")
+        rows = self._history(user_id)
+        latest = max((r["created_at"] for r in rows), default="")
+        return f"{len(rows)}:{latest}"
+
+    def get_user_seen_filter(self, user_id: str) -> SeenFilter:
+        return self.seen_filters.get(user_id, self)
+
+    def get_user_history_fields(self, user_id: str) -> List[str]:
+        self._delay("get_user_history_fields")
+        d = self.dataset
+        return [d.field_of(d.article_index(r["postid"])) for r in self._history(user_id)]
+
+    # ── articles ─────────────────────────────────────────────────────────
+    def fetch_field_postids(self, field: str, page_size: int = 1000) -> List[str]:
+        index = self.dataset.field_index.get(field, ())
+        for _ in range(max(1, -(-len(index) // page_size))):
+            self._delay("fetch_field_postids")
+        return [self.dataset.postid(int(i)) for i in index]
+
+    def fetch_random_unseen(self, user_id: str, field: str, num_articles: int = 10) -> List[Dict]:
+        seen = self.get_user_seen_filter(user_id)
+        postids = get_field_id_cache().get(field, self.fetch_field_postids)
+        return [{"postid": pid} for pid in sample_unseen(postids, seen, num_articles)]
+
+    def fetch_field_candidates(self, field: str, limit: int = 500) -> List[Dict]:
+        self._delay("fetch_field_candidates")
+        keep = ("postid", "field", "keywords", "topics", "entities", "summary", "cluster_id")
+        articles = []
+        for i in self.dataset.newest(field, limit):
+            article = self._article(self.dataset.postid(int(i)))
+            articles.append({k: article.get(k) for k in keep})
+        return articles
+
+    def fetch_unseen_articles(self, user_id: str, field: str, limit: int = 20) -> List[Dict]:
+        self._delay("fetch_unseen_articles")
+        seen = {r["postid"] for r in self._history(user_id)}
+        articles = []
+        for i in self.dataset.newest(field, self.dataset.n_articles):
+            postid = self.dataset.postid(int(i))
+            if postid not in seen:
+                articles.append(self._article(postid))
+                if len(articles) >= limit:
+                    break
+        return articles
+
+    def fetch_top_articles(self, limit: int = 1000) -> List[str]:
+        self._delay("fetch_top_articles")
+        return self.dataset.top_articles(limit)
+
+    def fetch_article_metadata(self, post_ids: List[str]) -> Dict[str, Any]:
+        metadata = {}
+        batch_size = 200
+        for start in range(0, len(post_ids), batch_size):
+            self._delay("fetch_article_metadata")
+            for postid in post_ids[start:start + batch_size]:
+                article = self._article(postid)
+                if article is not None:
+                    metadata[postid] = {k: article[k] for k in ("keywords", "topics", "entities")}
+        return metadata
+
+    def fetch_article_content(self, postid: str) -> Dict[str, Any]:
+        self._delay("fetch_article_content")
+        article = self._article(postid)
+        return {"content": article["content"], "created_at": article["created_at"]} if article else {}
+
+    def fetch_uncategorized_articles(self, limit: int = 100) -> List[Dict]:
+        self._delay("fetch_uncategorized_articles")
+        return []  # every synthetic article is already categorized
+
+    def fetch_articles_by_ids(self, postids: List[str]) -> List[Dict]:
+        self._delay("fetch_articles_by_ids")
+        found = (self._article(str(p)) for p in postids)
+        return [{k: a[k] for k in ("postid", "title", "content")} for a in found if a]
+
+
+def from_config() -> InMemoryDatabaseManager:
+    """The in-memory backend the API uses when DATA_BACKEND=memory."""
+    dataset = SyntheticDataset(MEMORY_DATASET_ARTICLES, MEMORY_DATASET_USERS, seed=MEMORY_DATASET_SEED)
+    logger.info(f"Using in-memory data: {dataset.n_articles} articles, {dataset.n_users} users")
+    return InMemoryDatabaseManager(dataset, latency=MEMORY_DB_LATENCY_MS / 1000.0)
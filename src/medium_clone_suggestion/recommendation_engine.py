@@ -1,21 +1,32 @@
 import os
-import json
+import logging
 import random
 from typing import List, Dict
 
 from datetime import datetime, timedelta, timezone
 import sys 
-import hashlib
-from medium_clone_suggestion.config import FIELDS, CACHE_DIR
+import numpy as np
+import scipy.sparse as sp
+from medium_clone_suggestion.config import (
+    FIELDS, CACHE_DIR, RANKING_MODE, RANKING_MODES, DIVERSITY_TOP_M,
+    HYBRID_DENSE_WEIGHT,
+)
 from medium_clone_suggestion.caching import CacheManager
 from medium_clone_suggestion.feature_extraction import FeatureExtractor
 from medium_clone_suggestion.similarity import SimilarityCalculator
+from medium_clone_suggestion.diversity import select_diverse
+from medium_clone_suggestion.scoring import top_k
+from medium_clone_suggestion.singleflight import SingleFlight
+from medium_clone_suggestion.seen_filter import get_seen_filter_cache
+from medium_clone_suggestion.candidate_pool import CandidatePoolCache
+from medium_clone_suggestion.embedding_store import get_embedding_store
 from  medium_clone_suggestion.database import DatabaseManager
 
 
 from typing import List, Dict, Any
 
-from medium_clone_suggestion.logger import get_logger
+from medium_clone_suggestion.logger import get_logger, sample_request
+from medium_clone_suggestion.instrumentation import annotate, span
 
 logger = get_logger(__name__)
     
@@ -27,22 +38,50 @@ if ROOT not in sys.path:
     
 
   
-def hash_history(history_list: List[str]) -> str:
-    sorted_ids = sorted(history_list)
-    serialized = json.dumps(sorted_ids, sort_keys=True)
-    return hashlib.sha256(serialized.encode()).hexdigest()
+def resolve_ranking_mode(ranking: str = None) -> str:
+    """The ranking mode to use (RANKING_MODE when None); ValueError if it cannot be served."""
+    ranking = ranking or RANKING_MODE
+    if ranking not in RANKING_MODES:
+        raise ValueError(f"Unknown ranking mode '{ranking}', expected one of {RANKING_MODES}")
+    if ranking == "hybrid" and HYBRID_DENSE_WEIGHT == 0:
+        # blend() would return the TF-IDF scores unchanged
+        raise ValueError("ranking mode 'hybrid' needs HYBRID_DENSE_WEIGHT > 0")
+    return ranking
+
+
+def collapse_clusters(articles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Keep only the highest-scoring article of each near-duplicate cluster."""
+    best: Dict[str, Dict[str, Any]] = {}
+    for art in articles:
+        key = art.get("cluster_id") or art["postid"]
+        if key not in best or art.get("score", 0) > best[key].get("score", 0):
+            best[key] = art
+    kept = {id(a) for a in best.values()}
+    return [a for a in articles if id(a) in kept]
 
 
 class RecommendationSystem:
-    def __init__(self, testing_mode: bool = True):
+    def __init__(self, testing_mode: bool = True, data_access=None):
         """
         Initialize the recommendation system.
         If needed, preload a global TF-IDF corpus here.
+
+        `data_access` defaults to the Supabase DatabaseManager; benchmarks pass
+        an InMemoryDatabaseManager.
         """
-        self.data_access = DatabaseManager()
+        self.data_access = data_access or DatabaseManager()
         self.feature_extractor = FeatureExtractor()
         self.similarity_calculator = SimilarityCalculator()
         self.cache_manager = CacheManager()
+        # concurrent identical requests share one computation (and one cache write)
+        self.inflight = SingleFlight()
+        self.seen_filters = get_seen_filter_cache()
+        # written by the article worker and the profile builder; read here
+        self.article_embeddings = get_embedding_store("articles")
+        self.user_embeddings = get_embedding_store("users")
+        self.candidate_pools = CandidatePoolCache(
+            self.similarity_calculator, self.feature_extractor, embedding_store=self.article_embeddings
+        )
         
         self.global_article_ids = set()
         self.global_corpus_docs = []
@@ -116,83 +155,153 @@ class RecommendationSystem:
         user_id: str,
         num_recommendations: int = 20,
         exploration_ratio: float = 0.2,
-        articles_per_field: int = 20
+        articles_per_field: int = 20,
+        ranking: str = None
+    ) -> List[Dict[str, Any]]:
+        """
+        `ranking` (default RANKING_MODE): "tfidf", "embedding" (user embedding
+        against the candidates' stored embeddings) or "hybrid" (a blend of both).
+        """
+        ranking = resolve_ranking_mode(ranking)
+        key = (user_id, num_recommendations, exploration_ratio, articles_per_field, ranking)
+        return self.inflight.do(
+            key, self._recommend_articles,
+            user_id, num_recommendations, exploration_ratio, articles_per_field, ranking
+        )
+
+    async def recommend_articles_async(
+        self,
+        user_id: str,
+        num_recommendations: int = 20,
+        exploration_ratio: float = 0.2,
+        articles_per_field: int = 20,
+        ranking: str = None
+    ) -> List[Dict[str, Any]]:
+        """recommend_articles for the event loop: runs in the default executor."""
+        ranking = resolve_ranking_mode(ranking)
+        key = (user_id, num_recommendations, exploration_ratio, articles_per_field, ranking)
+        return await self.inflight.do_async(
+            key, self._recommend_articles,
+            user_id, num_recommendations, exploration_ratio, articles_per_field, ranking
+        )
+
+    def _recommend_articles(
+        self,
+        user_id: str,
+        num_recommendations: int,
+        exploration_ratio: float,
+        articles_per_field: int,
+        ranking: str = "tfidf"
     ) -> List[Dict[str, Any]]:
-        # 1. Fetch history and hash
-        logger.info(f"Generating recommendations for user profile '{user_id}'...")
-        history = self.data_access.get_user_history(user_id)
-        history_hash = hash_history(history)
+        # decide per request whether its DEBUG records are kept
+        with sample_request(), span("recommend.total"):
+            return self._generate_recommendations(
+                user_id, num_recommendations, exploration_ratio, articles_per_field, ranking
+            )
+
+    def _user_embedding(self, user_id: str):
+        """The user's unit-norm embedding from the profile builder, or None."""
+        vectors, found = self.user_embeddings.get([user_id])
+        if not found[0]:
+            return None
+        norm = np.linalg.norm(vectors[0])
+        return vectors[0] / norm if norm > 0 else None
+
+    def _generate_recommendations(
+        self,
+        user_id: str,
+        num_recommendations: int,
+        exploration_ratio: float,
+        articles_per_field: int,
+        ranking: str = "tfidf"
+    ) -> List[Dict[str, Any]]:
+        # 1. Fetch the history token (count + latest read), not the history itself
+        logger.debug("Generating recommendations for user profile '%s'...", user_id)
+        with span("recommend.history_token"):
+            history_token = self.data_access.get_user_history_token(user_id)
+        # rankings are cached separately; the seen filter keeps the raw token
+        history_hash = history_token if ranking == "tfidf" else f"{history_token}:{ranking}"
         now = datetime.now(timezone.utc)
 
         # 2. Check cache
-        cached = self.cache_manager.check_and_update_cache(
-            user_id, history, history_hash, now, []
-        )
+        with span("recommend.cache_read"):
+            cached = self.cache_manager.check_and_update_cache(
+                user_id, [], history_hash, now, []
+            )
         #Remove cache for debugging!!!
         if cached:
-            logger.info("Cache hit! Returning cached recommendations.")
+            logger.debug("Cache hit! Returning cached recommendations.")
+            annotate("cache", "hit")
             return cached
+        annotate("cache", "miss")
 
-        # 3. Load profile & seen IDs
-        user_profile = self.data_access.get_user_profile(user_id)
-        seen_ids = set(history)
+        # 3. Load profile & seen filter (only on a miss; the filter only
+        #    fetches history rows added since it was last used)
+        with span("recommend.profile"):
+            user_profile = self.data_access.get_user_profile(user_id)
+        with span("recommend.seen_filter"):
+            seen = self.seen_filters.get(user_id, self.data_access, token=history_token)
 
         # 4. Determine field pools
         pf_fields = user_profile.get("preferred_fields") or FIELDS
         try:
-            hist_fields = self.data_access.get_user_history_fields(user_id) or []
+            with span("recommend.history_fields"):
+                hist_fields = self.data_access.get_user_history_fields(user_id) or []
             hist_fields = [f for f in hist_fields if f not in pf_fields]
         except Exception:
             hist_fields = []
 
-        # 5. Fetch unseen articles per pool
-        def fetch_pool(fields: List[str]) -> List[Dict[str, Any]]:
-            pool = []
+        # 5. Unseen candidates per field, taken from the shared per-field pools
+        def fetch_pool(fields: List[str]):
+            articles, picks = [], []
             for field in fields:
                 try:
-                    pool.extend(
-                        self.data_access.fetch_unseen_articles(
-                            user_id, field, articles_per_field
-                        )
-                    )
-                except Exception:
+                    pool = self.candidate_pools.get(field, self.data_access.fetch_field_candidates)
+                except Exception as e:
+                    logger.warning("Candidate pool for %s unavailable: %s", field, e)
                     continue
-            # remove seen and dedupe
-            unique = {a["postid"]: a for a in pool if a["postid"] not in seen_ids}
-            logger.debug(f"Retrieved {len(unique)} unseen articles.")
-            return list(unique.values())
-
-        pf_raw = fetch_pool(pf_fields)
-        hist_raw = fetch_pool(hist_fields)
+                idx = pool.unseen_indices(seen, articles_per_field)
+                if len(idx) == 0:
+                    continue
+                # copies: the pool is shared, scores are per request
+                articles.extend(dict(pool.articles[i]) for i in idx)
+                picks.append((pool, idx))
+            logger.debug("Retrieved %d unseen articles.", len(articles))
+            return articles, picks
+
+        with span("recommend.candidates"):
+            pf_raw, pf_picks = fetch_pool(pf_fields)
+            hist_raw, hist_picks = fetch_pool(hist_fields)
         all_articles = pf_raw + hist_raw
+        picks = pf_picks + hist_picks
 
-        # 6. Score all articles in a single TF-IDF space
-
+        # 6. Score against the pools' precomputed TF-IDF rows and embeddings
         if all_articles:
-            candidate_feats = [self.feature_extractor.extract_features(a) for a in all_articles]
-            logger.debug(f"Scoring {len(candidate_feats)} articles against user profile.")
-            scores = self.similarity_calculator.score_with_global_corpus(
-                user_profile, candidate_feats
-            )
-            print(f"scores {scores}")
-            for art, score in zip(all_articles, scores):
-                art["score"] = score
-        else:
-            all_articles = []
-
-        # split scored pools
-        pf_scored = sorted(
-            [a for a in all_articles if a in pf_raw],
-            key=lambda x: x["score"], reverse=True
-        )
-        hist_scored = sorted(
-            [a for a in all_articles if a in hist_raw],
-            key=lambda x: x["score"], reverse=True
-        )
-
-        # sort each
-        pf_scored.sort(key=lambda x: x["score"], reverse=True)
-        hist_scored.sort(key=lambda x: x["score"], reverse=True)
+            with span("recommend.scoring"):
+                rows = sp.vstack([pool.rows[idx] for pool, idx in picks], format="csr")
+                logger.debug("Scoring %d articles against user profile.", len(all_articles))
+                # large candidate sets are scored in parallel article shards (scoring.score_matrix)
+                scores = self._score(user_id, user_profile, rows, picks, ranking)
+                for art, score in zip(all_articles, scores):
+                    art["score"] = float(score)
+
+        # near-duplicate posts share a cluster_id; keep the best-scoring one
+        kept = {id(a) for a in collapse_clusters(all_articles)}
+
+        # 7. Rank each pool with MMR, which also drops near-identical articles
+        def rank_pool(start: int, end: int) -> List[Dict[str, Any]]:
+            idx = np.array([i for i in range(start, end) if id(all_articles[i]) in kept], dtype=np.int64)
+            if len(idx) == 0:
+                return []
+            # MMR only considers the DIVERSITY_TOP_M best after collapsing; pick them
+            # first (per-shard top-K, merged, for large pools) so only their rows are copied
+            idx = idx[top_k(scores[idx], DIVERSITY_TOP_M)[0]]
+            order = select_diverse(scores[idx], rows[idx], num_recommendations)
+            return [all_articles[idx[j]] for j in order]
+
+        with span("recommend.ranking"):
+            pf_scored = rank_pool(0, len(pf_raw))
+            hist_scored = rank_pool(len(pf_raw), len(all_articles))
 
         N = num_recommendations
         n_pf = int(N * (1 - exploration_ratio))
@@ -206,22 +315,57 @@ class RecommendationSystem:
             recs.extend(extras[: (N - len(recs)) ])
         if len(recs) < N:
             field = pf_fields[0] if pf_fields else "Technology"
-            recs.extend(
-                self.data_access.fetch_random_unseen(user_id, field, N - len(recs))
-            )
-        logger.debug(f"Top exploitation scores (pf_scored): {[a['score'] for a in pf_scored[:5]]}")
-        logger.debug(f"Top exploration scores (hist_scored): {[a['score'] for a in hist_scored[:5]]}")
+            with span("recommend.random_fill"):
+                recs.extend(
+                    self.data_access.fetch_random_unseen(user_id, field, N - len(recs))
+                )
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Top exploitation scores (pf_scored): %s", [a['score'] for a in pf_scored[:5]])
+            logger.debug("Top exploration scores (hist_scored): %s", [a['score'] for a in hist_scored[:5]])
 
         # 8. Cache & return
-        self.cache_manager.set_cache(
-            user_id,
-            history_hash,
-            {"hash": history_hash, "recs": recs, "ts": now}
-        )
-        logger.info("Combined recommendation list prepared.")
+        with span("recommend.cache_write"):
+            self.cache_manager.set_cache(
+                user_id,
+                history_hash,
+                {"hash": history_hash, "recs": recs, "ts": now}
+            )
+        logger.debug("Combined recommendation list prepared.")
         return recs
 
 
+    def _score(self, user_id: str, user_profile: Dict[str, Any], rows, picks, ranking: str) -> np.ndarray:
+        """
+        Candidate scores for the ranking mode. Embedding modes fall back to
+        TF-IDF when the user or every candidate lacks an embedding; in
+        "embedding" mode candidates without one rank last.
+        """
+        user_embedding = self._user_embedding(user_id) if ranking != "tfidf" else None
+        if user_embedding is not None:
+            # a pool loaded before the article store had rows holds (n, 0)
+            # embeddings: its candidates count as having none
+            dim = len(user_embedding)
+            usable = [pool.embeddings is not None and pool.embeddings.shape[1] == dim for pool, _ in picks]
+            available = np.concatenate([
+                pool.has_embedding[idx] if ok else np.zeros(len(idx), dtype=bool)
+                for (pool, idx), ok in zip(picks, usable)
+            ])
+            if available.any():
+                embeddings = np.concatenate([
+                    pool.embeddings[idx] if ok else np.zeros((len(idx), dim), dtype=np.float32)
+                    for (pool, idx), ok in zip(picks, usable)
+                ])
+                if ranking == "embedding":
+                    # stored article embeddings are unit norm: one mat-vec gives the cosines
+                    return np.where(available, embeddings @ user_embedding, -1.0).astype(np.float32)
+                return self.similarity_calculator.score_rows(
+                    user_profile, rows, user_embedding=user_embedding,
+                    article_embeddings=embeddings, available=available
+                )
+        if ranking != "tfidf":
+            logger.debug("No embeddings for %s; ranking by TF-IDF.", user_id)
+        return self.similarity_calculator.score_rows(user_profile, rows)
+
     
  ##moved out caching for clarity.
 
@@ -0,0 +1,75 @@
+import random
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from medium_clone_suggestion.config import FIELD_IDS_TTL_SECONDS
+from medium_clone_suggestion.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class FieldIdCache:
+    """
+    Postids of every live post per field, loaded through `loader(field)` and
+    kept for `ttl` seconds. Random fallbacks sample from these lists instead
+    of downloading a whole field per request.
+    """
+
+    def __init__(self, ttl: float = FIELD_IDS_TTL_SECONDS):
+        self.ttl = ttl
+        self._entries: Dict[str, Tuple[float, List[str]]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, field: str, loader: Callable[[str], List[str]]) -> List[str]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(field)
+        if entry is not None and now - entry[0] < self.ttl:
+            return entry[1]
+        ids = list(loader(field))
+        with self._lock:
+            self._entries[field] = (now, ids)
+        logger.debug("Loaded %d postids for field %s", len(ids), field)
+        return ids
+
+    def invalidate(self, field: Optional[str] = None):
+        with self._lock:
+            if field is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(field, None)
+
+
+def sample_unseen(postids: List[str], seen, k: int, rng: random.Random = None) -> List[str]:
+    """
+    Up to k random postids that `seen` (a SeenFilter) does not contain.
+
+    Draws a small random batch and rejects seen posts in one filter call, so
+    the usual cost is O(k). Only users who have read most of the field fall
+    back to filtering the whole list.
+    """
+    n = len(postids)
+    if n == 0 or k <= 0:
+        return []
+    rng = rng or random
+    batch = [postids[i] for i in rng.sample(range(n), min(n, 2 * k + 16))]
+    picked = seen.unseen(batch)[:k]
+    if len(picked) == k or len(batch) == n:
+        return picked
+
+    drawn = set(batch)
+    rest = seen.unseen([p for p in postids if p not in drawn])
+    return picked + rng.sample(rest, min(k - len(picked), len(rest)))
+
+
+_field_ids: Optional[FieldIdCache] = None
+_field_ids_lock = threading.Lock()
+
+def get_field_id_cache() -> FieldIdCache:
+    """Process-wide FieldIdCache."""
+    global _field_ids
+    with _field_ids_lock:
+        if _field_ids is None:
+            _field_ids = FieldIdCache()
+        return _field_ids
@@ -0,0 +1,295 @@
+import math
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from medium_clone_suggestion.config import (
+    SEEN_FILTER_BACKEND, SEEN_FILTER_MAX_USERS, SEEN_FILTER_BLOOM_FP_RATE,
+)
+from medium_clone_suggestion.logger import get_logger
+
+try:
+    from pyroaring import BitMap
+except ImportError:  # pyroaring is optional, CompressedIdSet is the numpy equivalent
+    BitMap = None
+
+logger = get_logger(__name__)
+
+
+class IdInterner:
+    """Maps postids to dense uint32 ids, shared by every user's seen set."""
+
+    def __init__(self):
+        self._ids: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def intern_many(self, postids: Iterable[str]) -> np.ndarray:
+        with self._lock:
+            ids = self._ids
+            return np.fromiter((ids.setdefault(str(p), len(ids)) for p in postids), dtype=np.uint32)
+
+    def lookup_many(self, postids: Iterable[str]) -> np.ndarray:
+        """Interned ids, -1 for postids never interned (and therefore never seen)."""
+        get = self._ids.get
+        return np.fromiter((get(str(p), -1) for p in postids), dtype=np.int64)
+
+    def __len__(self):
+        return len(self._ids)
+
+
+class CompressedIdSet:
+    """
+    Roaring-style set of uint32 ids: ids are split on their high 16 bits into
+    containers holding the low 16 bits, as a sorted uint16 array while sparse
+    and as a 65536-bit bitmap once past ARRAY_MAX entries.
+    """
+    ARRAY_MAX = 4096  # beyond this a bitmap (8 KiB) is smaller than the array
+
+    def __init__(self):
+        self._containers: Dict[int, np.ndarray] = {}
+
+    def add_many(self, ids: np.ndarray):
+        ids = np.asarray(ids, dtype=np.uint32)
+        highs = ids >> 16
+        for high in np.unique(highs):
+            low = (ids[highs == high] & 0xFFFF).astype(np.uint16)
+            container = self._containers.get(int(high))
+            if container is None or container.dtype == np.uint16:
+                merged = np.union1d(container, low) if container is not None else np.unique(low)
+                if len(merged) <= self.ARRAY_MAX:
+                    self._containers[int(high)] = merged.astype(np.uint16)
+                    continue
+                container, low = np.zeros(1024, dtype=np.uint64), merged
+                self._containers[int(high)] = container
+            low = low.astype(np.uint64)
+            np.bitwise_or.at(container, low >> 6, np.uint64(1) << (low & np.uint64(63)))
+
+    def contains_many(self, ids: np.ndarray) -> np.ndarray:
+        ids = np.asarray(ids, dtype=np.uint32)
+        result = np.zeros(len(ids), dtype=bool)
+        highs = ids >> 16
+        for high in np.unique(highs):
+            container = self._containers.get(int(high))
+            if container is None:
+                continue
+            mask = highs == high
+            low = (ids[mask] & 0xFFFF)
+            if container.dtype == np.uint16:
+                pos = np.searchsorted(container, low)
+                result[mask] = (pos < len(container)) & (container[np.minimum(pos, len(container) - 1)] == low)
+            else:
+                low = low.astype(np.uint64)
+                result[mask] = (container[low >> 6] >> (low & np.uint64(63))) & np.uint64(1) == 1
+        return result
+
+    def __len__(self):
+        return sum(
+            len(c) if c.dtype == np.uint16 else int(np.unpackbits(c.view(np.uint8)).sum())
+            for c in self._containers.values()
+        )
+
+    @property
+    def nbytes(self) -> int:
+        return sum(c.nbytes for c in self._containers.values())
+
+
+class RoaringIdSet:
+    """CompressedIdSet interface over pyroaring's BitMap."""
+
+    def __init__(self):
+        self._bitmap = BitMap()
+
+    def add_many(self, ids: np.ndarray):
+        self._bitmap.update(np.asarray(ids, dtype=np.uint32).tolist())
+
+    def contains_many(self, ids: np.ndarray) -> np.ndarray:
+        bitmap = self._bitmap
+        return np.fromiter((int(i) in bitmap for i in ids), dtype=bool, count=len(ids))
+
+    def __len__(self):
+        return len(self._bitmap)
+
+    @property
+    def nbytes(self) -> int:
+        return len(self._bitmap.serialize())
+
+
+class BloomFilter:
+    """
+    Fixed-capacity Bloom filter over uint32 ids. False positives (an unseen
+    post treated as seen) happen at about `fp_rate`; false negatives never do.
+    """
+
+    def __init__(self, capacity: int, fp_rate: float = SEEN_FILTER_BLOOM_FP_RATE):
+        self.capacity = max(capacity, 64)
+        self.fp_rate = fp_rate
+        self.n_bits = int(math.ceil(-self.capacity * math.log(fp_rate) / math.log(2) ** 2))
+        self.n_hashes = max(1, round(self.n_bits / self.capacity * math.log(2)))
+        self._bits = np.zeros((self.n_bits + 63) // 64, dtype=np.uint64)
+        self.count = 0
+
+    def _positions(self, ids: np.ndarray) -> np.ndarray:
+        # double hashing over two splitmix64-style mixes of the id
+        x = np.asarray(ids, dtype=np.uint64)
+        with np.errstate(over="ignore"):
+            h1 = (x + np.uint64(0x9E3779B97F4A7C15)) * np.uint64(0xBF58476D1CE4E5B9)
+            h1 ^= h1 >> np.uint64(31)
+            h2 = (x ^ np.uint64(0x94D049BB133111EB)) * np.uint64(0x94D049BB133111EB)
+            h2 ^= h2 >> np.uint64(29)
+            k = np.arange(self.n_hashes, dtype=np.uint64)
+            return (h1[:, None] + k[None, :] * (h2[:, None] | np.uint64(1))) % np.uint64(self.n_bits)
+
+    def add_many(self, ids: np.ndarray):
+        pos = self._positions(ids).ravel()
+        np.bitwise_or.at(self._bits, pos >> np.uint64(6), np.uint64(1) << (pos & np.uint64(63)))
+        self.count += len(ids)
+
+    def contains_many(self, ids: np.ndarray) -> np.ndarray:
+        if len(ids) == 0:
+            return np.zeros(0, dtype=bool)
+        pos = self._positions(ids)
+        hits = (self._bits[pos >> np.uint64(6)] >> (pos & np.uint64(63))) & np.uint64(1)
+        return hits.all(axis=1)
+
+    def __len__(self):
+        return self.count
+
+    @property
+    def full(self) -> bool:
+        return self.count > self.capacity
+
+    @property
+    def nbytes(self) -> int:
+        return self._bits.nbytes
+
+
+def make_id_set(backend: str, expected: int = 0):
+    if backend == "bloom":
+        # headroom so a growing history does not force a rebuild right away
+        return BloomFilter(capacity=max(1024, 2 * expected))
+    if backend == "roaring":
+        return RoaringIdSet() if BitMap is not None else CompressedIdSet()
+    raise ValueError(f"Unknown seen filter backend '{backend}', expected 'roaring' or 'bloom'")
+
+
+def _token_count(token: Optional[str]) -> Optional[int]:
+    try:
+        return int(token.split(':', 1)[0])
+    except (AttributeError, ValueError):
+        return None
+
+
+class SeenFilter:
+    """One user's read posts, as interned ids in a compressed set or Bloom filter."""
+
+    def __init__(self, interner: IdInterner, backend: str, expected: int = 0):
+        self.interner = interner
+        self.backend = backend
+        self.ids = make_id_set(backend, expected)
+        self.token: Optional[str] = None
+        self.since: Optional[str] = None  # latest history created_at applied
+        self.lock = threading.Lock()
+
+    def add_rows(self, rows: List[Dict]):
+        if not rows:
+            return
+        self.ids.add_many(self.interner.intern_many(r['postid'] for r in rows))
+        latest = max((r.get('created_at') or '' for r in rows), default='')
+        if latest and (self.since is None or latest > self.since):
+            self.since = latest
+
+    def seen_mask(self, postids: List[str]) -> np.ndarray:
+        ids = self.interner.lookup_many(postids)
+        mask = np.zeros(len(ids), dtype=bool)
+        known = ids >= 0
+        if known.any():
+            mask[known] = self.ids.contains_many(ids[known].astype(np.uint32))
+        return mask
+
+    def unseen(self, postids: List[str]) -> List[str]:
+        postids = list(postids)
+        if not postids:
+            return []
+        mask = self.seen_mask(postids)
+        return [p for p, seen in zip(postids, mask) if not seen]
+
+    def __contains__(self, postid: str) -> bool:
+        return bool(self.seen_mask([postid])[0])
+
+    def __len__(self):
+        return len(self.ids)
+
+
+class SeenFilterCache:
+    """
+    Per-user seen filters, kept for the `max_users` most recently used users.
+
+    A user's filter is built from the full history once; afterwards, when the
+    history token (see DatabaseManager.get_user_history_token) changes, only
+    rows at or after the latest applied created_at are fetched and added. The
+    filter is rebuilt when the history shrank or a Bloom filter is over capacity.
+
+    `source` is anything with get_user_history_token(user_id) and
+    get_user_history_rows(user_id, since=None).
+    """
+
+    def __init__(self, backend: str = SEEN_FILTER_BACKEND, max_users: int = SEEN_FILTER_MAX_USERS):
+        self.backend = backend
+        self.max_users = max_users
+        self.interner = IdInterner()
+        self._filters: "OrderedDict[str, SeenFilter]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id: str, source, token: Optional[str] = None) -> SeenFilter:
+        token = token or source.get_user_history_token(user_id)
+        with self._lock:
+            seen = self._filters.get(user_id)
+            if seen is not None:
+                self._filters.move_to_end(user_id)
+
+        if seen is not None and seen.token == token:
+            return seen
+
+        count = _token_count(token)
+        if seen is None:
+            stale = True
+        elif seen.backend == "bloom":
+            stale = seen.ids.full
+        else:  # an exact set larger than the history means rows were deleted
+            stale = count is not None and count < len(seen)
+        if stale:
+            seen = SeenFilter(self.interner, self.backend, expected=count or 0)
+            with seen.lock:
+                seen.add_rows(source.get_user_history_rows(user_id))
+                seen.token = token
+            logger.debug("Built seen filter for %s: %d posts", user_id, len(seen))
+        else:
+            with seen.lock:
+                if seen.token != token:
+                    seen.add_rows(source.get_user_history_rows(user_id, since=seen.since))
+                    seen.token = token
+
+        with self._lock:
+            self._filters[user_id] = seen
+            self._filters.move_to_end(user_id)
+            while len(self._filters) > self.max_users:
+                self._filters.popitem(last=False)
+        return seen
+
+    def invalidate(self, user_id: str):
+        with self._lock:
+            self._filters.pop(user_id, None)
+
+
+_seen_filters: Optional[SeenFilterCache] = None
+_seen_filters_lock = threading.Lock()
+
+def get_seen_filter_cache() -> SeenFilterCache:
+    """Process-wide SeenFilterCache shared by DatabaseManager and RecommendationSystem."""
+    global _seen_filters
+    with _seen_filters_lock:
+        if _seen_filters is None:
+            _seen_filters = SeenFilterCache()
+        return _seen_filters
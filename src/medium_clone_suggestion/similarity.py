@@ -1,11 +1,15 @@
 from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple, Union
+import numpy as np
+import scipy.sparse as sp
 import json
 import hashlib
 import joblib
 import os
 
+from medium_clone_suggestion.feature_extraction import ArticleFeatures, build_doc
+from medium_clone_suggestion.scoring import normalize_rows, score_matrix, dense_scores, blend
+from medium_clone_suggestion.config import USER_VECTOR_MODE, PROFILE_SECTION_WEIGHTS
 from medium_clone_suggestion.logger import get_logger
 
 logger = get_logger(__name__)
@@ -18,33 +22,20 @@ class SimilarityCalculator:
     def __init__(self):
         self.vectorizer = TfidfVectorizer()
         self.global_fitted = False  # Track if the vectorizer has been fitted
+        self.version = 0  # bumped on every fit/load; cached TF-IDF rows carry it
+        self.user_vector_mode = USER_VECTOR_MODE
+        self._term_columns: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        self._term_version = None
 
-    def _build_article_str(self, features: Dict[str, Any]) -> str:
-        print(f"article_str : {features}")
+    def _build_article_str(self, features: Union[ArticleFeatures, Dict[str, Any]]) -> str:
+        if isinstance(features, ArticleFeatures):
+            return features.doc
         if not isinstance(features, dict):
             raise TypeError(f"Expected article features dict, got {type(features)}: {features}")
-
-        ak = []
-        for item in features.get("keywords", []):
-            if isinstance(item, (list, tuple)) and item:
-                ak.append(str(item[0]))
-
-        at = []
-        for t in features.get("topics", []):
-            if isinstance(t, dict):
-                at.append(t.get("name", ""))
-            else:
-                at.append(str(t))
-
-        ae = []
-        for e in features.get("entities", []):
-            if isinstance(e, dict):
-                ae.append(e.get("name", ""))
-            else:
-                ae.append(str(e))
-
-        body = features.get("summary", "")
-        return " ".join(ak + at + ae + [body])
+        return build_doc(
+            features.get("keywords", []), features.get("topics", []),
+            features.get("entities", []), features.get("summary", "")
+        )
 
     def _build_user_str(self, profile: Dict[str, Any]) -> str:
         """
@@ -57,7 +48,7 @@ class SimilarityCalculator:
             except Exception:
                 return []
             
-        logger.info("Extracting user_preferences", profile)
+        logger.debug("Extracting user preferences for %s", profile.get("userid"))
         uk = safe_keys(profile.get("keywords", {}))
         ut = safe_keys(profile.get("topics", {}))
         ue = safe_keys(profile.get("entities", {}))
@@ -88,6 +79,7 @@ class SimilarityCalculator:
             logger.warning("No 'postid' found in articles, fitting new vectorizer.")
             self.vectorizer.fit(docs)
             self.global_fitted = True
+            self.version += 1
             return
         
         # Compute a hash of the sorted article IDs to detect corpus changes
@@ -101,6 +93,7 @@ class SimilarityCalculator:
                 if stored_data['id_hash'] == id_hash:
                     self.vectorizer = stored_data['vectorizer']
                     self.global_fitted = True
+                    self.version += 1
                     logger.info("Loaded stored TF-IDF vectorizer.")
                     return
             except Exception as e:
@@ -109,6 +102,7 @@ class SimilarityCalculator:
         # Fit a new vectorizer if no valid stored one is found
         self.vectorizer.fit(docs)
         self.global_fitted = True
+        self.version += 1
         
         # Save the vectorizer with the ID hash
         joblib.dump({'vectorizer': self.vectorizer, 'id_hash': id_hash}, vectorizer_file)
@@ -123,14 +117,117 @@ class SimilarityCalculator:
         Transform user and candidate articles using the pre-fit global TF-IDF,
         then compute cosine similarity.
         """
-        user_str = self._build_user_str(user_profile)
-        article_strs = [self._build_article_str(a) for a in candidate_articles]
-        tf_user = self.vectorizer.transform([user_str])
-        tf_articles = self.vectorizer.transform(article_strs)
-        sims = cosine_similarity(tf_user, tf_articles)[0]
-        logger.debug(f"Calculated cosine similarities for {len(candidate_articles)} articles.")
+        sims, _ = self.score_candidates(user_profile, candidate_articles)
         return sims.tolist()
 
+    def score_candidates(
+        self,
+        user_profile: Dict[str, Any],
+        candidate_articles: List[Dict[str, Any]]
+    ) -> Tuple[np.ndarray, Any]:
+        """
+        Like score_with_global_corpus, but returns the similarities as an array
+        together with the candidates' TF-IDF rows, for post-ranking stages.
+        """
+        tf_articles = self.transform_articles(candidate_articles)
+        return self.score_rows(user_profile, tf_articles), tf_articles
+
+    def transform_articles(self, candidate_articles: List[Union[ArticleFeatures, Dict[str, Any]]]):
+        """
+        TF-IDF rows of the given article features under the current vectorizer,
+        as L2-normalized float32 CSR (see scoring.normalize_rows).
+        """
+        return normalize_rows(self.vectorizer.transform([self._build_article_str(a) for a in candidate_articles]))
+
+    def transform_users(self, user_profiles: List[Dict[str, Any]]):
+        """
+        TF-IDF rows of the given user profiles, normalized like transform_articles:
+        weighted_user_vectors, or the joined term names when user_vector_mode is "keys".
+        """
+        if self.user_vector_mode == "keys":
+            return normalize_rows(self.vectorizer.transform([self._build_user_str(p) for p in user_profiles]))
+        return self.weighted_user_vectors(user_profiles)
+
+    def _columns(self, term: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Vocabulary columns of a profile term and how often each occurs in it."""
+        if self._term_version != self.version:
+            # a refit changes the vocabulary; swap rather than clear for concurrent readers
+            self._term_columns, self._term_version = {}, self.version
+        found = self._term_columns.get(term)
+        if found is None:
+            vocabulary = self.vectorizer.vocabulary_
+            cols = [vocabulary[t] for t in self.vectorizer.build_analyzer()(term) if t in vocabulary]
+            found = np.unique(np.asarray(cols, dtype=np.int32), return_counts=True)
+            self._term_columns[term] = found
+        return found
+
+    def weighted_user_vectors(self, user_profiles: List[Dict[str, Any]]):
+        """
+        User rows built straight from the profiles' {term: weight} sections in
+        vocabulary space: each term's tokens get its weight (times the section's
+        PROFILE_SECTION_WEIGHTS entry), then idf and L2 normalization apply as
+        for articles. With all weights 1 this is the "keys" vector. Malformed
+        sections and non-positive weights are skipped.
+        """
+        # per term: its row, weight, columns and counts; expanded once at the end
+        term_rows, weights, cols, counts = [], [], [], []
+        for r, profile in enumerate(user_profiles):
+            for section, section_weight in PROFILE_SECTION_WEIGHTS.items():
+                terms = profile.get(section)
+                if not isinstance(terms, dict):
+                    continue
+                for term, weight in terms.items():
+                    try:
+                        weight = float(weight) * section_weight
+                    except (TypeError, ValueError):
+                        continue
+                    if weight <= 0 or not isinstance(term, str):
+                        continue
+                    term_cols, term_counts = self._columns(term)
+                    term_rows.append(r)
+                    weights.append(weight)
+                    cols.append(term_cols)
+                    counts.append(term_counts)
+        shape = (len(user_profiles), len(self.vectorizer.vocabulary_))
+        if not cols:
+            return sp.csr_matrix(shape, dtype=np.float32)
+        lengths = [len(c) for c in cols]
+        tf = sp.csr_matrix(
+            (np.repeat(weights, lengths) * np.concatenate(counts),
+             (np.repeat(term_rows, lengths), np.concatenate(cols))),
+            shape=shape,
+        )
+        return normalize_rows(tf @ sp.diags(self.vectorizer.idf_))
+
+    def score_rows(self, user_profile: Dict[str, Any], tf_articles,
+                   user_embedding: Optional[np.ndarray] = None, article_embeddings: Optional[np.ndarray] = None,
+                   dense_weight: Optional[float] = None, available: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Cosine similarity of the user profile to rows from transform_articles,
+        blended with embedding similarity when embeddings are given (see score_users).
+        """
+        users = None if user_embedding is None else np.atleast_2d(user_embedding)
+        sims = self.score_users([user_profile], tf_articles, user_embeddings=users,
+                                article_embeddings=article_embeddings, dense_weight=dense_weight,
+                                available=available)[0]
+        logger.debug("Calculated cosine similarities for %d articles.", tf_articles.shape[0])
+        return sims
+
+    def score_users(self, user_profiles: List[Dict[str, Any]], tf_articles, n_threads: Optional[int] = None,
+                    user_embeddings: Optional[np.ndarray] = None, article_embeddings: Optional[np.ndarray] = None,
+                    dense_weight: Optional[float] = None, available: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Similarities of many user profiles at once: (n_users, n_articles) float32.
+
+        With user and article embeddings, the TF-IDF cosine is linearly blended
+        with the embedding cosine (scoring.blend, HYBRID_DENSE_WEIGHT by
+        default); `available` masks articles without an embedding.
+        """
+        sparse_scores = score_matrix(self.transform_users(user_profiles), tf_articles, n_threads)
+        if user_embeddings is None or article_embeddings is None:
+            return sparse_scores
+        return blend(sparse_scores, dense_scores(user_embeddings, article_embeddings), dense_weight, available)
+
     def score_all(
         self,
         user_profile: Dict[str, Any],
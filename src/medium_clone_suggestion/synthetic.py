@@ -0,0 +1,203 @@
+"""
+Synthetic articles, metadata, reading histories and profiles for offline
+benchmarks and load tests.
+
+Everything is derived from (seed, index), so a dataset of a million articles
+costs a few numpy arrays up front and each article or user is generated only
+when asked for, the same every time.
+"""
+import random
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from medium_clone_suggestion.config import FIELDS
+
+_SYLLABLES = [
+    "ka", "lo", "mi", "ren", "ta", "vor", "sel", "qu", "an", "dri", "po", "lex",
+    "ne", "ul", "sto", "bra", "fin", "gal", "hem", "is", "jor", "ky", "mar", "os",
+]
+_ENTITY_LABELS = ("PERSON", "ORG", "GPE")
+_USER_ID_BIT = 1 << 64  # keeps user ids apart from article ids of the same seed
+_ZIPF_TABLES: Dict[tuple, np.ndarray] = {}
+
+
+def _word(rng: random.Random) -> str:
+    return "".join(rng.choice(_SYLLABLES) for _ in range(rng.randint(2, 4)))
+
+
+def _zipf_pick(rng: random.Random, items: List, s: float = 1.1):
+    # inverse-CDF draw from a Zipf(s) over the list order, via a cached table
+    table = _ZIPF_TABLES.get((len(items), s))
+    if table is None:
+        weights = 1.0 / np.arange(1, len(items) + 1) ** s
+        table = _ZIPF_TABLES[(len(items), s)] = np.cumsum(weights / weights.sum())
+    return items[min(int(np.searchsorted(table, rng.random())), len(items) - 1)]
+
+
+class SyntheticDataset:
+    """
+    A deterministic synthetic corpus.
+
+    Articles belong to FIELDS with Zipf-skewed popularity. Each field has its
+    own vocabulary, topic labels and entities, plus a shared general
+    vocabulary, so TF-IDF sees realistic overlap. Articles are numbered by
+    publication time. Users prefer one to three fields and read mostly from
+    them; history lengths are exponentially distributed around
+    `history_mean`.
+    """
+
+    def __init__(self, n_articles: int = 10_000, n_users: int = 1_000, seed: int = 0,
+                 history_mean: float = 40.0, vocab_per_field: int = 400,
+                 start: Optional[datetime] = None, span_days: int = 365):
+        self.n_articles = n_articles
+        self.n_users = n_users
+        self.seed = seed
+        self.history_mean = history_mean
+        self.fields = list(FIELDS)
+        self.start = start or datetime(2024, 1, 1, tzinfo=timezone.utc)
+        self.span_days = span_days
+
+        rng = random.Random(seed)
+        self.shared_vocab = [_word(rng) for _ in range(vocab_per_field)]
+        self.vocab = {f: [_word(rng) for _ in range(vocab_per_field)] for f in self.fields}
+        self.topic_labels = {
+            f: [f"{self.vocab[f][i]} {self.vocab[f][i + 1]}" for i in range(0, 24, 2)] for f in self.fields
+        }
+        self.entity_pool = {
+            f: {label: [_word(rng).title() for _ in range(40)] for label in _ENTITY_LABELS} for f in self.fields
+        }
+
+        nrng = np.random.default_rng(seed)
+        weights = 1.0 / np.arange(1, len(self.fields) + 1) ** 0.8
+        self.field_weights = weights / weights.sum()
+        self.article_fields = nrng.choice(len(self.fields), size=n_articles, p=self.field_weights).astype(np.int8)
+        self.field_index = {f: np.flatnonzero(self.article_fields == i) for i, f in enumerate(self.fields)}
+        # seconds after `start`, increasing with the article index
+        self.published = np.sort(nrng.uniform(0, span_days * 86400, size=n_articles))
+
+    # ── ids ──────────────────────────────────────────────────────────────
+    def postid(self, i: int) -> str:
+        return str(uuid.UUID(int=(self.seed << 96) | i))
+
+    def article_index(self, postid: str) -> int:
+        return uuid.UUID(postid).int & (_USER_ID_BIT - 1)
+
+    def user_id(self, u: int) -> str:
+        return str(uuid.UUID(int=(self.seed << 96) | _USER_ID_BIT | u))
+
+    def user_index(self, user_id: str) -> int:
+        return uuid.UUID(user_id).int & (_USER_ID_BIT - 1)
+
+    def field_of(self, i: int) -> str:
+        return self.fields[self.article_fields[i]]
+
+    def created_at(self, i: int) -> str:
+        return (self.start + timedelta(seconds=float(self.published[i]))).isoformat()
+
+    # ── articles ─────────────────────────────────────────────────────────
+    def article(self, i: int) -> Dict:
+        """Post row joined with its article_metadata, as fetch_field_candidates returns it."""
+        rng = random.Random((self.seed << 32) ^ i)
+        field = self.field_of(i)
+        vocab = self.vocab[field]
+
+        terms = []
+        while len(terms) < 5:
+            term = _zipf_pick(rng, vocab)
+            if term not in terms:
+                terms.append(term)
+        keywords = [[t, round(0.8 - 0.1 * n + rng.uniform(-0.03, 0.03), 4)] for n, t in enumerate(terms)]
+
+        labels = self.topic_labels[field]
+        topics = list(dict.fromkeys(_zipf_pick(rng, labels) for _ in range(rng.randint(1, 3))))
+        entities = {}
+        for label in _ENTITY_LABELS:
+            if rng.random() < 0.6:
+                pool = self.entity_pool[field][label]
+                entities[label] = list(dict.fromkeys(_zipf_pick(rng, pool) for _ in range(rng.randint(1, 3))))
+
+        def sentence():
+            words = [_zipf_pick(rng, vocab) if rng.random() < 0.4 else rng.choice(self.shared_vocab)
+                     for _ in range(rng.randint(10, 20))]
+            return " ".join(words).capitalize() + "."
+
+        summary = " ".join(sentence() for _ in range(rng.randint(2, 3)))
+        return {
+            "postid": self.postid(i),
+            "field": field,
+            "title": sentence()[:-1],
+            "keywords": keywords,
+            "topics": topics,
+            "entities": entities,
+            "summary": summary,
+            "content": " ".join([summary] + [sentence() for _ in range(rng.randint(6, 12))]),
+            "cluster_id": None,
+            "created_at": self.created_at(i),
+        }
+
+    def metadata(self, i: int) -> Dict:
+        """article_metadata columns, as fetch_article_metadata returns them."""
+        article = self.article(i)
+        return {k: article[k] for k in ("keywords", "topics", "entities")}
+
+    def newest(self, field: str, limit: int) -> np.ndarray:
+        """Indices of the field's `limit` newest articles, newest first."""
+        return self.field_index[field][::-1][:limit]
+
+    # ── users ────────────────────────────────────────────────────────────
+    def _user_rng(self, u: int, stream: int) -> random.Random:
+        # one independent stream per user attribute
+        return random.Random((self.seed << 40) ^ _USER_ID_BIT ^ (stream << 32) ^ u)
+
+    def preferred_fields(self, u: int) -> List[str]:
+        rng = self._user_rng(u, 0)
+        k = rng.choice((1, 1, 2, 2, 3))
+        return list(dict.fromkeys(rng.choices(self.fields, weights=self.field_weights, k=k)))
+
+    def history(self, u: int) -> List[Dict]:
+        """History rows (postid, created_at) in reading order; 80% from preferred fields."""
+        rng = self._user_rng(u, 1)
+        fields = self.preferred_fields(u)
+        n = min(int(rng.expovariate(1.0 / self.history_mean)), self.n_articles // 2)
+        read = {}
+        for _ in range(n):
+            field = rng.choice(fields) if rng.random() < 0.8 else rng.choice(self.fields)
+            pool = self.field_index[field]
+            if len(pool):
+                i = int(pool[rng.randrange(len(pool))])
+                read.setdefault(i, rng.uniform(0, self.span_days * 86400))
+        rows = sorted(((max(t, self.published[i]), i) for i, t in read.items()))
+        return [
+            {"postid": self.postid(i), "created_at": (self.start + timedelta(seconds=float(t))).isoformat()}
+            for t, i in rows
+        ]
+
+    def profile(self, u: int) -> Dict:
+        """user_profile_interests row: weighted keywords, topics and entities of the preferred fields."""
+        rng = self._user_rng(u, 2)
+        fields = self.preferred_fields(u)
+        keywords, topics, entities = {}, {}, {}
+        for field in fields:
+            for _ in range(rng.randint(8, 20)):
+                term = _zipf_pick(rng, self.vocab[field])
+                keywords[term] = round(keywords.get(term, 0.0) + rng.uniform(0.5, 3.0), 3)
+            for _ in range(rng.randint(1, 4)):
+                label = _zipf_pick(rng, self.topic_labels[field])
+                topics[label] = round(topics.get(label, 0.0) + rng.uniform(0.5, 2.0), 3)
+            for _ in range(rng.randint(0, 4)):
+                name = _zipf_pick(rng, self.entity_pool[field][rng.choice(_ENTITY_LABELS)])
+                entities[name] = round(entities.get(name, 0.0) + rng.uniform(0.5, 2.0), 3)
+        return {
+            "userid": self.user_id(u),
+            "keywords": keywords,
+            "topics": topics,
+            "entities": entities,
+            "preferred_fields": fields,
+        }
+
+    def top_articles(self, limit: int) -> List[str]:
+        """Stand-in for the rank_articles RPC: newest first."""
+        return [self.postid(i) for i in range(self.n_articles - 1, max(self.n_articles - 1 - limit, -1), -1)]
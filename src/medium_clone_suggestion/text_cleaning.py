@@ -0,0 +1,49 @@
+import html
+import re
+
+try:
+    import lxml.html as lxml_html
+except ImportError:  # lxml is optional, the regex path covers plain markup
+    lxml_html = None
+
+_DROP_BLOCKS = re.compile(r'<(script|style|noscript)\b[^>]*>.*?</\1\s*>', re.I | re.S)
+_COMMENTS = re.compile(r'<!--.*?-->', re.S)
+_BLOCK_TAGS = re.compile(r'</?(p|div|br|li|ul|ol|h[1-6]|blockquote|pre|tr|td|th|section|article)\b[^>]*>', re.I)
+_TAGS = re.compile(r'<[^>]+>')
+_WHITESPACE = re.compile(r'\s+')
+
+
+def normalize_whitespace(text: str) -> str:
+    return _WHITESPACE.sub(' ', text).strip()
+
+
+def strip_tags(raw: str) -> str:
+    """Regex HTML-to-text: drops script/style/comments, keeps block boundaries as spaces."""
+    text = _DROP_BLOCKS.sub(' ', raw)
+    text = _COMMENTS.sub(' ', text)
+    text = _BLOCK_TAGS.sub(' ', text)
+    text = _TAGS.sub('', text)
+    return normalize_whitespace(html.unescape(text))
+
+
+def html_to_text(raw: str) -> str:
+    """
+    Convert article HTML to normalized plain text.
+
+    Text without markup is only whitespace-normalized. Otherwise lxml is used
+    when installed, with the regex stripper as fallback (and for fragments
+    lxml cannot parse).
+    """
+    if not raw:
+        return ''
+    if '<' not in raw and '&' not in raw:
+        return normalize_whitespace(raw)
+    if lxml_html is not None:
+        try:
+            doc = lxml_html.fromstring(_DROP_BLOCKS.sub(' ', raw))
+            for br in doc.iter('br', 'p', 'div', 'li', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6'):
+                br.tail = ' ' + br.tail if br.tail else ' '
+            return normalize_whitespace(doc.text_content())
+        except Exception:
+            pass
+    return strip_tags(raw)
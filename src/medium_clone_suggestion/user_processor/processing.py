@@ -6,7 +6,8 @@
 '''
 
 from datetime import datetime, timezone
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
+import numpy as np
 from medium_clone_suggestion.user_processor.config import Config
 from dateutil.parser import parse
 
@@ -21,6 +22,13 @@ class ProfileProcessor:
         dt = parse(created_at) if isinstance(created_at, str) else created_at
         days_old = (datetime.now(timezone.utc) - dt).days
         return 1 / (1 + self.config.FRESHNESS_DECAY_RATE * days_old)
+
+    def decay_factor(self, age_seconds: float) -> float:
+        """
+        Exponential decay over fractional days, for sums kept between runs:
+        decaying by each interval in turn equals decaying by their total.
+        """
+        return float(np.exp(-self.config.FRESHNESS_DECAY_RATE * max(age_seconds, 0.0) / 86400))
     
     def calculate_engagement_weight(
         self, 
@@ -48,7 +56,6 @@ class ProfileProcessor:
             
             weight = self._get_activity_weight(activity)
             metadata_entry = metadata[post_id]
-            print(f"metadata entry: {metadata} || {activity}")
             
             raw_keywords = metadata_entry.get('keywords', [])
             keywords = [kw[0] for kw in raw_keywords if isinstance(kw, (list, tuple))]
@@ -74,6 +81,25 @@ class ProfileProcessor:
             self._normalize_scores(entity_scores)
         )
     
+    def calculate_embedding(
+        self,
+        activities: List[Dict],
+        article_embeddings: Dict[str, np.ndarray]
+    ) -> Optional[np.ndarray]:
+        """
+        Engagement- and freshness-weighted sum of the embeddings of the posts
+        in `activities` (its direction is the weighted average); None when
+        none of them has an embedding.
+        """
+        total = None
+        for activity in activities:
+            vector = article_embeddings.get(activity['postid'])
+            if vector is None:
+                continue
+            weighted = self._get_activity_weight(activity) * np.asarray(vector, dtype=np.float32)
+            total = weighted if total is None else total + weighted
+        return total
+
     def _get_activity_weight(self, activity: Dict) -> float:
         """Determine weight for an activity based on type and freshness."""
 
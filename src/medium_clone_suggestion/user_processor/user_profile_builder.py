@@ -6,15 +6,20 @@ from datetime import datetime, timedelta, timezone
 from medium_clone_suggestion.user_processor.config import Config
 from medium_clone_suggestion.database import DatabaseManager
 from medium_clone_suggestion.user_processor.processing import ProfileProcessor
+from medium_clone_suggestion.embedding_store import EmbeddingStore, get_embedding_store
 from  medium_clone_suggestion.logger import get_logger
+from medium_clone_suggestion.instrumentation import span, timed
 
 logger = get_logger(__name__)
 
 class UserProfileBuilder:
-    def __init__(self, config: Config):
+    def __init__(self, config: Config, db=None, article_embeddings: EmbeddingStore = None,
+                 user_embeddings: EmbeddingStore = None):
         self.config = config
-        self.db = DatabaseManager()
+        self.db = db or DatabaseManager()
         self.processor = ProfileProcessor(config)
+        self.article_embeddings = article_embeddings if article_embeddings is not None else get_embedding_store("articles")
+        self.user_embeddings = user_embeddings if user_embeddings is not None else get_embedding_store("users")
         self.logger = self._setup_logging()
 
     def _setup_logging(self) -> logging.Logger:
@@ -28,25 +33,29 @@ class UserProfileBuilder:
             max_days=self.config.MAX_HISTORY_DAYS
         )
     
+    @timed("profiles.total")
     def process_users(self, user_limit: int = None):
         limit = user_limit or self.config.USER_PROCESS_LIMIT
         self.logger.info(f"Starting processing for up to {limit} users")
 
-        users = self.get_active_users(limit)
+        with span("profiles.active_users"):
+            users = self.get_active_users(limit)
         for user_id in users:
             # 1) pull their last updated—or fall back to global cutoff
-            last   = self.db.get_user_profile_last_updated(user_id)
-            cutoff = last or (datetime.now(timezone.utc) - timedelta(days=self.config.MAX_HISTORY_DAYS)).isoformat()
+            with span("profiles.activities"):
+                last   = self.db.get_user_profile_last_updated(user_id)
+                cutoff = last or (datetime.now(timezone.utc) - timedelta(days=self.config.MAX_HISTORY_DAYS)).isoformat()
 
-            # 2) fetch only THEIR new activities, Have done as a hack to fix a logic understanding
-            ## of my process.
-            activities = self.db.get_user_activities_since(user_id, cutoff)
+                # 2) fetch only THEIR new activities, Have done as a hack to fix a logic understanding
+                ## of my process.
+                activities = self.db.get_user_activities_since(user_id, cutoff)
             if not activities:
                 continue
 
             # 3) gather metadata for those postids
             postids  = {a["postid"] for a in activities}
-            metadata = self.db.fetch_article_metadata(list(postids))
+            with span("profiles.metadata"):
+                metadata = self.db.fetch_article_metadata(list(postids))
 
             # 4) process this single user
             self._process_user(user_id, activities, metadata)
@@ -83,11 +92,12 @@ class UserProfileBuilder:
 
                 formatted_activities.append(activity)
 
-            print(f" {formatted_activities} ")
+            self.logger.debug("Scoring %d activities for user %s", len(formatted_activities), user_id)
 
-            kw_scores, topic_scores, entity_scores = self.processor.calculate_scores(
-                formatted_activities, metadata
-            )
+            with span("profiles.scoring"):
+                kw_scores, topic_scores, entity_scores = self.processor.calculate_scores(
+                    formatted_activities, metadata
+                )
 
             profile_data = {
                 'keywords': {k: v for k, v in kw_scores.items() if v >= self.config.MIN_ENGAGEMENT_SCORE},
@@ -95,14 +105,39 @@ class UserProfileBuilder:
                 'entities': {k: v for k, v in entity_scores.items() if v >= self.config.MIN_ENGAGEMENT_SCORE}
             }
 
-            self.db.update_user_interests(user_id, profile_data)
-            self.db.update_user_profile_last_updated(user_id, datetime.now(timezone.utc))
+            with span("profiles.store"):
+                self.db.update_user_interests(user_id, profile_data)
+                self.db.update_user_profile_last_updated(user_id, datetime.now(timezone.utc))
+            with span("profiles.embedding"):
+                self._update_embedding(user_id, formatted_activities)
             self.logger.info(f"Updated suggestions for user {user_id}")
 
         except Exception as e:
             self.logger.error(f"Error processing user {user_id}: {e}")
 
 
+    def _update_embedding(self, user_id: str, activities: List[dict]):
+        """
+        Add the new activities' weighted article embeddings to the user's
+        stored sum, after decaying that sum exponentially by the time since
+        it was stored (ProfileProcessor.decay_factor).
+        """
+        postids = list({a['postid'] for a in activities})
+        vectors, found = self.article_embeddings.get(postids)
+        embeddings = {pid: vectors[i] for i, pid in enumerate(postids) if found[i]}
+        if not embeddings:
+            return
+        added = self.processor.calculate_embedding(activities, embeddings)
+        if added is None:
+            return
+        now = time.time()
+        previous, known = self.user_embeddings.get([user_id])
+        if known[0]:
+            stored_at = self.user_embeddings.get_timestamps([user_id])[0]
+            age = now - stored_at if stored_at > 0 else 0.0
+            added = added + previous[0] * self.processor.decay_factor(age)
+        self.user_embeddings.put([user_id], added, timestamp=now)
+
     def _process_batch(self, max_users: int):
         """Process a batch of active users (by count), fetches data once then groups"""
         self.logger.info(f"Processing up to {max_users} active users")
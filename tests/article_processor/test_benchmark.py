@@ -0,0 +1,45 @@
+import pytest
+
+from medium_clone_suggestion.article_processor import benchmark
+from medium_clone_suggestion.instrumentation import span
+
+
+class FakeProcessor:
+    def __init__(self):
+        self.seen = []
+        self.closed = False
+
+    def process_batch(self, articles):
+        for article in articles:
+            with span("article.summary"):
+                self.seen.append(article["postid"])
+        with span("article.topics"):
+            pass
+        return articles
+
+    def close(self):
+        self.closed = True
+
+
+def test_stage_report_percentiles_and_batch_stages():
+    stages = [("article.summary", s / 1000) for s in range(1, 101)] + [("article.topics", 0.5)] * 2
+    report = benchmark.stage_report(stages, n_articles=100)
+    summary = report["article.summary"]
+    assert summary["calls"] == 100
+    assert summary["p50_ms"] == pytest.approx(50.5)
+    assert summary["p95_ms"] == pytest.approx(95.05)
+    # batch stages count every article of the run, not their calls
+    assert report["article.topics"]["articles_per_s"] == pytest.approx(100.0)
+
+
+def test_run_thread_times_batches_after_warmup(monkeypatch):
+    fake = FakeProcessor()
+    monkeypatch.setattr(benchmark, "_new_processor", lambda workers: fake)
+    articles = [{"postid": str(i), "content": "x"} for i in range(5)]
+
+    wall, stages = benchmark.run_thread(articles, workers=2, batch_size=2)
+
+    assert fake.seen == ["0"] + [str(i) for i in range(5)]  # warm-up article first
+    assert fake.closed and wall > 0
+    assert [s for s, _ in stages].count("article.summary") == 5
+    assert [s for s, _ in stages].count("article.topics") == 3
@@ -0,0 +1,25 @@
+from medium_clone_suggestion.article_processor.entities import EntityBackend, add_entities_batch, cap_text
+
+class RecordingBackend(EntityBackend):
+    def __init__(self):
+        self.calls = []
+    def extract_batch(self, texts):
+        self.calls.append(texts)
+        return [{"PERSON": [t.split()[0]]} for t in texts]
+
+def test_batch_is_tagged_in_one_call():
+    backend = RecordingBackend()
+    articles = [{"content": "Ada wrote code"}, {"content": "Alan broke codes"}]
+    add_entities_batch(articles, backend, source="content", max_chars=0)
+    assert len(backend.calls) == 1
+    assert [a["entities"] for a in articles] == [{"PERSON": ["Ada"]}, {"PERSON": ["Alan"]}]
+
+def test_summary_source_falls_back_to_content():
+    backend = RecordingBackend()
+    articles = [{"content": "Full body", "summary": "Short summary"}, {"content": "Body only", "summary": ""}]
+    add_entities_batch(articles, backend, source="summary", max_chars=0)
+    assert backend.calls[0] == ["Short summary", "Body only"]
+
+def test_cap_text_cuts_on_word_boundary():
+    assert cap_text("alpha beta gamma", 12) == "alpha beta"
+    assert cap_text("short", 100) == "short"
@@ -0,0 +1,45 @@
+import pytest
+
+from medium_clone_suggestion.article_processor.fingerprints import (
+    FingerprintStore, fingerprint, hamming,
+)
+
+BASE = (
+    "Rust ownership rules make memory safety a compile time property. The borrow checker "
+    "rejects programs that alias mutable state, and lifetimes describe how long references "
+    "stay valid. In practice this removes whole classes of bugs such as use after free and "
+    "data races, at the cost of a steeper learning curve for newcomers to the language. "
+)
+
+
+@pytest.fixture
+def store(tmp_path):
+    return FingerprintStore(path=str(tmp_path / "fingerprints.sqlite3"))
+
+
+def test_exact_hash_ignores_markup_case_and_spacing():
+    assert fingerprint(BASE).sha == fingerprint(f"<p>{BASE.upper()}</p>\n\n").sha
+    assert fingerprint(BASE).sha != fingerprint(BASE + " One more sentence.").sha
+
+
+def test_simhash_close_for_small_edits():
+    near = fingerprint(BASE * 3 + " Edited.").simhash
+    assert hamming(fingerprint(BASE * 3).simhash, near) <= 3
+    other = fingerprint("Sourdough needs a lively starter, long fermentation and a very hot oven " * 5)
+    assert hamming(fingerprint(BASE * 3).simhash, other.simhash) > 3
+
+
+def test_results_roundtrip_keeps_reused_fields_only(store):
+    fp = fingerprint(BASE)
+    store.save_results({fp.sha: {"summary": "s", "keywords": ["rust"], "field": "Technology", "content": "x"}})
+    result = store.lookup([fp.sha, "missing"])
+    assert list(result) == [fp.sha]
+    assert result[fp.sha]["keywords"] == ["rust"]
+    assert "content" not in result[fp.sha]
+
+
+def test_near_duplicates_share_cluster(store):
+    assert store.assign_cluster("a", fingerprint(BASE * 3)) == "a"
+    assert store.assign_cluster("b", fingerprint(BASE * 3 + " Edited.")) == "a"
+    assert store.assign_cluster("c", fingerprint("Completely different text about gardening " * 10)) == "c"
+    assert store.clusters() == {"a": ["a", "b"]}
@@ -0,0 +1,78 @@
+import pytest
+from unittest.mock import MagicMock
+from medium_clone_suggestion.article_processor.job_queue import JobQueue, QueueFullError
+from medium_clone_suggestion.article_processor.config import Config
+from medium_clone_suggestion.article_processor.worker import ArticleWorker
+
+@pytest.fixture
+def queue(tmp_path):
+    return JobQueue(str(tmp_path / "jobs.sqlite3"), max_pending=3, max_attempts=2)
+
+def test_enqueue_dedups_pending_postids(queue):
+    assert queue.enqueue("p1") is True
+    assert queue.enqueue("p1") is False
+    assert queue.stats()["pending"] == 1
+
+def test_enqueue_backpressure(queue):
+    for pid in ("p1", "p2", "p3"):
+        queue.enqueue(pid)
+    with pytest.raises(QueueFullError):
+        queue.enqueue("p4")
+    # re-enqueueing a queued post is still accepted as a no-op
+    assert queue.enqueue("p1") is False
+
+def test_claim_complete_and_requeue(queue):
+    for pid in ("p1", "p2", "p3"):
+        queue.enqueue(pid)
+    assert queue.claim_batch(2) == ["p1", "p2"]
+    assert queue.enqueue("p1") is False  # still processing
+    queue.complete(["p1", "p2"])
+    stats = queue.stats()
+    assert stats["done"] == 2 and stats["pending"] == 1
+    # finished posts can be queued again
+    assert queue.enqueue("p1") is True
+
+def test_fail_retries_then_gives_up(queue):
+    queue.enqueue("p1")
+    queue.fail(queue.claim_batch(1), "boom")
+    assert queue.stats()["pending"] == 1
+    queue.fail(queue.claim_batch(1), "boom")
+    assert queue.stats()["failed"] == 1
+
+def test_stale_jobs_requeue_last_then_fail(tmp_path):
+    queue = JobQueue(str(tmp_path / "jobs.sqlite3"), max_attempts=2, lease_seconds=0)
+    queue.enqueue("crash")
+    queue.enqueue("p2")
+    assert queue.claim_batch(1) == ["crash"]
+    # the worker died; the expired lease puts the post behind p2
+    assert queue.claim_batch(2) == ["p2", "crash"]
+    queue.complete(["p2"])
+    assert queue.claim_batch(2) == []
+    stats = queue.stats()
+    assert stats["failed"] == 1 and stats["pending"] == 0 and stats["processing"] == 0
+
+class FastConfig(Config):
+    COALESCE_WINDOW_SECONDS = 0
+    SWEEP_LIMIT = 4
+
+def test_worker_processes_exact_postids(queue):
+    pipeline = MagicMock()
+    pipeline.run_for.return_value = {"processed": 1, "missing": ["p2"]}
+    worker = ArticleWorker(queue=queue, pipeline=pipeline, config=FastConfig, batch_size=5)
+    queue.enqueue("p1")
+    queue.enqueue("p2")
+    assert worker.run_once() == 2
+    pipeline.run_for.assert_called_once_with(["p1", "p2"])
+    pipeline.run.assert_not_called()
+    stats = queue.stats()
+    assert stats["done"] == 1 and stats["pending"] == 1  # missing post is retried
+
+def test_sweep_drains_queue_first(queue):
+    calls = []
+    pipeline = MagicMock()
+    pipeline.run_for.side_effect = lambda ids: calls.append(("run_for", ids)) or {"processed": len(ids)}
+    pipeline.run.side_effect = lambda limit: calls.append(("run", limit)) or {"processed": limit}
+    worker = ArticleWorker(queue=queue, pipeline=pipeline, config=FastConfig, batch_size=2)
+    queue.enqueue("p1")
+    worker.sweep()
+    assert calls == [("run_for", ["p1"]), ("run", 2), ("run", 2)]
@@ -0,0 +1,53 @@
+import pytest
+import torch
+from medium_clone_suggestion.article_processor.models import ModelManager, model_key
+
+def test_acquire_reuses_resident_model():
+    manager = ModelManager(use_cuda=False, idle_timeout=60)
+    loads = []
+    loader = lambda: loads.append(1) or torch.nn.Linear(4, 4)
+
+    first = manager.acquire("linear", loader)
+    manager.release("linear")
+    second = manager.acquire("linear", loader)
+    assert first is second
+    assert len(loads) == 1
+    usage = manager.memory_usage()["linear"]
+    assert usage["refcount"] == 1
+    assert usage["bytes"] == (16 + 4) * 4
+
+def test_evict_idle_only_unreferenced():
+    manager = ModelManager(use_cuda=False, idle_timeout=10)
+    manager.acquire("held", lambda: torch.nn.Linear(2, 2))
+    manager.acquire("free", lambda: torch.nn.Linear(2, 2))
+    manager.release("free")
+
+    assert manager.evict_idle(now=manager._last_used["free"] + 5) == []
+    assert manager.evict_idle(now=manager._last_used["free"] + 11) == ["free"]
+    assert set(manager.memory_usage()) == {"held"}
+
+class _TinyModel(torch.nn.Sequential):
+    @classmethod
+    def from_pretrained(cls, model_name, **kwargs):
+        torch.manual_seed(0)  # same "checkpoint" weights on every load
+        return cls(torch.nn.Linear(8, 8), torch.nn.ReLU(), torch.nn.Linear(8, 2))
+
+def test_int8_mode_quantizes_linear_layers_under_its_own_key():
+    manager = ModelManager(use_cuda=False, idle_timeout=60)
+    fp32 = manager.acquire_model("tiny", _TinyModel)
+    int8 = manager.acquire_model("tiny", _TinyModel, mode="int8")
+
+    assert int8 is not fp32
+    assert set(manager.memory_usage()) == {model_key("tiny"), model_key("tiny", "int8")}
+    assert model_key("tiny", "int8") != model_key("tiny")
+    assert all(isinstance(m, torch.nn.Linear) for m in (fp32[0], fp32[2]))
+    quantized = torch.ao.nn.quantized.dynamic.Linear
+    assert all(isinstance(m, quantized) for m in (int8[0], int8[2]))
+    x = torch.randn(3, 8)
+    assert torch.allclose(int8(x), fp32(x), atol=0.1)
+
+def test_unknown_inference_mode_raises():
+    manager = ModelManager(use_cuda=False, idle_timeout=60)
+    with pytest.raises(ValueError, match="Unknown inference mode"):
+        manager.acquire_model("tiny", _TinyModel, mode="fp8")
+    assert manager.memory_usage() == {}
@@ -0,0 +1,77 @@
+from unittest.mock import MagicMock
+
+import numpy as np
+
+from medium_clone_suggestion.article_processor.config import Config
+from medium_clone_suggestion.article_processor.summarization import (
+    SummarizationPlanner, SKIP, EXTRACTIVE, ABSTRACTIVE, MAP_REDUCE,
+    chunk_sentences, split_sentences, estimate_tokens,
+)
+
+
+def words(n, sentence_len=10):
+    sentence = ' '.join(['word'] * (sentence_len - 1)) + ' end.'
+    return ' '.join([sentence] * (n // sentence_len))
+
+
+def make_planner(encoder=True):
+    summarizer = MagicMock()
+    summarizer.summarize.return_value = "abstract"
+    summarizer.summarize_batch.side_effect = lambda texts, max_time=None: ["part"] * len(texts)
+    enc = None
+    if encoder:
+        enc = MagicMock()
+        # the second sentence sits closest to the centroid
+        enc.encode.side_effect = lambda sents, normalize_embeddings=True: np.array(
+            [[1.0, 0.0], [0.7, 0.7], [0.0, 1.0], [0.6, 0.8]][:len(sents)]
+        )
+    return SummarizationPlanner(summarizer, encoder=enc), summarizer
+
+
+def test_plan_by_length():
+    planner, _ = make_planner()
+    assert planner.plan(words(20))[0] == SKIP
+    assert planner.plan(words(80))[0] == EXTRACTIVE
+    assert planner.plan(words(400))[0] == ABSTRACTIVE
+    assert planner.plan(words(2000))[0] == MAP_REDUCE
+
+
+def test_plan_without_encoder_uses_abstractive():
+    planner, _ = make_planner(encoder=False)
+    assert planner.plan(words(80))[0] == ABSTRACTIVE
+
+
+def test_skip_returns_empty_summary():
+    planner, summarizer = make_planner()
+    assert planner.summarize("Too short.") == ''
+    summarizer.summarize.assert_not_called()
+
+
+def test_extractive_keeps_original_order():
+    planner, _ = make_planner()
+    text = "First one. Second one. Third one. Fourth one."
+    summary = planner.extractive(text, n_sentences=2)
+    assert summary == "Second one. Fourth one."
+
+
+def test_abstractive_passes_time_budget():
+    planner, summarizer = make_planner()
+    assert planner.summarize(words(400)) == "abstract"
+    summarizer.summarize.assert_called_once()
+    assert summarizer.summarize.call_args.kwargs["max_time"] == Config.SUMMARY_TIME_BUDGET_SECONDS["abstractive"]
+
+
+def test_map_reduce_batches_chunks_then_reduces():
+    planner, summarizer = make_planner()
+    assert planner.summarize(words(2000)) == "abstract"
+    chunks = summarizer.summarize_batch.call_args.args[0]
+    assert len(chunks) > 1
+    assert all(estimate_tokens(c) <= Config.SUMMARY_CHUNK_TOKENS for c in chunks)
+    assert summarizer.summarize.call_args.args[0] == ' '.join(["part"] * len(chunks))
+
+
+def test_chunks_keep_whole_sentences():
+    sentences = split_sentences(words(300))
+    chunks = chunk_sentences(sentences, max_tokens=50)
+    assert ' '.join(chunks) == ' '.join(sentences)
+    assert all(c.endswith('end.') for c in chunks)
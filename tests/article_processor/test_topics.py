@@ -0,0 +1,28 @@
+import pytest
+from gensim import corpora
+from gensim.models import LdaModel
+from medium_clone_suggestion.article_processor.topics import TopicModel, add_topics_batch
+
+@pytest.fixture
+def topic_model(tmp_path):
+    docs = [["football", "league", "goal"]] * 20 + [["python", "code", "compiler"]] * 20
+    dictionary = corpora.Dictionary(docs)
+    lda = LdaModel([dictionary.doc2bow(d) for d in docs], id2word=dictionary,
+                   num_topics=2, passes=20, random_state=1)
+    lda.save(str(tmp_path / "lda.model"))
+    dictionary.save(str(tmp_path / "lda.dict"))
+    return TopicModel(str(tmp_path / "lda.model"), str(tmp_path / "lda.dict"),
+                      min_probability=0.5, top_n=1, stopwords=set())
+
+def test_topics_depend_on_document(topic_model):
+    sports, code, empty = topic_model.infer_batch(
+        ["Football league goal goal", "Python code compiler", "nothing known here"]
+    )
+    assert len(sports) == 1 and len(code) == 1
+    assert sports != code
+    assert empty == []
+
+def test_add_topics_batch_sets_topics(topic_model):
+    articles = [{"content": "football goal"}, {"content": "python compiler"}]
+    add_topics_batch(articles, topic_model)
+    assert all(a["topics"] for a in articles)
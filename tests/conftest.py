@@ -1,5 +1,8 @@
 import pytest
+from medium_clone_suggestion.memory_database import InMemoryDatabaseManager
 from medium_clone_suggestion.recommendation_engine import RecommendationSystem
+from medium_clone_suggestion.seen_filter import SeenFilterCache
+from medium_clone_suggestion.synthetic import SyntheticDataset
 
 class DummyDB:
     def __init__(self):
@@ -10,10 +13,15 @@ class DummyDB:
             {"postid": "seen1", "field": "X", "keywords":[["baz",1]], "topics":[], "entities":[], "summary":""},
         ]
     def get_user_history(self, uid): return self.history
+    def get_user_history_token(self, uid): return f"{len(self.history)}:"
+    def get_user_history_rows(self, uid, since=None):
+        return [{"postid": p, "created_at": ""} for p in self.history]
     def get_user_profile(self, uid): return {"keywords":{"foo":1}, "topics":{}, "entities":{}, "preferred_fields":["X"]}
     def get_user_history_fields(self, uid): return ["X"]
     def fetch_unseen_articles(self, uid, fld, lim):
         return [a for a in self.articles if a["postid"] not in self.history and a["field"]==fld]
+    def fetch_field_candidates(self, fld, limit):
+        return [a for a in self.articles if a["field"] == fld][:limit]
     def fetch_random_unseen(self, uid, fld, num):
         return [{"postid": p["postid"]} for p in self.fetch_unseen_articles(uid, fld, num)]
     def fetch_top_articles(self, limit): return ["a","b","seen1"]
@@ -27,8 +35,30 @@ class DummyCache:
     def set_cache(self, *args, **kw): pass
 
 @pytest.fixture
-def recsys(monkeypatch):
-    sys = RecommendationSystem(testing_mode=True)
-    monkeypatch.setattr(sys, "data_access", DummyDB())
-    monkeypatch.setattr(sys, "cache_manager", DummyCache())
+def recsys(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    sys = RecommendationSystem(testing_mode=True, data_access=DummyDB())
+    sys.cache_manager = DummyCache()
+    sys.seen_filters = SeenFilterCache()
     return sys
+
+@pytest.fixture
+def offline_recsys(tmp_path, monkeypatch):
+    """
+    Factory for a RecommendationSystem over an InMemoryDatabaseManager of a
+    SyntheticDataset, run from tmp_path so cache and vectorizer files stay
+    there: make(n_articles, n_users, seed, cache=True) -> (system, db).
+    cache=False swaps in DummyCache, so every request does the full work.
+    """
+    monkeypatch.chdir(tmp_path)
+
+    def make(n_articles=2000, n_users=50, seed=3, cache=True):
+        db = InMemoryDatabaseManager(SyntheticDataset(n_articles=n_articles, n_users=n_users, seed=seed),
+                                     seen_filters=SeenFilterCache())
+        system = RecommendationSystem(data_access=db)
+        system.seen_filters = db.seen_filters
+        if not cache:
+            system.cache_manager = DummyCache()
+        return system, db
+
+    return make
@@ -0,0 +1,74 @@
+import os
+
+import numpy as np
+
+from medium_clone_suggestion.candidate_pool import CandidatePoolCache, mark_published
+from medium_clone_suggestion.feature_extraction import FeatureExtractor
+from medium_clone_suggestion.similarity import SimilarityCalculator
+
+ARTICLES = [
+    {"postid": f"p{i}", "field": "Science", "keywords": [[w, 1]], "topics": [], "entities": {}, "summary": w}
+    for i, w in enumerate(["physics", "biology", "chemistry", "astronomy"])
+]
+
+
+class Loader:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, field, limit):
+        self.calls += 1
+        return [a for a in ARTICLES if a["field"] == field][:limit]
+
+
+class SetSeen:
+    def __init__(self, ids):
+        self.ids = set(ids)
+
+    def seen_mask(self, postids):
+        return np.array([p in self.ids for p in postids])
+
+
+def make_cache(tmp_path, **kw):
+    calc = SimilarityCalculator()
+    calc.build_global_corpus(["physics biology", "chemistry astronomy"])
+    return CandidatePoolCache(calc, FeatureExtractor(), marker_path=str(tmp_path / "marker"), **kw), calc
+
+
+def test_pool_is_shared_until_marker_changes(tmp_path):
+    cache, _ = make_cache(tmp_path)
+    loader = Loader()
+    pool = cache.get("Science", loader)
+    assert cache.get("Science", loader) is pool
+    assert pool.rows.shape[0] == len(ARTICLES)
+
+    mark_published(cache.marker_path)
+    os.utime(cache.marker_path, (1, 1))  # a distinct mtime regardless of clock resolution
+    assert cache.get("Science", loader) is not pool
+    assert loader.calls == 2
+
+
+def test_ttl_expiry_reloads(tmp_path):
+    cache, _ = make_cache(tmp_path, ttl=-1)
+    loader = Loader()
+    cache.get("Science", loader)
+    cache.get("Science", loader)
+    assert loader.calls == 2
+
+
+def test_vectorizer_refit_recomputes_rows_without_reload(tmp_path):
+    cache, calc = make_cache(tmp_path)
+    loader = Loader()
+    pool = cache.get("Science", loader)
+    calc.build_global_corpus(["physics biology chemistry astronomy geology"])
+    refreshed = cache.get("Science", loader)
+    assert loader.calls == 1
+    assert refreshed.version == calc.version != pool.version
+    assert refreshed.rows.shape[1] == 5
+
+
+def test_unseen_indices_skip_seen_posts(tmp_path):
+    cache, _ = make_cache(tmp_path)
+    pool = cache.get("Science", Loader())
+    assert pool.unseen_indices(SetSeen({"p0", "p2"}), limit=1).tolist() == [1]
+    assert pool.unseen_indices(SetSeen(set()), limit=10).tolist() == [0, 1, 2, 3]
@@ -1,5 +1,30 @@
+from medium_clone_suggestion.database import DatabaseManager
+
+
+class _Pages:
+    """Supabase query builder stand-in: every call chains, execute() returns the next page."""
+
+    def __init__(self, pages):
+        self.pages = list(pages)
+
+    def __getattr__(self, name):
+        return lambda *a, **k: self
+
+    def execute(self):
+        return type("Response", (), {"data": self.pages.pop(0)})()
+
+
 def test_fetch_random_unseen_filters_seen(recsys):
     db = recsys.data_access
     unseen = db.fetch_random_unseen("u", "X", 10)
     ids = {d["postid"] for d in unseen}
     assert ids == {"a", "b"}
+
+
+def test_fetch_field_postids_throttles_every_page(monkeypatch):
+    db = DatabaseManager.__new__(DatabaseManager)
+    db.client = _Pages([[{"postid": "a"}, {"postid": "b"}], [{"postid": "c"}, {"postid": "d"}], [{"postid": "e"}]])
+    calls = []
+    monkeypatch.setattr(db, "_rate_limit", lambda: calls.append(1))
+    assert db.fetch_field_postids("X", page_size=2) == ["a", "b", "c", "d", "e"]
+    assert len(calls) == 3
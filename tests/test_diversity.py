@@ -0,0 +1,35 @@
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from medium_clone_suggestion.diversity import select_diverse
+
+DOCS = [
+    "python asyncio event loop tutorial",
+    "python asyncio event loop tutorial guide",  # near duplicate of 0
+    "gardening tomatoes in small balconies",
+    "python type hints for large codebases",
+]
+
+
+def rows_and_scores():
+    return TfidfVectorizer().fit_transform(DOCS), np.array([0.9, 0.89, 0.2, 0.5])
+
+
+def test_near_duplicate_is_dropped():
+    rows, scores = rows_and_scores()
+    picked = select_diverse(scores, rows, k=4, duplicate_similarity=0.8)
+    assert picked[0] == 0
+    assert 1 not in picked
+    assert sorted(picked) == [0, 2, 3]
+
+
+def test_lambda_one_keeps_score_order_without_duplicates():
+    rows, scores = rows_and_scores()
+    assert select_diverse(scores, rows, k=4, lambda_=1.0, duplicate_similarity=1.01) == [0, 1, 3, 2]
+
+
+def test_stops_at_k_and_respects_top_m():
+    rows, scores = rows_and_scores()
+    assert len(select_diverse(scores, rows, k=2)) == 2
+    assert select_diverse(scores, rows, k=4, top_m=2, duplicate_similarity=0.8) == [0]
+    assert select_diverse(np.array([]), rows[:0], k=3) == []
@@ -0,0 +1,131 @@
+import numpy as np
+import pytest
+
+from medium_clone_suggestion import recommendation_engine
+from medium_clone_suggestion.embedding_store import EmbeddingStore
+
+
+def test_put_get_roundtrip_in_float16(tmp_path):
+    store = EmbeddingStore(str(tmp_path), "articles")
+    vectors = np.random.default_rng(0).normal(size=(5, 8)).astype(np.float32)
+    store.put([f"p{i}" for i in range(5)], vectors)
+    got, found = store.get(["p3", "nope", "p0"])
+    assert found.tolist() == [True, False, True]
+    np.testing.assert_allclose(got[[0, 2]], vectors[[3, 0]], rtol=1e-3, atol=1e-3)
+    assert not got[1].any()
+    assert got.dtype == np.float32 and len(store) == 5
+    assert (tmp_path / "articles.f16").stat().st_size == 5 * 8 * 2
+
+
+def test_rows_record_when_they_were_put(tmp_path):
+    store = EmbeddingStore(str(tmp_path), "users")
+    store.put(["a", "b"], np.ones((2, 4)), timestamp=100.0)
+    store.put(["b", "c"], np.ones((2, 4)), timestamp=200.0)
+    stamps = EmbeddingStore(str(tmp_path), "users").get_timestamps(["a", "b", "c", "nope"])
+    assert stamps[:3].tolist() == [100.0, 200.0, 200.0]
+    assert np.isnan(stamps[3])
+
+
+def test_overwrite_in_place_and_readers_see_appends(tmp_path):
+    writer = EmbeddingStore(str(tmp_path), "articles")
+    reader = EmbeddingStore(str(tmp_path), "articles")
+    assert reader.get(["a"])[0].shape == (1, 0)
+
+    writer.put(["a", "b"], np.eye(2, 3))
+    assert reader.get(["b"])[1][0]
+    writer.put(["b", "c"], [[0, 0, 1], [1, 1, 0]])
+    got, found = reader.get(["a", "b", "c"])
+    assert found.all()
+    np.testing.assert_array_equal(got, [[1, 0, 0], [0, 0, 1], [1, 1, 0]])
+    assert len(reader) == 3
+
+    with pytest.raises(ValueError):
+        writer.put(["d"], np.ones((1, 4)))
+
+
+def test_rows_without_ids_are_dropped(tmp_path):
+    store = EmbeddingStore(str(tmp_path), "articles")
+    store.put(["a"], [[1.0, 2.0]])
+    # a writer that crashed after its rows, before their ids
+    with open(tmp_path / "articles.f16", "ab") as f:
+        f.write(np.ones((3, 2), dtype=np.float16).tobytes())
+    fresh = EmbeddingStore(str(tmp_path), "articles")
+    fresh.put(["b"], [[3.0, 4.0]])
+    np.testing.assert_array_equal(fresh.get(["a", "b"])[0], [[1, 2], [3, 4]])
+    assert (tmp_path / "articles.f16").stat().st_size == 2 * 2 * 2
+
+
+@pytest.fixture
+def offline_system(offline_recsys, tmp_path):
+    system, db = offline_recsys(n_articles=2000, n_users=20, seed=5)
+    articles = EmbeddingStore(str(tmp_path / "emb"), "articles")
+    system.user_embeddings = EmbeddingStore(str(tmp_path / "emb"), "users")
+    system.candidate_pools.embedding_store = articles
+    vectors = np.random.default_rng(1).normal(size=(2000, 16)).astype(np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    articles.put([db.dataset.postid(i) for i in range(2000)], vectors)
+    return system, db, vectors
+
+
+def test_embedding_ranking_scores_by_cosine(offline_system):
+    system, db, vectors = offline_system
+    user = db.dataset.user_id(3)
+    u = np.random.default_rng(2).normal(size=16).astype(np.float32)
+    system.user_embeddings.put([user], 3.0 * u)  # stored sums need not be unit norm
+    u /= np.linalg.norm(u)
+
+    recs = system.recommend_articles(user, num_recommendations=10, ranking="embedding")
+    assert len(recs) == 10
+    for rec in recs:
+        if "score" in rec:
+            expected = float(vectors[db.dataset.article_index(rec["postid"])] @ u)
+            assert rec["score"] == pytest.approx(expected, abs=2e-3)
+
+    hybrid = system.recommend_articles(user, num_recommendations=10, ranking="hybrid")
+    assert len(hybrid) == 10
+    tfidf = system.recommend_articles(user, num_recommendations=10, ranking="tfidf")
+    # the default weight blends in the embedding cosine
+    assert [r.get("score") for r in hybrid] != [r.get("score") for r in tfidf]
+
+
+def test_hybrid_ranking_needs_a_dense_weight(offline_system, monkeypatch):
+    system, db, _ = offline_system
+    monkeypatch.setattr(recommendation_engine, "HYBRID_DENSE_WEIGHT", 0.0)
+    with pytest.raises(ValueError, match="HYBRID_DENSE_WEIGHT"):
+        system.recommend_articles(db.dataset.user_id(3), ranking="hybrid")
+
+
+def test_embedding_ranking_falls_back_without_user_embedding(offline_system):
+    system, db, _ = offline_system
+    user = db.dataset.user_id(4)
+    by_embedding = system.recommend_articles(user, num_recommendations=10, ranking="embedding")
+    by_tfidf = system.recommend_articles(user, num_recommendations=10, ranking="tfidf")
+    assert [r["postid"] for r in by_embedding] == [r["postid"] for r in by_tfidf]
+    with pytest.raises(ValueError):
+        system.recommend_articles(user, ranking="bm25")
+
+
+def test_pools_loaded_before_the_first_embeddings_are_ignored(offline_system, tmp_path):
+    system, db, vectors = offline_system
+    filled = system.candidate_pools.embedding_store
+    user = db.dataset.user_id(5)
+    # pools loaded while the article store was still empty hold (n, 0) embeddings
+    system.candidate_pools.embedding_store = EmbeddingStore(str(tmp_path / "empty"), "articles")
+    system.recommend_articles(user, num_recommendations=10, ranking="tfidf")
+    system.candidate_pools.embedding_store = filled
+    field = db.get_user_profile(user)["preferred_fields"][0]
+    system.candidate_pools.invalidate(field)
+
+    system.user_embeddings.put([user], vectors[0])
+    recs = system.recommend_articles(user, num_recommendations=10, ranking="embedding")
+    assert len(recs) == 10
+
+
+def test_switching_ranking_modes_reuses_the_seen_filter(offline_system):
+    system, db, vectors = offline_system
+    user = db.dataset.user_id(6)
+    system.user_embeddings.put([user], vectors[1])
+    for ranking in ("tfidf", "embedding", "hybrid", "tfidf"):
+        system.recommend_articles(user, num_recommendations=10, ranking=ranking)
+    # each mode misses the recommendation cache, but the history is read once
+    assert db.calls["get_user_history_rows"] == 1
@@ -0,0 +1,33 @@
+from medium_clone_suggestion.feature_extraction import ArticleFeatures, FeatureCache, FeatureExtractor
+from medium_clone_suggestion.similarity import SimilarityCalculator
+
+ARTICLE = {
+    "postid": "a", "field": "Science",
+    "keywords": [["physics", 0.9], ["quantum", 0.7]],
+    "topics": ["energy"], "entities": {"PERSON": ["Bohr "]},
+    "summary": "Atoms and light.",
+}
+
+
+def test_features_are_immutable_and_carry_the_tfidf_document():
+    features = FeatureExtractor().features(ARTICLE)
+    assert isinstance(features, ArticleFeatures)
+    assert features.doc == "physics quantum energy Bohr Atoms and light."
+    assert SimilarityCalculator()._build_article_str(features) == features.doc
+    assert SimilarityCalculator()._build_article_str(features.as_dict()) == features.doc
+
+
+def test_cache_reuses_features_until_the_article_changes():
+    extractor = FeatureExtractor(FeatureCache(maxsize=10))
+    first = extractor.features(dict(ARTICLE))
+    assert extractor.features(dict(ARTICLE)) is first
+    edited = extractor.features({**ARTICLE, "summary": "Edited."})
+    assert edited is not first and edited.summary == "Edited."
+    assert (extractor.cache.hits, extractor.cache.misses) == (1, 2)
+
+
+def test_cache_is_bounded():
+    extractor = FeatureExtractor(FeatureCache(maxsize=2))
+    for i in range(5):
+        extractor.features({**ARTICLE, "postid": str(i)})
+    assert len(extractor.cache) == 2
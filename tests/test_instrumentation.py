@@ -0,0 +1,63 @@
+import asyncio
+
+from medium_clone_suggestion.instrumentation import Histogram, Registry, span, timed, trace
+from medium_clone_suggestion.singleflight import SingleFlight
+
+
+def test_histogram_buckets_are_cumulative():
+    h = Histogram(buckets=(0.01, 0.1))
+    for seconds in (0.005, 0.05, 0.05, 3.0):
+        h.observe(seconds)
+    cumulative, count, total = h.snapshot()
+    assert cumulative == [1, 3, 4]
+    assert count == 4
+    assert abs(total - 3.105) < 1e-9
+
+
+def test_render_prometheus_text():
+    reg = Registry(buckets=(0.1,))
+    reg.observe("recommend.scoring", 0.05)
+    text = reg.render("stage_seconds")
+    assert "# TYPE stage_seconds histogram" in text
+    assert 'stage_seconds_bucket{stage="recommend.scoring",le="0.1"} 1' in text
+    assert 'stage_seconds_bucket{stage="recommend.scoring",le="+Inf"} 1' in text
+    assert 'stage_seconds_count{stage="recommend.scoring"} 1' in text
+
+
+def test_spans_record_into_active_trace():
+    @timed("b")
+    def work():
+        with span("a"):
+            pass
+
+    with span("outside"):
+        pass
+    with trace() as t:
+        work()
+        with span("a"):
+            pass
+    assert [stage for stage, _ in t.stages] == ["a", "b", "a"]
+    header = t.server_timing()
+    assert header.startswith("a;dur=") and ", b;dur=" in header
+
+
+def test_trace_follows_work_into_singleflight_executor():
+    def work():
+        with span("worker"):
+            return 1
+
+    async def run():
+        with trace() as t:
+            await SingleFlight().do_async("k", work)
+        return t
+
+    t = asyncio.run(run())
+    assert [stage for stage, _ in t.stages] == ["worker"]
+
+
+def test_recommend_stages(recsys):
+    with trace() as t:
+        recsys.recommend_articles("u1", num_recommendations=2)
+    stages = {stage for stage, _ in t.stages}
+    assert {"recommend.total", "recommend.history_token", "recommend.candidates",
+            "recommend.scoring", "recommend.ranking"} <= stages
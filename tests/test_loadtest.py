@@ -0,0 +1,128 @@
+import asyncio
+import json
+
+import httpx
+from fastapi import FastAPI, Response
+
+from medium_clone_suggestion.loadtest import (
+    Result, TrafficRecorder, load_log, remap_users, replay, report, synthesize,
+)
+from medium_clone_suggestion.synthetic import SyntheticDataset
+
+
+def _app(recorder=None):
+    app = FastAPI()
+    if recorder:
+        app.middleware("http")(recorder)
+
+    @app.get("/{profile_id}/suggest")
+    async def suggest(profile_id: str, response: Response, num_recommendations: int = 10):
+        response.headers["X-Cache"] = "hit" if profile_id.endswith("1") else "miss"
+        return {"recommendations": [profile_id] * num_recommendations}
+
+    @app.post("/process")
+    async def process(body: dict):
+        return {"status": "processing"}
+
+    @app.get("/health")
+    async def health():
+        return {"status": "ok"}
+
+    return app
+
+
+def test_recorder_writes_suggest_and_process_only(tmp_path):
+    path = tmp_path / "traffic.jsonl"
+    recorder = TrafficRecorder(str(path))
+    app = _app(recorder)
+
+    async def run():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            await client.get("/u1/suggest", params={"num_recommendations": 3})
+            await client.post("/process", json={"postid": "p1"})
+            await client.get("/health")
+
+    asyncio.run(run())
+    recorder.close()
+
+    entries = load_log(str(path))
+    assert [e["path"] for e in entries] == ["/u1/suggest", "/process"]
+    assert entries[0]["query"] == "num_recommendations=3"
+    assert entries[0]["cache"] == "hit"
+    assert entries[1]["body"] == {"postid": "p1"}
+    assert all(e["status"] == 200 for e in entries)
+
+
+def test_recorder_keeps_invalid_bodies_raw(tmp_path):
+    path = tmp_path / "traffic.jsonl"
+    recorder = TrafficRecorder(str(path))
+    app = _app(recorder)
+
+    async def run():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            bad_json = await client.post("/process", content=b"{not json",
+                                         headers={"Content-Type": "application/json"})
+            bad_utf8 = await client.post("/process", content=b"\xff\xfe",
+                                         headers={"Content-Type": "application/json"})
+            return bad_json.status_code, bad_utf8.status_code
+
+    # FastAPI's validation error, not a 500 from the middleware
+    assert asyncio.run(run()) == (422, 422)
+    recorder.close()
+
+    entries = load_log(str(path))
+    assert [e["status"] for e in entries] == [422, 422]
+    assert entries[0]["body"] is None and entries[0]["raw_body"] == "{not json"
+    assert entries[1]["raw_body"] == "\ufffd\ufffd"
+
+
+def test_synthesize_is_deterministic_and_skewed():
+    a = synthesize(2000, n_users=100, seed=4, process_share=0.0)
+    b = synthesize(2000, n_users=100, seed=4, process_share=0.0)
+    assert [e["path"] for e in a] == [e["path"] for e in b]
+    assert all(x["ts"] < y["ts"] for x, y in zip(a, a[1:]))
+    ids = SyntheticDataset(n_articles=1, n_users=100, seed=4)
+    top = sum(1 for e in a if e["path"] == f"/{ids.user_id(0)}/suggest")
+    tail = sum(1 for e in a if e["path"] == f"/{ids.user_id(99)}/suggest")
+    assert top > 5 * max(tail, 1)
+
+
+def test_remap_users_is_stable():
+    entries = [{"path": f"/prod-user-{i % 7}/suggest", "method": "GET"} for i in range(50)]
+    entries.append({"path": "/process", "method": "POST"})
+    mapped = remap_users(entries, n_users=20, seed=0)
+    ids = SyntheticDataset(n_articles=1, n_users=20, seed=0)
+    valid = {f"/{ids.user_id(u)}/suggest" for u in range(20)}
+    assert all(m["path"] in valid for m in mapped[:-1])
+    assert mapped[-1]["path"] == "/process"
+    # same recorded id -> same synthetic id
+    assert mapped[0]["path"] == mapped[7]["path"]
+
+
+def test_report_percentiles_errors_and_hits():
+    results = [Result("suggest", 200, i / 1000, cache="hit" if i % 2 else "miss") for i in range(1, 101)]
+    results.append(Result("suggest", 500, 0.5))
+    results.append(Result("process", None, 0.01, error="ConnectError"))
+    out = report(results, elapsed=2.0)
+    assert out["overall"]["requests"] == 102
+    assert out["overall"]["throughput_rps"] == 51.0
+    assert out["suggest"]["statuses"] == {"200": 100, "500": 1}
+    assert out["process"]["statuses"] == {"ConnectError": 1}
+    assert out["process"]["error_rate"] == 1.0
+    assert out["suggest"]["cache_hit_ratio"] == 0.5
+    assert 49 <= out["suggest"]["latency_ms"]["p50"] <= 52
+
+
+def test_replay_closed_and_open_loop():
+    entries = synthesize(60, n_users=10, seed=1, process_share=0.1)
+    app = _app()
+    closed = asyncio.run(replay(entries, "http://test", concurrency=4, transport=httpx.ASGITransport(app=app)))
+    assert closed["overall"]["requests"] == 60
+    assert closed["overall"]["error_rate"] == 0.0
+
+    opened = asyncio.run(replay(entries, "http://test", concurrency=4, rate=600.0,
+                                transport=httpx.ASGITransport(app=app)))
+    assert opened["overall"]["requests"] == 60
+    assert opened["elapsed_s"] >= 59 / 600.0
@@ -0,0 +1,66 @@
+import logging
+import queue
+import threading
+from logging.handlers import QueueListener
+
+from medium_clone_suggestion.logger import (
+    DebugSamplingFilter, _DeferredQueueHandler, get_logger, parse_levels, sample_request,
+)
+
+
+def _record(level):
+    return logging.LogRecord("medium_clone_suggestion.test", level, __file__, 1, "msg %s", ("x",), None)
+
+
+def test_parse_levels():
+    levels = parse_levels("medium_clone_suggestion.database=DEBUG, medium_clone_suggestion.similarity=warning,")
+    assert levels == {
+        "medium_clone_suggestion.database": logging.DEBUG,
+        "medium_clone_suggestion.similarity": logging.WARNING,
+    }
+    assert parse_levels("") == {}
+
+
+def test_debug_records_follow_request_sampling():
+    f = DebugSamplingFilter()
+    # outside a request nothing is dropped
+    assert f.filter(_record(logging.DEBUG))
+
+    with sample_request(rate=0.0):
+        assert not f.filter(_record(logging.DEBUG))
+        assert f.filter(_record(logging.INFO))
+    with sample_request(rate=1.0):
+        assert f.filter(_record(logging.DEBUG))
+
+
+def test_package_loggers_share_one_handler():
+    a = get_logger("medium_clone_suggestion.a")
+    b = get_logger("medium_clone_suggestion.b")
+    assert not a.handlers and not b.handlers
+    root = logging.getLogger("medium_clone_suggestion")
+    ours = [h for h in root.handlers if any(isinstance(f, DebugSamplingFilter) for f in h.filters)]
+    assert len(ours) == 1
+
+
+def test_queued_records_are_formatted_on_the_listener_thread():
+    class _Formatter(logging.Formatter):
+        def format(self, record):
+            formatted_by.append(threading.current_thread().name)
+            return super().format(record)
+
+    class _Collect(logging.Handler):
+        def emit(self, record):
+            lines.append(self.format(record))
+
+    formatted_by, lines = [], []
+    sink = _Collect()
+    sink.setFormatter(_Formatter())
+    log_queue = queue.SimpleQueue()
+    listener = QueueListener(log_queue, sink)
+    listener.start()
+    try:
+        _DeferredQueueHandler(log_queue).handle(_record(logging.INFO))
+    finally:
+        listener.stop()
+    assert lines == ["msg x"]
+    assert formatted_by and threading.current_thread().name not in formatted_by
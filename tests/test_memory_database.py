@@ -0,0 +1,66 @@
+import time
+
+from medium_clone_suggestion.memory_database import InMemoryDatabaseManager
+from medium_clone_suggestion.seen_filter import SeenFilterCache
+from medium_clone_suggestion.synthetic import SyntheticDataset
+
+
+def _db(**kwargs):
+    return InMemoryDatabaseManager(SyntheticDataset(n_articles=2000, n_users=50, seed=3),
+                                   seen_filters=SeenFilterCache(), **kwargs)
+
+
+def test_dataset_is_deterministic():
+    a, b = SyntheticDataset(500, 10, seed=1), SyntheticDataset(500, 10, seed=1)
+    assert a.article(42) == b.article(42)
+    assert a.history(3) == b.history(3)
+    assert a.article_index(a.postid(123)) == 123
+    assert a.user_index(a.user_id(7)) == 7
+
+
+def test_field_candidates_are_newest_first():
+    db = _db()
+    field = db.dataset.fields[0]
+    articles = db.fetch_field_candidates(field, limit=10)
+    assert len(articles) == 10
+    assert all(a["field"] == field for a in articles)
+    created = [db.dataset.created_at(db.dataset.article_index(a["postid"])) for a in articles]
+    assert created == sorted(created, reverse=True)
+
+
+def test_history_token_and_incremental_rows():
+    db = _db()
+    user = db.dataset.user_id(1)
+    token = db.get_user_history_token(user)
+    before = db.get_user_history_rows(user)
+    assert token.split(":")[0] == str(len(before))
+
+    db.record_read(user, db.dataset.postid(5), created_at="2100-01-01T00:00:00+00:00")
+    assert db.get_user_history_token(user) != token
+    assert [r["postid"] for r in db.get_user_history_rows(user, since="2099-01-01")] == [db.dataset.postid(5)]
+
+
+def test_random_unseen_skips_history():
+    db = _db()
+    user = db.dataset.user_id(2)
+    seen = set(db.get_user_history(user))
+    field = db.dataset.preferred_fields(2)[0]
+    picked = db.fetch_random_unseen(user, field, 15)
+    assert picked and not seen & {p["postid"] for p in picked}
+
+
+def test_injected_latency_per_method():
+    db = _db(latency={"get_user_profile": 0.02})
+    start = time.perf_counter()
+    db.get_user_profile(db.dataset.user_id(0))
+    db.get_user_history_token(db.dataset.user_id(0))
+    assert time.perf_counter() - start >= 0.02
+    assert db.calls["get_user_profile"] == 1 and db.calls["get_user_history_token"] == 1
+
+
+def test_recommendation_system_runs_offline(offline_recsys):
+    system, db = offline_recsys()
+    user = db.dataset.user_id(4)
+    recs = system.recommend_articles(user, num_recommendations=10)
+    assert len(recs) == 10
+    assert not set(db.get_user_history(user)) & {r["postid"] for r in recs}
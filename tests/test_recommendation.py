@@ -1,3 +1,8 @@
+import pytest
+
+from medium_clone_suggestion import scoring
+
+
 def test_recommend_length_and_fields(recsys):
     recs = recsys.recommend_articles("u", num_recommendations=2, exploration_ratio=0.0)
     # should get 2 items, none with postid in history
@@ -14,7 +19,7 @@ def test_exploration_fallback(recsys, monkeypatch):
     db = recsys.data_access
 
     # Kill primary fetch
-    monkeypatch.setattr(db, "fetch_unseen_articles", lambda *a, **kw: [])
+    monkeypatch.setattr(db, "fetch_field_candidates", lambda *a, **kw: [])
 
     # Force fallback to return a dummy post
     monkeypatch.setattr(db, "fetch_random_unseen", lambda *a, **kw: [{"postid": "dummy"}])
@@ -23,3 +28,38 @@ def test_exploration_fallback(recsys, monkeypatch):
     assert len(recs) == 1
     assert recs[0]["postid"] == "dummy"
 
+
+def test_cache_hit_skips_history_download(recsys, monkeypatch):
+    db = recsys.data_access
+    monkeypatch.setattr(db, "get_user_history", lambda *a: pytest.fail("history fetched on a cache hit"))
+    seen_keys = []
+
+    class HitCache:
+        def check_and_update_cache(self, user_id, history, history_hash, *a):
+            seen_keys.append(history_hash)
+            return [{"postid": "cached"}]
+
+    monkeypatch.setattr(recsys, "cache_manager", HitCache())
+    recs = recsys.recommend_articles("u", num_recommendations=1)
+    assert recs == [{"postid": "cached"}]
+    assert seen_keys == [db.get_user_history_token("u")]
+
+
+def test_sharded_top_k_path_ranks_like_full_scoring(offline_recsys, monkeypatch):
+    system, db = offline_recsys(n_articles=6000, n_users=5, seed=11, cache=False)
+    user = db.dataset.user_id(1)
+    # near-duplicate clusters of three consecutive posts, collapsed before ranking
+    for i in range(db.dataset.n_articles):
+        db._metadata[db.dataset.postid(i)] = {"cluster_id": f"c{i // 3}"}
+
+    def recommend():
+        recs = system._generate_recommendations(user, 10, 0.3, 500)
+        return [(r["postid"], r.get("score")) for r in recs]
+
+    monkeypatch.setattr(scoring, "SCORING_THREADS", 1)
+    full = recommend()
+    monkeypatch.setattr(scoring, "SCORING_SHARD_MIN_ROWS", 1)
+    monkeypatch.setattr(scoring, "SCORING_THREADS", 3)
+    sharded = recommend()
+    assert [p for p, _ in sharded] == [p for p, _ in full]
+    assert [s for _, s in sharded] == pytest.approx([s for _, s in full])
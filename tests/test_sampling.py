@@ -0,0 +1,41 @@
+import random
+
+from medium_clone_suggestion.sampling import FieldIdCache, sample_unseen
+
+
+class SetSeen:
+    def __init__(self, ids):
+        self.ids = set(ids)
+        self.calls = 0
+
+    def unseen(self, postids):
+        self.calls += 1
+        return [p for p in postids if p not in self.ids]
+
+
+POSTIDS = [f"p{i}" for i in range(1000)]
+
+
+def test_sample_is_unseen_and_distinct():
+    seen = SetSeen(POSTIDS[:500])
+    picked = sample_unseen(POSTIDS, seen, 10, rng=random.Random(1))
+    assert len(picked) == 10 == len(set(picked))
+    assert not set(picked) & seen.ids
+    assert seen.calls == 1  # one batch was enough
+
+
+def test_sample_falls_back_when_almost_everything_is_seen():
+    seen = SetSeen(POSTIDS[:-3])
+    picked = sample_unseen(POSTIDS, seen, 10, rng=random.Random(1))
+    assert sorted(picked) == sorted(POSTIDS[-3:])
+
+
+def test_field_id_cache_respects_ttl():
+    loads = []
+    cache = FieldIdCache(ttl=60)
+    loader = lambda field: loads.append(field) or POSTIDS
+    assert cache.get("Science", loader) is cache.get("Science", loader)
+    assert loads == ["Science"]
+    cache.invalidate("Science")
+    cache.get("Science", loader)
+    assert loads == ["Science", "Science"]
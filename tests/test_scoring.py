@@ -0,0 +1,141 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+import scipy.sparse as sp
+from sklearn.metrics.pairwise import cosine_similarity
+
+from medium_clone_suggestion import scoring
+from medium_clone_suggestion.scoring import (
+    blend, dense_scores, normalize_rows, score_matrix, score_top_k, top_k,
+)
+from medium_clone_suggestion.similarity import SimilarityCalculator
+from medium_clone_suggestion.synthetic import SyntheticDataset
+
+
+def _random(rows, cols=500, density=0.02, seed=0):
+    return sp.random(rows, cols, density=density, format="csr", random_state=seed)
+
+
+def test_normalize_rows_unit_norm_and_float32():
+    m = sp.vstack([_random(3), sp.csr_matrix((1, 500)), _random(46, seed=1)], format="csr")  # row 3 empty
+    n = normalize_rows(m)
+    assert n.dtype == np.float32
+    norms = np.sqrt(np.asarray(n.multiply(n).sum(axis=1)).ravel())
+    assert norms[3] == 0
+    nonzero = np.diff(m.indptr) > 0
+    np.testing.assert_allclose(norms[nonzero], 1.0, rtol=1e-5)
+    # the input is left alone
+    assert m.dtype == np.float64
+
+
+def test_score_matrix_matches_cosine_similarity():
+    users, articles = _random(7, seed=1), _random(300, seed=2)
+    expected = cosine_similarity(users, articles)
+    got = score_matrix(normalize_rows(users), normalize_rows(articles))
+    assert got.shape == (7, 300) and got.dtype == np.float32
+    np.testing.assert_allclose(got, expected, atol=1e-5)
+    single = score_matrix(normalize_rows(users[2]), normalize_rows(articles))
+    np.testing.assert_allclose(single[0], expected[2], atol=1e-5)
+
+
+def test_threaded_scores_equal_serial():
+    users, articles = normalize_rows(_random(33, seed=3)), normalize_rows(_random(200, seed=4))
+    np.testing.assert_array_equal(score_matrix(users, articles, n_threads=4),
+                                  score_matrix(users, articles, n_threads=1))
+
+
+def test_growing_the_pool_does_not_break_concurrent_callers(monkeypatch):
+    monkeypatch.setattr(scoring, "_executor", None)
+    monkeypatch.setattr(scoring, "_executor_workers", 0)
+    users, articles = normalize_rows(_random(16, seed=3)), normalize_rows(_random(200, seed=4))
+    expected = score_matrix(users, articles, n_threads=1)
+    with ThreadPoolExecutor(max_workers=8) as callers:
+        # each call may find the pool too small and replace it under the others
+        results = list(callers.map(lambda n: score_matrix(users, articles, n_threads=n), range(2, 18)))
+    for got in results:
+        np.testing.assert_array_equal(got, expected)
+    old = scoring._get_executor(2)
+    assert scoring._get_executor(64) is not old
+    assert scoring._executor_workers == 64
+    assert old.submit(int, 1).result() == 1  # the replaced pool still takes work
+
+
+def test_sharded_single_user_scores_equal_serial():
+    user, articles = normalize_rows(_random(1, seed=7)), normalize_rows(_random(1000, seed=8))
+    serial = score_matrix(user, articles, n_threads=1)
+    np.testing.assert_array_equal(score_matrix(user, articles, n_threads=3, min_rows=100), serial)
+    # below the threshold nothing is sharded
+    np.testing.assert_array_equal(score_matrix(user, articles, n_threads=3, min_rows=5000), serial)
+
+
+def test_top_k_best_first_with_ties_by_index():
+    idx, values = top_k(np.array([0.1, 0.5, 0.3, 0.5, 0.0], dtype=np.float32), 3)
+    assert idx.tolist() == [1, 3, 2]
+    assert values.tolist() == pytest.approx([0.5, 0.5, 0.3])
+    assert top_k(np.zeros(2), 5)[0].tolist() == [0, 1]
+    assert len(top_k(np.zeros(2), 0)[0]) == 0
+
+
+def test_sharded_top_k_matches_full_sort():
+    user, articles = normalize_rows(_random(1, seed=9)), normalize_rows(_random(2000, density=0.05, seed=10))
+    full = score_matrix(user, articles)[0]
+    expected, _ = top_k(full, 25)
+    for threads, min_rows in ((1, 0), (4, 100), (4, 10**6)):
+        idx, values = score_top_k(user, articles, 25, n_threads=threads, min_rows=min_rows)
+        assert idx.tolist() == expected.tolist()
+        np.testing.assert_array_equal(values, full[idx])
+    # k larger than a shard still merges to the overall order
+    idx, _ = score_top_k(user, articles, 1500, n_threads=4, min_rows=100)
+    assert idx.tolist() == top_k(full, 1500)[0].tolist()
+    with pytest.raises(ValueError):
+        score_top_k(normalize_rows(_random(2)), articles, 5)
+    # precomputed scores take the same sharded path
+    idx, values = top_k(full, 25, n_threads=4, min_rows=100)
+    assert idx.tolist() == expected.tolist()
+    np.testing.assert_array_equal(values, full[idx])
+
+
+def test_scipy_fallback_matches(monkeypatch):
+    users, articles = normalize_rows(_random(9, seed=5)), normalize_rows(_random(40, seed=6))
+    expected = score_matrix(users, articles)
+    monkeypatch.setattr(scoring, "sparse_matmul_to_dense", None)
+    np.testing.assert_allclose(score_matrix(users, articles, n_threads=2), expected, atol=1e-6)
+
+
+def test_empty_inputs():
+    assert score_matrix(normalize_rows(_random(0)), normalize_rows(_random(5))).shape == (0, 5)
+    assert score_matrix(normalize_rows(_random(3)), normalize_rows(_random(0))).shape == (3, 0)
+
+
+def test_calculator_scores_like_the_float64_path():
+    d = SyntheticDataset(n_articles=400, n_users=5, seed=2)
+    articles = [d.article(i) for i in range(400)]
+    calc = SimilarityCalculator()
+    calc.user_vector_mode = "keys"
+    calc.build_global_corpus([calc._build_article_str(a) for a in articles])
+    rows = calc.transform_articles(articles)
+    profiles = [d.profile(u) for u in range(5)]
+
+    tf64 = calc.vectorizer.transform([calc._build_article_str(a) for a in articles])
+    for u, profile in enumerate(profiles):
+        expected = cosine_similarity(calc.vectorizer.transform([calc._build_user_str(profile)]), tf64)[0]
+        np.testing.assert_allclose(calc.score_rows(profile, rows), expected, atol=1e-5)
+    batch = calc.score_users(profiles, rows, n_threads=2)
+    np.testing.assert_allclose(batch[4], calc.score_rows(profiles[4], rows), atol=1e-6)
+
+
+def test_blend_mixes_only_where_available():
+    sparse = np.array([[0.2, 0.4, 0.6]], dtype=np.float32)
+    dense = np.array([[1.0, 0.0, 0.5]], dtype=np.float32)
+    np.testing.assert_allclose(blend(sparse, dense, 0.25), [[0.4, 0.3, 0.575]], rtol=1e-6)
+    np.testing.assert_allclose(blend(sparse, dense, 0.25, available=np.array([True, False, True])),
+                               [[0.4, 0.4, 0.575]], rtol=1e-6)
+    assert blend(sparse, dense, 0.0) is sparse
+    assert blend(sparse, None, 0.5) is sparse
+
+
+def test_dense_scores_are_cosines_and_missing_rows_score_zero():
+    users = np.array([[3.0, 4.0], [1.0, 0.0]])
+    articles = np.array([[6.0, 8.0], [0.0, 0.0], [0.0, 2.0]])
+    np.testing.assert_allclose(dense_scores(users, articles), [[1.0, 0.0, 0.8], [0.6, 0.0, 0.0]], rtol=1e-6)
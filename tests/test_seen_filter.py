@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+
+from medium_clone_suggestion.seen_filter import (
+    BloomFilter, CompressedIdSet, SeenFilterCache,
+)
+
+
+class HistorySource:
+    def __init__(self, rows):
+        self.rows = rows
+        self.calls = []
+
+    def get_user_history_token(self, uid):
+        return f"{len(self.rows)}:{max((r['created_at'] for r in self.rows), default='')}"
+
+    def get_user_history_rows(self, uid, since=None):
+        self.calls.append(since)
+        return [r for r in self.rows if since is None or r["created_at"] >= since]
+
+
+def rows(n, start=0):
+    return [{"postid": f"p{i}", "created_at": f"2026-01-01T00:{i // 60:02d}:{i % 60:02d}"}
+            for i in range(start, start + n)]
+
+
+def test_compressed_set_array_and_bitmap_containers():
+    ids = np.concatenate([np.arange(0, 10000, 2), np.arange(70000, 70010)]).astype(np.uint32)
+    s = CompressedIdSet()
+    s.add_many(ids[:3000])
+    s.add_many(ids[3000:])  # crosses ARRAY_MAX in the first container
+    assert len(s) == len(ids)
+    probe = np.array([0, 1, 9998, 9999, 70005, 70010, 200000], dtype=np.uint32)
+    assert s.contains_many(probe).tolist() == [True, False, True, False, True, False, False]
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(capacity=1000, fp_rate=0.01)
+    bloom.add_many(np.arange(1000, dtype=np.uint32))
+    assert bloom.contains_many(np.arange(1000, dtype=np.uint32)).all()
+    assert bloom.contains_many(np.arange(1000, 11000, dtype=np.uint32)).mean() < 0.05
+
+
+@pytest.mark.parametrize("backend", ["roaring", "bloom"])
+def test_cache_updates_incrementally(backend):
+    source = HistorySource(rows(5))
+    cache = SeenFilterCache(backend=backend)
+    seen = cache.get("u", source)
+    assert seen.unseen(["p0", "p4", "p5", "new"]) == ["p5", "new"]
+
+    assert cache.get("u", source) is seen
+    assert source.calls == [None]  # token unchanged, nothing fetched
+
+    source.rows += rows(2, start=5)
+    seen = cache.get("u", source)
+    assert source.calls == [None, "2026-01-01T00:00:04"]
+    assert "p6" in seen and "p7" not in seen
+
+
+def test_cache_evicts_least_recently_used():
+    cache = SeenFilterCache(max_users=1)
+    source = HistorySource(rows(1))
+    cache.get("a", source)
+    cache.get("b", source)
+    cache.get("a", source)
+    assert source.calls == [None, None, None]
@@ -0,0 +1,69 @@
+import numpy as np
+
+from medium_clone_suggestion.scoring import normalize_rows
+from medium_clone_suggestion.similarity import SimilarityCalculator
+
+DOCS = [
+    "python asyncio event loop",
+    "gardening tomatoes balcony",
+    "jazz piano improvisation",
+    "python type hints",
+]
+
+
+def _calc():
+    calc = SimilarityCalculator()
+    calc.build_global_corpus(DOCS)
+    return calc, normalize_rows(calc.vectorizer.transform(DOCS))
+
+
+def test_unit_weights_match_joined_keys():
+    calc, _ = _calc()
+    profile = {"keywords": {"python": 1, "event loop": 1}, "topics": {"jazz": 1}, "entities": {"Guido": 1}}
+    weighted = calc.weighted_user_vectors([profile]).toarray()
+    calc.user_vector_mode = "keys"
+    keys = calc.transform_users([profile]).toarray()
+    np.testing.assert_allclose(weighted, keys, atol=1e-6)
+
+
+def test_weights_change_the_ranking():
+    calc, rows = _calc()
+    gardener = {"keywords": {"python": 0.1, "tomatoes": 1.0}, "topics": {}, "entities": {}}
+    coder = {"keywords": {"python": 1.0, "tomatoes": 0.1}, "topics": {}, "entities": {}}
+    scores = calc.score_users([gardener, coder], rows)
+    assert np.argmax(scores[0]) == 1
+    assert scores[1][0] > scores[1][1] and scores[1][3] > scores[1][1]
+    # joined keys cannot tell the two apart
+    calc.user_vector_mode = "keys"
+    keys = calc.score_users([gardener, coder], rows)
+    np.testing.assert_allclose(keys[0], keys[1])
+
+
+def test_malformed_and_unknown_terms_score_zero():
+    calc, rows = _calc()
+    profiles = [
+        {"keywords": ["python"], "topics": None, "entities": {"python": "high"}},
+        {"keywords": {"zzz unknown": 1.0, "python": -1}},
+        {},
+    ]
+    assert not calc.score_users(profiles, rows).any()
+
+
+def test_refit_resets_term_columns():
+    calc, _ = _calc()
+    profile = {"keywords": {"python": 1.0}}
+    before = calc.weighted_user_vectors([profile])
+    calc.build_global_corpus(["zebra python"])
+    after = calc.weighted_user_vectors([profile])
+    assert before.shape[1] != after.shape[1]
+    assert after.nnz == 1 and after[0, calc.vectorizer.vocabulary_["python"]] > 0.99
+
+
+def test_score_rows_blends_embeddings():
+    calc, rows = _calc()
+    profile = {"keywords": {"python": 1.0}}
+    sparse = calc.score_rows(profile, rows)
+    embeddings = np.eye(4, dtype=np.float32)
+    blended = calc.score_rows(profile, rows, user_embedding=embeddings[2], article_embeddings=embeddings,
+                              dense_weight=0.5)
+    np.testing.assert_allclose(blended, 0.5 * sparse + 0.5 * embeddings[2], atol=1e-6)
@@ -0,0 +1,61 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from medium_clone_suggestion.singleflight import SingleFlight
+
+
+def test_concurrent_threads_share_one_call():
+    sf = SingleFlight()
+    calls = []
+    started = threading.Event()
+
+    def work():
+        calls.append(1)
+        started.set()
+        time.sleep(0.1)
+        return ["rec"]
+
+    results = []
+    leader = threading.Thread(target=lambda: results.append(sf.do("u", work)))
+    leader.start()
+    started.wait()
+    followers = [threading.Thread(target=lambda: results.append(sf.do("u", work))) for _ in range(4)]
+    for t in followers:
+        t.start()
+    for t in [leader, *followers]:
+        t.join()
+
+    assert len(calls) == 1
+    assert results == [["rec"]] * 5
+    assert sf.stats() == {"executed": 1, "coalesced": 4, "in_flight": 0}
+
+
+def test_errors_reach_followers_and_are_not_cached():
+    sf = SingleFlight()
+    with pytest.raises(ValueError):
+        sf.do("u", lambda: (_ for _ in ()).throw(ValueError("boom")))
+    assert sf.do("u", lambda: 42) == 42
+    assert sf.stats()["executed"] == 2
+
+
+def test_async_callers_share_one_call():
+    sf = SingleFlight()
+    calls = []
+
+    def work(user_id):
+        calls.append(user_id)
+        time.sleep(0.05)
+        return user_id.upper()
+
+    async def run():
+        return await asyncio.gather(
+            *(sf.do_async(("u", 10), work, "u") for _ in range(5)),
+            sf.do_async(("v", 10), work, "v"),
+        )
+
+    assert asyncio.run(run()) == ["U"] * 5 + ["V"]
+    assert sorted(calls) == ["u", "v"]
+    assert sf.stats()["coalesced"] == 4
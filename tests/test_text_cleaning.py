@@ -0,0 +1,13 @@
+from medium_clone_suggestion.text_cleaning import html_to_text, strip_tags
+
+HTML = '<h1>Title</h1><p>First &amp; <b>bold</b></p><script>var x = 1;</script><p>Second<br>line</p>'
+
+def test_html_to_text_keeps_block_boundaries():
+    assert html_to_text(HTML) == "Title First & bold Second line"
+
+def test_regex_fallback_matches_fast_path():
+    assert strip_tags(HTML) == html_to_text(HTML)
+
+def test_plain_text_is_only_normalized():
+    assert html_to_text("  already\n plain  ") == "already plain"
+    assert html_to_text("") == ""
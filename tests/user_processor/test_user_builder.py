@@ -1,5 +1,10 @@
+import time
 import pytest
+import numpy as np
+from datetime import datetime, timezone
 from unittest.mock import MagicMock
+from medium_clone_suggestion.embedding_store import EmbeddingStore
+from medium_clone_suggestion.user_processor.processing import ProfileProcessor
 from medium_clone_suggestion.user_processor.user_profile_builder import UserProfileBuilder
 
 @pytest.fixture
@@ -12,8 +17,7 @@ def mock_config():
 
 @pytest.fixture
 def builder(mock_config):
-    builder = UserProfileBuilder(mock_config)
-    builder.db = MagicMock()
+    builder = UserProfileBuilder(mock_config, db=MagicMock())
     builder.processor = MagicMock()
     return builder
 
@@ -33,3 +37,26 @@ def test_process_users_basic_flow(builder):
 
     builder.db.update_user_interests.assert_called_once()
     builder.db.update_user_profile_last_updated.assert_called_once()
+
+def test_user_embedding_accumulates_with_decay(mock_config, tmp_path):
+    mock_config.FRESHNESS_DECAY_RATE = 0.1
+    mock_config.WEIGHTS = {"view": 1.0, "engagement_segments": {}, "rating": 1.0}
+    articles = EmbeddingStore(str(tmp_path), "articles")
+    users = EmbeddingStore(str(tmp_path), "users")
+    articles.put(["p1", "p2"], np.eye(2))
+    builder = UserProfileBuilder(mock_config, db=MagicMock(), article_embeddings=articles, user_embeddings=users)
+    builder.processor = ProfileProcessor(mock_config)
+
+    now = datetime.now(timezone.utc).isoformat()
+    builder._update_embedding("u1", [{"postid": "p1", "activity_type": "view", "created_at": now}])
+    assert np.allclose(users.get(["u1"])[0][0], [1.0, 0.0])
+
+    # stored 12 hours ago: the sum decays by fractional days, exp(-0.1 * 0.5)
+    users.put(["u1"], [[1.0, 0.0]], timestamp=time.time() - 12 * 3600)
+    builder._update_embedding("u1", [{"postid": "p2", "activity_type": "view", "created_at": now}])
+    assert np.allclose(users.get(["u1"])[0][0], [np.exp(-0.05), 1.0], atol=1e-3)
+    assert users.get_timestamps(["u1"])[0] == pytest.approx(time.time(), abs=5)
+
+    # posts without embeddings leave the user untouched
+    builder._update_embedding("u2", [{"postid": "p9", "activity_type": "view", "created_at": now}])
+    assert "u2" not in users
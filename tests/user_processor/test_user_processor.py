@@ -1,4 +1,5 @@
 import pytest
+import numpy as np
 from datetime import datetime, timedelta, timezone
 from medium_clone_suggestion.user_processor.processing import ProfileProcessor
 
@@ -79,3 +80,21 @@ def test_calculate_scores(processor):
     assert "brain" in t and "tech" in t
     assert "cortex" in e and "GPT" in e
     assert all(0 <= v <= 1 for v in k.values())
+
+def test_decay_factor_uses_fractional_days_and_composes(processor):
+    assert processor.decay_factor(0) == 1.0
+    half_day = processor.decay_factor(12 * 3600)
+    assert 0.9 < half_day < 1.0
+    assert half_day * half_day == pytest.approx(processor.decay_factor(24 * 3600))
+
+def test_calculate_embedding_weights_by_engagement(processor):
+    now = datetime.now(timezone.utc).isoformat()
+    activities = [
+        {'postid': 'p1', 'activity_type': 'view', 'created_at': now},
+        {'postid': 'p2', 'activity_type': 'engagement', 'segment': 2, 'created_at': now},
+        {'postid': 'missing', 'activity_type': 'view', 'created_at': now},
+    ]
+    embeddings = {'p1': np.array([1.0, 0.0]), 'p2': np.array([0.0, 1.0])}
+    total = processor.calculate_embedding(activities, embeddings)
+    assert np.allclose(total, [1.0, 2.0])
+    assert processor.calculate_embedding(activities[2:], embeddings) is None